@@ -29,11 +29,11 @@ class ChatLogHandler(logging.Handler):
         # This is currently disabled because gwillen is concerned it's interfering with other stuff.
         def handle_sigterm(_signo, _stackframe):
             # Can't import this at load or init time, because "django.core.exceptions.AppRegistryNotReady: Apps aren't loaded yet."
-            from puzzles.discordbot import DISCORD_ANNOUNCER, do_in_discord
+            from puzzles.announcer import ANNOUNCER
 
             self.shutdown = True
             now = datetime.datetime.now()
-            #do_in_discord(DISCORD_ANNOUNCER.post_message(HERRING_DISCORD_DEBUG_CHANNEL, f"`[{now.strftime('%m/%d/%Y, %H:%M:%S')}] ChatLogHandler shutting down, suppressing logs until exit to reduce spam. (You can still find them in the PaperTrail log viewer on Heroku.) Thread info: {self.thread_info}`"))
+            #ANNOUNCER.call('post_message', HERRING_DISCORD_DEBUG_CHANNEL, f"`[{now.strftime('%m/%d/%Y, %H:%M:%S')}] ChatLogHandler shutting down, suppressing logs until exit to reduce spam. (You can still find them in the PaperTrail log viewer on Heroku.) Thread info: {self.thread_info}`")
             self.old_handler(_signo, _stackframe)
             sys.exit(0)
 
@@ -47,13 +47,13 @@ class ChatLogHandler(logging.Handler):
 
         try:
             # Can't import this at load or init time, because "django.core.exceptions.AppRegistryNotReady: Apps aren't loaded yet."
-            from puzzles.discordbot import DISCORD_ANNOUNCER, do_in_discord_nonblocking
+            from puzzles.announcer import ANNOUNCER
             import discord
 
             if self.startup:
                 self.startup = False
                 start_time = datetime.datetime.fromtimestamp(self.start_time)
-                #do_in_discord_nonblocking(DISCORD_ANNOUNCER.post_message(HERRING_DISCORD_DEBUG_CHANNEL, f"`[{start_time.strftime('%m/%d/%Y, %H:%M:%S')}] ChatLogHandler starting up, suppressing logs for the next {SUPPRESS_STARTUP_SECONDS} seconds to reduce spam. (You can still find them in the PaperTrail log viewer on Heroku.) Thread info: {self.thread_info} Signal handler info: {self.old_handler}`"))
+                #ANNOUNCER.send('post_message', HERRING_DISCORD_DEBUG_CHANNEL, f"`[{start_time.strftime('%m/%d/%Y, %H:%M:%S')}] ChatLogHandler starting up, suppressing logs for the next {SUPPRESS_STARTUP_SECONDS} seconds to reduce spam. (You can still find them in the PaperTrail log viewer on Heroku.) Thread info: {self.thread_info} Signal handler info: {self.old_handler}`")
 
             now = time.time()
             if now < self.start_time + SUPPRESS_STARTUP_SECONDS:
@@ -76,8 +76,8 @@ class ChatLogHandler(logging.Handler):
             if len(truncated_record) < len(formatted_record):
                 truncated_record += " ..."
             truncated_record += f" ({HEROKU_DYNO_NAME}, {HEROKU_RELEASE_VERSION})"
-            embed = discord.Embed(description=discord.utils.escape_markdown(truncated_record)[:MAX_DISCORD_EMBED_LEN])
-            do_in_discord_nonblocking(DISCORD_ANNOUNCER.post_message(HERRING_DISCORD_DEBUG_CHANNEL, "", embed=embed))
+            embed_description = discord.utils.escape_markdown(truncated_record)[:MAX_DISCORD_EMBED_LEN]
+            ANNOUNCER.send('post_message', HERRING_DISCORD_DEBUG_CHANNEL, "", embed_description)
         except Exception as e:
             self.shutdown = True
             # Safe to call logging.error from here once shutdown is True, since we will not try to do anything from emit().
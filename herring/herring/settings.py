@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/1.8/ref/settings/
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 import json
 import os
+from urllib.parse import urlsplit
 
 import environ
 
@@ -122,6 +123,15 @@ HERRING_CREATE_DISCORD_VOICE_CHANNELS = env.bool('CREATE_DISCORD_VOICE_CHANNELS'
 
 HERRING_DEBUG_DISCORD_VERBOSELY = env.bool('DEBUG_DISCORD_VERBOSELY', default=False)
 
+# The resolution and length of each puzzle's activity histogram (see
+# puzzles/histogram.py).
+HERRING_ACTIVITY_BUCKET_SECONDS = env.int('ACTIVITY_BUCKET_SECONDS', default=300)
+HERRING_ACTIVITY_WINDOW_HOURS = env.int('ACTIVITY_WINDOW_HOURS', default=48)
+
+# How many spare sheets and Discord channels to keep ready for new puzzles
+# (see puzzles/warmpool.py); 0 turns the warm pool off.
+HERRING_WARM_POOL_SIZE = env.int('WARM_POOL_SIZE', default=0)
+
 # Celery queue
 CELERY_BROKER_URL = env.get_value('BROKER_URL', default=REDIS_URL)
 #CELERY_BROKER_USE_SSL = { 'ssl_cert_reqs': 'none' }  # allow self-signed SSL certs
@@ -148,6 +158,24 @@ if HERRING_ACTIVATE_DISCORD and not HERRING_ENABLE_STANDALONE_DISCORD:
         'schedule': 60.0,
     }
 
+if HERRING_ACTIVATE_DISCORD or HERRING_ACTIVATE_GAPPS:
+    CELERY_BEAT_SCHEDULE['publish-service-status'] = {
+        'task': 'puzzles.tasks.publish_service_status',
+        'schedule': 30.0,
+    }
+
+if HERRING_ACTIVATE_DISCORD:
+    CELERY_BEAT_SCHEDULE['prune-presence'] = {
+        'task': 'puzzles.tasks.prune_presence',
+        'schedule': 300.0,
+    }
+
+if HERRING_WARM_POOL_SIZE and (HERRING_ACTIVATE_DISCORD or HERRING_ACTIVATE_GAPPS):
+    CELERY_BEAT_SCHEDULE['replenish-warm-pool'] = {
+        'task': 'puzzles.tasks.replenish_warm_pool',
+        'schedule': 60.0,
+    }
+
 # This indirectly affects the expiration time of the lock RedBeat sets in
 # Redis to ensure that only one scheduler is running. It largely doesn't
 # matter unless the worker process with the active RedBeat instance is
@@ -167,11 +195,24 @@ HERRING_HOST = env.get_value('HOST', default='http://localhost:8000')
 HERRING_PUZZLE_ACTIVITY_LOG_URL = env.get_value('PUZZLE_ACTIVITY_LOG_URL', default=None)
 HERRING_PUZZLE_SITE_SESSION_COOKIE = env.get_value('PUZZLE_SITE_SESSION_COOKIE', default=None)
 
+# Where browsers should connect to hear about changes to the hunt (see the
+# pushserver management command); if unset, they just poll.
+HERRING_PUSH_URL = env.get_value('PUSH_URL', default=None)
+HERRING_PUSH_PORT = env.int('PUSH_PORT', default=8001)
+# The pages allowed to connect to it, as origins (scheme://host[:port]);
+# by default, just HERRING_HOST.
+HERRING_PUSH_ALLOWED_ORIGINS = env.list('PUSH_ALLOWED_ORIGINS', default=[
+    '{0.scheme}://{0.netloc}'.format(urlsplit(HERRING_HOST)),
+])
+
 HERRING_DISCORD_GUILD_ID = int(env.get_value('DISCORD_GUILD', default=0))
 HERRING_DISCORD_PROTECTED_CATEGORIES = set(json.loads(env.get_value('DISCORD_PROTECTED_CATEGORIES', default='[]')))
 HERRING_DISCORD_PUZZLE_ANNOUNCEMENTS = env.get_value('DISCORD_ANNOUNCEMENTS', default='puzzle-announcements')
 HERRING_DISCORD_DEBUG_CHANNEL = env.get_value('DISCORD_DEBUG_CHANNEL', default='herringbot-debug')
 HERRING_DISCORD_BITRATE = env.int('DISCORD_BITRATE', default=128000)
+# If set, the announcer only uses Discord's REST API, without a gateway
+# connection of its own (see HerringAnnouncerBot.run_rest_only).
+HERRING_DISCORD_ANNOUNCER_REST_ONLY = env.bool('DISCORD_ANNOUNCER_REST_ONLY', default=False)
 
 # Previously in herring/secrets.py
 HERRING_SECRETS = json.loads(env.get_value('SECRETS', default='{}'))
@@ -4,6 +4,7 @@ from django.contrib.auth.models import User
 from django.conf import settings
 
 from .models import Round, Puzzle, UserProfile
+from .signals import opening_round
 
 class HuntIdListFilter(admin.SimpleListFilter):
     # Human-readable title which will be displayed in the
@@ -51,6 +52,12 @@ class RoundAdmin(admin.ModelAdmin):
     search_fields = ['name']
     readonly_fields = ('discord_categories',)
 
+    def save_related(self, request, form, formsets, change):
+        # Puzzles added through PuzzleInline get their sheets and channels all
+        # at once, rather than one at a time.
+        with opening_round(form.instance.id):
+            super().save_related(request, form, formsets, change)
+
 
 class PuzzleAdmin(admin.ModelAdmin):
     exclude = ('answer', 'note', 'tags', 'sheet_id')
@@ -0,0 +1,109 @@
+"""
+How the rest of Herring asks the Discord announcer bot to do things.
+
+The announcer bot runs in exactly one place: alongside the listener bot (see
+run_announcer_service in puzzles/discordbot.py), with the one gateway
+connection it needs. Everyone else -- web workers, Celery workers, the
+logging handler -- talks to it through a Redis list of commands, using
+ANNOUNCER below, so none of them ever has to connect to Discord themselves.
+
+A command names one of the announcer bot's command_* methods and gives its
+arguments, which (like its result) have to be JSON-serializable: pass IDs
+and names rather than model instances.
+"""
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from lazy_object_proxy import Proxy as lazy_object
+
+from puzzles.cache import REDIS, connect
+from puzzles.encoding import dumps, loads
+
+
+# Commands sent without waiting for an answer (mostly log messages) are
+# dropped if the announcer doesn't get to them within this long.
+SEND_EXPIRY_SECONDS = 600
+
+# How long the announcer keeps an answer around for a caller to pick up.
+REPLY_EXPIRY_SECONDS = 60
+
+
+class AnnouncerError(RuntimeError):
+    """
+    The announcer didn't answer in time, or the command failed.
+    """
+
+
+def queue_key():
+    return f'puzzles.announcer.{settings.HERRING_HUNT_ID}.queue'
+
+
+@lazy_object
+def _blocking_redis():
+    # Waiting for a reply holds a connection for as long as the command takes,
+    # so don't do it on the shared one.
+    return connect()
+
+
+class AnnouncerClient:
+    def call(self, method, *args, timeout=20):
+        """
+        Runs the given command in the announcer bot and returns its result,
+        raising AnnouncerError if it fails or takes longer than `timeout`
+        seconds (for example, because the announcer isn't running).
+        """
+        reply_key = f'{queue_key()}.reply.{uuid.uuid4().hex}'
+        self._push(method, args, deadline=time.time() + timeout, reply=reply_key)
+        result = _blocking_redis.blpop(reply_key, timeout=timeout)
+        if result is None:
+            raise AnnouncerError(f"timed out waiting for the announcer to {method}; seems like the announcer bot is dead")
+        reply = loads(result[1])
+        if reply.get('error') is not None:
+            raise AnnouncerError(f"announcer failed to {method}: {reply['error']}")
+        return reply['result']
+
+    def send(self, method, *args):
+        """
+        Queues the given command for the announcer bot without waiting for it
+        to run.
+        """
+        self._push(method, args, deadline=time.time() + SEND_EXPIRY_SECONDS, reply=None)
+
+    @staticmethod
+    def _push(method, args, deadline, reply):
+        logging.debug("announcer: queueing %s%r", method, args)
+        command = {'method': method, 'args': list(args), 'deadline': deadline, 'reply': reply}
+        REDIS.lpush(queue_key(), dumps(command))
+
+
+ANNOUNCER = AnnouncerClient()
+
+
+def receive(redis, timeout):
+    """
+    Waits up to `timeout` seconds for the next command that hasn't expired,
+    returning it (as a dict with 'method', 'args' and 'reply'), or None.
+    For use by the announcer service only.
+    """
+    item = redis.brpop(queue_key(), timeout=timeout)
+    if item is None:
+        return None
+    command = loads(item[1])
+    if command['deadline'] < time.time():
+        logging.warning(f"announcer: dropping expired command {command['method']}")
+        return None
+    return command
+
+
+def reply(redis, command, result=None, error=None):
+    """
+    Sends the result of a command back to whoever is waiting for it, if anyone.
+    """
+    if command['reply'] is None:
+        return
+    with redis.pipeline(transaction=True) as pipe:
+        pipe.rpush(command['reply'], dumps({'result': result, 'error': error}))
+        pipe.expire(command['reply'], REPLY_EXPIRY_SECONDS)
+        pipe.execute()
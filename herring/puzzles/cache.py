@@ -0,0 +1,38 @@
+from urllib.parse import urlparse
+
+from django.conf import settings
+from lazy_object_proxy import Proxy as lazy_object
+from redis import BlockingConnectionPool, ConnectionPool, Redis
+
+
+# How many connections the shared REDIS client may have open at once: enough
+# for every thread that uses it in one process (a web or Celery worker
+# thread, or in the Discord service, the event loop and sync_to_async's
+# thread), with one to spare. Beyond that, callers wait for a connection.
+REDIS_MAX_CONNECTIONS = 4
+
+# How long a caller waits for one of those connections before giving up.
+REDIS_POOL_TIMEOUT_SECONDS = 5
+
+
+def connect(pool_class=ConnectionPool, **kwargs):
+    ssl_kwargs = {}
+    url = urlparse(settings.REDIS_URL)
+    if url.scheme == "rediss":
+        ssl_kwargs["ssl_cert_reqs"] = None  # allow self-signed certificates
+    return Redis(connection_pool=pool_class.from_url(settings.REDIS_URL, **ssl_kwargs, **kwargs))
+
+
+@lazy_object
+def REDIS():
+    # Every instance of the Redis object creates its own connection pool,
+    # and Redis connections on Heroku are limited! So sharing this Redis
+    # instance is possibly important. TBH, I have no idea why we run out of
+    # Redis connections so quickly; it's possible this doesn't help at all.
+    # It's shared between threads, though, so it needs a connection for each
+    # of them; the blocking pool makes any extra threads wait their turn
+    # rather than fail. (Anything that needs to hold a connection open
+    # indefinitely, like a pub/sub subscriber, should call connect() to get
+    # its own.)
+    return connect(BlockingConnectionPool, max_connections=REDIS_MAX_CONNECTIONS, timeout=REDIS_POOL_TIMEOUT_SECONDS)
+
@@ -1,14 +1,15 @@
 import asyncio
 import collections
-import concurrent.futures
 import logging
 import re
 import threading
+import time
 import typing
-from datetime import timezone
+import uuid
+from datetime import datetime, timezone
 from urllib.parse import urljoin
 import aiohttp
-from lazy_object_proxy import Proxy as lazy_object
+import cachetools
 import traceback
 import sys
 
@@ -17,13 +18,19 @@ from typing import Optional, Any
 import discord
 from discord import app_commands
 from asgiref.sync import async_to_sync, sync_to_async
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord.utils import get
 from django.db import transaction
-from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.db.models import F, Q
 
 from django.conf import settings
-from puzzles.models import Round, Puzzle, UserProfile
+from puzzles import announcer, histogram, presence, reactions, warmpool
+from puzzles.announcer import ANNOUNCER
+from puzzles.cache import connect
+from puzzles.feed import invalidate_state, record_changes
+from puzzles.models import ChannelParticipation, Round, Puzzle, UserProfile
+from puzzles.ranking import get_ranking
 
 # Discord limits a user to putting 20 emojis on a message, so if this is more than 19, the menu won't work
 # also, an embed is limited to length 2048, which isn't really very long
@@ -64,12 +71,46 @@ TRIUMPH_EMOJI = "\N{PARTY POPPER}"
 # this is the most users we'll try to mention during an hb!who; more than this and you just get the number
 MAX_USER_LIST = 10
 
+# how much text Discord allows in an embed's description
+EMBED_DESCRIPTION_LENGTH = 4096
+
 # for safety's sake, we will only allow auto-assignment of roles below this role, to prevent bugs allowing
 # auto-assignment of powerful roles.
 AUTOROLE_MARKER = "-autoroles below-"
 
 MAX_DISCORD_EMBED_LEN = 2048
 
+# how often the listener writes the puzzle activity it has seen to the database
+ACTIVITY_FLUSH_SECONDS = 5
+
+# how many messages the listener remembers the signup and leave reaction targets of
+REACTION_TARGET_CACHE_SIZE = 1000
+
+# how often the listener reports who's in voice channels even if nobody has come or gone, so that the report doesn't
+# expire (see presence.VOICE_EXPIRY_SECONDS)
+VOICE_REFRESH_SECONDS = 60
+
+# how long the listener remembers that a channel isn't a puzzle channel before checking again
+NOT_A_PUZZLE_SECONDS = 600
+
+# how many puzzles' channels the announcer makes at once when opening a round (discord.py waits out rate limits for
+# us, so this is just to keep from queueing up all of them at once)
+OPEN_ROUND_CONCURRENCY = 5
+
+# how often a REST-only announcer reloads the guild's channels, since it doesn't hear about changes to them
+REST_REFRESH_SECONDS = 300
+# how soon a REST-only announcer tries again when reloading the guild's channels fails
+REST_RETRY_SECONDS = 30
+
+# how many of each kind of action cleanup_channels does at once
+CLEANUP_CONCURRENCY = 5
+
+# how many puzzles each list in hb!hot shows
+HOT_LIST_LENGTH = 5
+
+# where the announcer parks spare channels for the warm pool (see puzzles/warmpool.py)
+WARM_POOL_CATEGORY = "spare channels"
+
 GUILD_COMMANDS_FOR_TESTING = True
 
 if settings.HERRING_DEBUG_DISCORD_VERBOSELY:
@@ -132,6 +173,22 @@ class PuzzleChoiceView(discord.ui.View):
         await member.send(f"Welcome to the puzzle `{puzzle_chosen.name}`! Click to go there: {channel.mention}! Happy solving!")
         #await interaction.response.send_message(f'You selected: {interaction.data["values"]}')
 
+class NewPuzzlesView(discord.ui.View):
+    """
+    The menu the announcer attaches to the announcement of a batch of new
+    puzzles. The announcer doesn't handle interactions; choosing a puzzle here
+    is handled by the listener's PuzzleChoiceView, which has the same
+    custom_id and option values.
+    """
+    def __init__(self, puzzles):
+        super().__init__(timeout=None)
+        select = discord.ui.Select(custom_id="PuzzleChoiceView", placeholder="Please choose a puzzle:")
+        for puzzle in puzzles:
+            select.append_option(discord.SelectOption(
+                label=puzzle.name[:100],
+                value=f'huntpuzzle_{puzzle.hunt_id}_{puzzle.parent_id}_{puzzle.slug}'))
+        self.add_item(select)
+
 class RoundChoiceList(discord.ui.Select):
     def __init__(self, rounds, custom_id, placeholder, callback):
         super().__init__(custom_id=custom_id, placeholder=placeholder)
@@ -171,6 +228,202 @@ class RoundChoiceView(discord.ui.View):
         #interaction.client.add_view(new_view)  # XXX does this do anything at all
         await interaction.response.send_message(f'You selected: {interaction.data["values"]}', view=new_view, ephemeral=True)
 
+class ActivityBuffer:
+    """
+    Collects the messages the listener sees in puzzle channels, so that they
+    can be written to the database a batch at a time (see
+    _save_activity_batch) instead of with a transaction per message. Messages
+    by the same user in the same puzzle between flushes collapse into one
+    entry.
+    """
+    def __init__(self):
+        self.entries = {}
+        self.oldest = None
+        self.stats = {'flushes': 0, 'messages': 0, 'entries': 0, 'last_batch': 0, 'last_lag': 0.0, 'max_lag': 0.0}
+
+    def add(self, slug, member, dt):
+        if self.oldest is None:
+            self.oldest = time.monotonic()
+        entry = self.entries.get((slug, str(member.id)))
+        if entry is None:
+            entry = self.entries[(slug, str(member.id))] = {'dts': {}, 'minute_counts': collections.Counter(), 'last_active': dt, 'display_name': None, 'count': 0}
+        # Keep one timestamp per minute for the puzzle's activity tracker,
+        # whose buckets are two minutes long, and count messages per minute
+        # for its histogram, whose buckets are at least that long.
+        minute = int(dt.timestamp()) // 60
+        entry['dts'][minute] = dt
+        entry['minute_counts'][minute] += 1
+        if dt >= entry['last_active']:
+            entry['last_active'] = dt
+            entry['display_name'] = member.display_name
+        entry['count'] += 1
+
+    def take(self):
+        """
+        Empties the buffer, returning its entries and how long the oldest of
+        them has been waiting, in seconds.
+        """
+        entries, oldest = self.entries, self.oldest
+        self.entries, self.oldest = {}, None
+        return entries, (time.monotonic() - oldest if oldest is not None else 0.0)
+
+    def put_back(self, entries):
+        # for when a flush fails; anything seen since then wins
+        for key, entry in entries.items():
+            current = self.entries.get(key)
+            if current is not None:
+                entry['dts'].update(current['dts'])
+                entry['minute_counts'].update(current['minute_counts'])
+                entry['count'] += current['count']
+                if current['last_active'] >= entry['last_active']:
+                    entry['last_active'] = current['last_active']
+                    entry['display_name'] = current['display_name']
+            self.entries[key] = entry
+        if self.oldest is None:
+            self.oldest = time.monotonic()
+
+    def record_flush(self, entries, lag):
+        self.stats['flushes'] += 1
+        self.stats['messages'] += sum(entry['count'] for entry in entries.values())
+        self.stats['entries'] += len(entries)
+        self.stats['last_batch'] = len(entries)
+        self.stats['last_lag'] = lag
+        self.stats['max_lag'] = max(self.stats['max_lag'], lag)
+
+
+class VoicePresence:
+    """
+    Who's in each puzzle's voice channel, kept up to date from the gateway's
+    voice state updates so that nobody has to ask Discord. The listener
+    reports it to Redis for the puzzle feed (see presence.set_voice_users),
+    and counts each minute someone spends in a puzzle's voice channel as
+    activity there, as if they'd sent a message.
+    """
+    def __init__(self):
+        # slug -> {member id: member}
+        self.occupants = {}
+        # (slug, member id) -> the last minute we counted as activity
+        self.counted = {}
+        self.changed = True
+        self.last_report = None
+
+    def reset(self, occupants):
+        self.occupants = {slug: {member.id: member for member in members} for slug, members in occupants.items() if members}
+        self.counted = {}
+        self.changed = True
+
+    def join(self, slug, member):
+        members = self.occupants.setdefault(slug, {})
+        if member.id not in members:
+            self.changed = True
+        members[member.id] = member
+
+    def leave(self, slug, member):
+        members = self.occupants.get(slug, {})
+        if members.pop(member.id, None) is not None:
+            self.changed = True
+        if not members:
+            self.occupants.pop(slug, None)
+        self.counted.pop((slug, member.id), None)
+
+    def count_activity(self, activity: ActivityBuffer, now):
+        minute = int(now.timestamp()) // 60
+        for slug, members in self.occupants.items():
+            for member in members.values():
+                if self.counted.get((slug, member.id)) != minute:
+                    self.counted[(slug, member.id)] = minute
+                    activity.add(slug, member, now)
+
+    def take_report(self):
+        """
+        Returns who's in each puzzle's voice channel (a dict of slugs to
+        display names), if it's changed or it's time to report it again
+        anyway, or None otherwise.
+        """
+        if not self.changed and self.last_report is not None and time.monotonic() - self.last_report < VOICE_REFRESH_SECONDS:
+            return None
+        self.changed = False
+        self.last_report = time.monotonic()
+        return {slug: [member.display_name for member in members.values()] for slug, members in self.occupants.items()}
+
+    def report_failed(self):
+        self.changed = True
+
+
+class PuzzleChannelMap:
+    """
+    The listener's idea of which Discord channels belong to which puzzles
+    (by slug), so that it doesn't have to ask the database about every
+    message and reaction it sees. Channels that turn out not to be puzzle
+    channels are remembered for NOT_A_PUZZLE_SECONDS.
+
+    Channels are matched to puzzles by the IDs stored on the puzzles, and by
+    name only for puzzles whose channel of that kind hasn't been recorded yet
+    (as when the announcer has just made it), so that renaming a channel, or
+    making another channel with a puzzle's name, doesn't confuse us.
+
+    This is only touched from the bot's event loop; see forget_slug for
+    updates from elsewhere.
+    """
+    def __init__(self):
+        self.slugs = {}
+        self.not_puzzles = cachetools.TTLCache(maxsize=10000, ttl=NOT_A_PUZZLE_SECONDS)
+
+    async def warm(self, guild: discord.Guild):
+        rows = await _get_puzzle_channel_ids()
+        by_id = {}
+        unrecorded = {'text': set(), 'voice': set()}
+        for slug, text_id, voice_id in rows:
+            for kind, channel_id in (('text', text_id), ('voice', voice_id)):
+                if channel_id is None:
+                    unrecorded[kind].add(slug)
+                else:
+                    by_id[channel_id] = slug
+        self.slugs.clear()
+        self.not_puzzles.clear()
+        for channel in guild.channels:
+            if isinstance(channel, discord.CategoryChannel):
+                continue
+            slug = by_id.get(channel.id)
+            if slug is None and channel.name in unrecorded[_channel_kind(channel)]:
+                slug = channel.name
+            if slug is not None:
+                self.slugs[channel.id] = slug
+            else:
+                self.not_puzzles[channel.id] = channel.name
+        logging.info(f"found {len(self.slugs)} puzzle channels and {len(self.not_puzzles)} others")
+
+    async def lookup(self, channel) -> typing.Optional[str]:
+        """
+        Returns the slug of the puzzle the channel belongs to, or None if it
+        isn't a puzzle channel.
+        """
+        slug = self.slugs.get(channel.id)
+        if slug is not None or channel.id in self.not_puzzles:
+            return slug
+        return await self.refresh(channel)
+
+    async def refresh(self, channel) -> typing.Optional[str]:
+        self.forget(channel.id)
+        slug = await _find_puzzle_slug_for_channel(channel.id, channel.name, _channel_kind(channel))
+        if slug is not None:
+            self.slugs[channel.id] = slug
+            return slug
+        self.not_puzzles[channel.id] = channel.name
+        return None
+
+    def forget(self, channel_id):
+        self.slugs.pop(channel_id, None)
+        self.not_puzzles.pop(channel_id, None)
+
+    def forget_slug(self, slug):
+        # for when a puzzle is created or deleted; its channel (if there is
+        # one) will be looked up again next time
+        for channel_id, name in list(self.slugs.items()) + list(self.not_puzzles.items()):
+            if name == slug:
+                self.forget(channel_id)
+
+
 class HerringCog(commands.Cog):
     def __init__(self, bot:commands.Bot):
         self.bot = bot
@@ -179,9 +432,67 @@ class HerringCog(commands.Cog):
         self.debug_channel = None
         self.pronoun_roles = []
         self.timezone_roles = []
+        self.activity = ActivityBuffer()
+        self.voice = VoicePresence()
+        self.puzzle_channels = PuzzleChannelMap()
+        self.channels = ChannelIndex()
+        # puzzle id -> lock held while making its channels (see _make_puzzle_channels_inner)
+        self.channel_creation_locks = {}
+        # (message id, emoji) -> slug of the puzzle that reaction is about
+        self.reaction_targets = cachetools.LRUCache(maxsize=REACTION_TARGET_CACHE_SIZE)
         bot.add_view(RoundChoiceView(self, [])) # XXX
         bot.add_view(PuzzleChoiceView(self, []))
 
+    async def cog_load(self):
+        self.flush_activity.start()
+        post_save.connect(self.on_puzzle_changed, sender=Puzzle, dispatch_uid='listener_puzzle_channels')
+        post_delete.connect(self.on_puzzle_changed, sender=Puzzle, dispatch_uid='listener_puzzle_channels')
+
+    async def cog_unload(self):
+        post_save.disconnect(sender=Puzzle, dispatch_uid='listener_puzzle_channels')
+        post_delete.disconnect(sender=Puzzle, dispatch_uid='listener_puzzle_channels')
+        self.flush_activity.cancel()
+        await self.flush_activity_now()
+
+    def on_puzzle_changed(self, sender, instance, **kwargs):
+        # Django signals arrive on whatever thread did the saving.
+        self.bot.loop.call_soon_threadsafe(self.puzzle_channels.forget_slug, instance.slug)
+
+    @tasks.loop(seconds=ACTIVITY_FLUSH_SECONDS)
+    async def flush_activity(self):
+        self.voice.count_activity(self.activity, datetime.now(timezone.utc))
+        await self.report_voice()
+        await self.flush_activity_now()
+
+    async def report_voice(self):
+        voice_users = self.voice.take_report()
+        if voice_users is None:
+            return
+
+        @sync_to_async
+        def report():
+            presence.set_voice_users(voice_users)
+            invalidate_state()
+
+        try:
+            await report()
+        except Exception:
+            logging.warning("couldn't report who's in voice channels, will retry", exc_info=True)
+            self.voice.report_failed()
+
+    async def flush_activity_now(self):
+        entries, lag = self.activity.take()
+        if not entries:
+            return
+        try:
+            await _save_activity_batch(entries)
+        except Exception:
+            logging.exception(f"couldn't save a batch of {len(entries)} activity entries, will retry")
+            self.activity.put_back(entries)
+            return
+        self.activity.record_flush(entries, lag)
+        logging.info(f"saved {len(entries)} activity entries, oldest {lag:.1f}s old")
+
     def get_pronoun_roles(self):
         result = []
 
@@ -214,51 +525,116 @@ class HerringCog(commands.Cog):
     @commands.Cog.listener()
     async def on_ready(self):
         self.guild = self.bot.get_guild(settings.HERRING_DISCORD_GUILD_ID)
-        self.announce_channel = get(self.guild.text_channels, name = settings.HERRING_DISCORD_PUZZLE_ANNOUNCEMENTS)
-        self.debug_channel = get(self.guild.text_channels, name = settings.HERRING_DISCORD_DEBUG_CHANNEL)
+        self.channels.rebuild(self.guild.channels)
+        self.announce_channel = self.channels.text(settings.HERRING_DISCORD_PUZZLE_ANNOUNCEMENTS)
+        self.debug_channel = self.channels.text(settings.HERRING_DISCORD_DEBUG_CHANNEL)
         self.pronoun_roles = self.get_pronoun_roles()
         self.timezone_roles = self.get_timezone_roles()
+        await self.puzzle_channels.warm(self.guild)
+        occupants = {}
+        for channel in self.guild.voice_channels:
+            slug = await self.puzzle_channels.lookup(channel)
+            if slug is not None:
+                occupants[slug] = [member for member in channel.members if not member.bot]
+        self.voice.reset(occupants)
         logging.info("listener bot cog is ready")
 
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        if channel.guild.id != settings.HERRING_DISCORD_GUILD_ID:
+            return
+        self.channels.add(channel)
+        if not isinstance(channel, discord.CategoryChannel):
+            await self.puzzle_channels.refresh(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if after.guild.id != settings.HERRING_DISCORD_GUILD_ID or before.name == after.name:
+            return
+        self.channels.update(before, after)
+        if not isinstance(after, discord.CategoryChannel):
+            await self.puzzle_channels.refresh(after)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        if channel.guild.id != settings.HERRING_DISCORD_GUILD_ID:
+            return
+        self.channels.remove(channel)
+        self.puzzle_channels.forget(channel.id)
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
+        if member.bot or member.guild.id != settings.HERRING_DISCORD_GUILD_ID:
+            return
+        if before.channel is not None and before.channel != after.channel:
+            slug = await self.puzzle_channels.lookup(before.channel)
+            if slug is not None:
+                self.voice.leave(slug, member)
+        if after.channel is not None:
+            # on a mute or unmute (or in case we missed them joining), this just records them again
+            slug = await self.puzzle_channels.lookup(after.channel)
+            if slug is not None:
+                self.voice.join(slug, member)
+
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
+        # everything else, we don't care about, so don't go asking Discord about it
+        if payload.emoji.name not in (SIGNUP_EMOJI, LEAVE_EMOJI):
+            return
         logging.info("on_raw_reaction_add: %s", payload)
         # ignore myself
         if payload.user_id == self.bot.user.id:
             return
+        slug = await self.reaction_target(payload)
+        if slug is None:
+            return
+
+        if payload.emoji.name == SIGNUP_EMOJI:
+            logging.info(f"adding {payload.member.name} to {slug}")
+            _, changed = await self.add_user_to_puzzle(payload.member, slug)
+        else:
+            await self.remove_user_from_puzzle(payload.member, slug)
+            changed = True
+        if changed and payload.guild_id is not None:
+            message = self.bot.get_partial_messageable(payload.channel_id).get_partial_message(payload.message_id)
+            await message.remove_reaction(payload.emoji.name, payload.member)
+
+    async def reaction_target(self, payload: discord.RawReactionActionEvent) -> typing.Optional[str]:
+        """
+        Returns the slug of the puzzle that the signup or leave reaction is about, or None if it isn't about one.
+        Usually this is one of the announcer's messages, which it has told us about (see puzzles/reactions.py);
+        otherwise we have to fetch the message and see.
+        """
+        key = (payload.message_id, payload.emoji.name)
+        slug = self.reaction_targets.get(key)
+        if slug is not None:
+            return slug
+        slug = await sync_to_async(reactions.lookup)(payload.message_id, payload.emoji.name)
+        if slug is None:
+            slug = await self._reaction_target_from_message(payload)
+        if slug is not None:
+            self.reaction_targets[key] = slug
+        return slug
+
+    async def _reaction_target_from_message(self, payload: discord.RawReactionActionEvent):
         channel = self.bot.get_channel(payload.channel_id) or await self.bot.fetch_channel(payload.channel_id)
         message: discord.Message = await channel.fetch_message(payload.message_id)
         if payload.emoji.name == SIGNUP_EMOJI:
             # add someone to the puzzle
             # we're ok with this working anywhere for any reason if anyone ever mentions a puzzle channel
             if len(message.raw_channel_mentions) > 0:
-                target_channel_id = message.raw_channel_mentions[0]
-                target_channel = self.guild.get_channel(target_channel_id)
-                if not target_channel:
-                    return
-                try:
-                    puzzle = await _get_puzzle_by_slug(target_channel.name)
-                except Puzzle.DoesNotExist:
-                    return
-
-                logging.info(f"adding {payload.member.name} to {puzzle.slug}")
-                _, changed = await self.add_user_to_puzzle(payload.member, target_channel.name)
-                if changed and channel.type != discord.ChannelType.private:
-                    await message.remove_reaction(SIGNUP_EMOJI, payload.member)
+                target_channel = self.guild.get_channel(message.raw_channel_mentions[0])
+                if target_channel:
+                    return await self.puzzle_channels.lookup(target_channel)
         elif payload.emoji.name == LEAVE_EMOJI:
             # this should only work on the appropriate message in the puzzle channel or in puzzle-announcements
             if message.author.id == self.bot.user.id:
-                if payload.channel_id == self.announce_channel.id:
-                    target_channel = message.channel_mentions[0]
+                if payload.channel_id == self.announce_channel.id and message.channel_mentions:
+                    return message.channel_mentions[0].name
                 elif TRIUMPH_EMOJI in message.content:
                     # hopefully this is the "puzzle solved!" message
-                    target_channel = channel
-                else:
-                    target_channel = None
-                if target_channel:
-                    await self.remove_user_from_puzzle(payload.member, target_channel.name)
-                    if channel.type != discord.ChannelType.private:
-                        await message.remove_reaction(LEAVE_EMOJI, payload.member)
+                    return channel.name
+        return None
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -284,45 +660,24 @@ class HerringCog(commands.Cog):
             # don't care about other-guild messages
             return
 
-        def record_activity(puzzle: Puzzle):
-            dt = message.created_at.replace(tzinfo=timezone.utc)
-            puzzle.record_activity(dt)
-            query = Q(user_id=str(message.author.id))
-            row, created = puzzle.channelparticipation_set\
-                .filter(query)\
-                .get_or_create(defaults=dict(
-                        user_id=str(message.author.id),
-                        last_active=dt, is_member=True,
-                        display_name=message.author.display_name,
-                        channel_puzzle=puzzle,
-                ))
-            if not created and (row.last_active is None or row.last_active < dt):
-                row.last_active = dt
-                row.user_id = str(message.author.id)
-                row.display_name = message.author.display_name
-                row.is_member = True
-                row.save(update_fields=['user_id', 'last_active', 'is_member', 'display_name'])
-
-        try:
-            puzzle = await _get_puzzle_by_slug(message.channel.name)
-        except Puzzle.DoesNotExist as e:
+        slug = await self.puzzle_channels.lookup(message.channel)
+        if slug is None:
             # This is fine -- we must have seen a non-command message in a non-puzzle channel. Ignore it.
             # Optionally, we could verify that it's in a non-puzzle category.
             return
 
-        await _manipulate_puzzle(message.channel.name, record_activity)
+        self.activity.add(slug, message.author, message.created_at.replace(tzinfo=timezone.utc))
 
-        if puzzle is not None:
-            need_mentions = []
-            for member in message.mentions:
-                # if someone got mentioned, invite them to the puzzle
-                _, changed = await self.add_user_to_puzzle(member, puzzle.slug)
-                if changed:
-                    need_mentions.append(member)
-            if len(need_mentions) > 0:
-                all_mentions = ", ".join(member.mention for member in need_mentions)
-                alert = await message.channel.send(f"Added {all_mentions} to puzzle by request")
-                await alert.delete()
+        need_mentions = []
+        for member in message.mentions:
+            # if someone got mentioned, invite them to the puzzle
+            _, changed = await self.add_user_to_puzzle(member, slug)
+            if changed:
+                need_mentions.append(member)
+        if len(need_mentions) > 0:
+            all_mentions = ", ".join(member.mention for member in need_mentions)
+            alert = await message.channel.send(f"Added {all_mentions} to puzzle by request")
+            await alert.delete()
 
     #@app_commands.command(name="gwillen_test")
     #async def gwillen_test(self, interaction: discord.Interaction) -> None:
@@ -414,7 +769,7 @@ class HerringCog(commands.Cog):
     def puzzle_join_extra_info(self, puzzle):
         solved = "(SOLVED!) " if puzzle.answer else ""
         try:
-            text_channel, voice_channel = self.get_channel_pair(puzzle.slug)
+            text_channel, voice_channel = self.get_channel_pair(puzzle)
             # -2 for @everyone and the bot
             people_watching = len(text_channel.overwrites) - 2
             people_chatting = len(voice_channel.voice_states) if voice_channel else None
@@ -583,87 +938,137 @@ class HerringCog(commands.Cog):
 
     # not async! deals with database mostly; intended to be called from inside a _manipulate_puzzle
     def _update_channel_participation(self, puzzle):
-        text_channel, _ = self.get_channel_pair(puzzle.slug)
+        text_channel, _ = self.get_channel_pair(puzzle)
         if text_channel is None:
             return
-        membership = [member for member in text_channel.overwrites if member.id != self.guild.me.id and member.id != self.guild.default_role.id]
+        membership = [member for member in text_channel.overwrites if member.id != self.guild.me.id and not _is_role(member)]
         _update_channel_participation_inner(puzzle, membership)
 
     @commands.hybrid_command(aliases=["status"], brief="Show stats about puzzles")
-    async def who(self, ctx, puzzle_name:typing.Optional[discord.TextChannel]):
+    @app_commands.autocomplete(round=round_autocomplete)
+    async def who(self, ctx, puzzle_name: typing.Optional[discord.TextChannel], *, round: typing.Optional[str] = None):
         """
         Reports status of puzzles, including who is currently in the voice chat (if anyone). Can take a puzzle
-        channel name, in which case it only reports that puzzle; otherwise it PMs the user a menu to choose the round
+        channel name, in which case it only reports that puzzle, or a round; otherwise it PMs the user a menu to
+        choose the round
         :param puzzle_name: (optional) A particular puzzle channel you're curious about
+        :param round: (optional) A round you're curious about
         """
         await self.delete_message_if_possible(ctx)
         interaction: discord.Interaction = ctx.interaction
 
-        def puzzle_printerizer(puzzle):
-            text_channel, voice_channel = self.get_channel_pair(puzzle.slug)
-            membership: typing.Sequence[discord.Member] = [member for member in text_channel.overwrites if member.id != self.guild.me.id and member.id != self.guild.default_role.id]
-            if len(membership) > MAX_USER_LIST:
-                watching = len(membership)
-            else:
-                watching = ", ".join(member.display_name for member in membership) or "no one"
+        async def send_embeds(embeds):
+            for i, embed in enumerate(embeds):
+                if not interaction:
+                    await ctx.author.send(embed=embed)
+                elif i == 0:
+                    await interaction.response.send_message(embed=embed, ephemeral=True)
+                else:
+                    await interaction.followup.send(embed=embed, ephemeral=True)
 
-            if voice_channel is None:
-                voice_status = ""
-            elif len(voice_channel.members) > MAX_USER_LIST:
-                in_voice = len(voice_channel.members)
-                voice_status = f", {in_voice} in voice chat"
+        async def send_message(message):
+            if interaction:
+                await interaction.response.send_message(message, ephemeral=True)
             else:
-                in_voice = ", ".join(member.display_name for member in voice_channel.members) or "no one"
-                voice_status = f", {in_voice} in voice chat"
-            solved = " (SOLVED!)" if puzzle.answer else ""
-            return f"{_abbreviate_name(puzzle)} ({text_channel.mention}){solved}: {watching} watching{voice_status}"
+                await ctx.author.send(message)
 
         if puzzle_name is not None:
-            try:
-                puzzle = await sync_to_async(Puzzle.objects.get(slug=puzzle_name.name))
-                output = puzzle_printerizer(puzzle)
-                if interaction:
-                    await interaction.response.send_message(output, ephemeral=True)
-                else:
-                    await ctx.author.send(puzzle_printerizer(puzzle))
-            except Puzzle.DoesNotExist:
-                if interaction:
-                    await interaction.response.send_message("Sorry, that puzzle doesn't exist.", ephemeral=True)
-            return
-
-        if interaction:
-            await interaction.response.send_message("Sorry, this functionality doesn't work with slash commands at this time.", ephemeral=True)
+            puzzles, members = await sync_to_async(_puzzle_status)(slug=puzzle_name.name)
+            if not puzzles:
+                await send_message("Sorry, that puzzle doesn't exist.")
+                return
+            await send_message(self.puzzle_status_line(puzzles[0], members[puzzles[0].slug]))
             return
 
         rounds = await sync_to_async(list)(Round.objects.filter(hunt_id = settings.HERRING_HUNT_ID))
         if len(rounds) == 0:
-            await ctx.author.send("Sorry, there are no rounds available!")
+            await send_message("Sorry, there are no rounds available!")
             return
 
-        round_chosen: Round = await self.do_menu(
-            ctx.author,
-            rounds,
-            "Which round are you curious about?",
-            lambda round: round.name
-        )
-        if round_chosen is None:
-            # timed out, bail
+        if round is not None:
+            m = re.match("huntround_(.*)_(.*)", round)
+            if m:
+                round_chosen = next((r for r in rounds if str(r.id) == m.group(2)), None)
+            else:
+                round_chosen = next((r for r in rounds if round.lower() in (r.name.lower(), str(r.number))), None)
+            if round_chosen is None:
+                await send_message(f"Sorry, I can't find a round called {round}.")
+                return
+        elif interaction:
+            await send_message("Please choose a round, with the `round` option.")
             return
+        else:
+            round_chosen: Round = await self.do_menu(
+                ctx.author,
+                rounds,
+                "Which round are you curious about?",
+                lambda round: round.name
+            )
+            if round_chosen is None:
+                # timed out, bail
+                return
 
-        puzzles = await sync_to_async(list)(round_chosen.puzzle_set.all())
+        puzzles, members = await sync_to_async(_puzzle_status)(parent_id=round_chosen.id)
         if len(puzzles) == 0:
-            await ctx.author.send("Sorry, that round contains no puzzles right now.")
+            await send_message("Sorry, that round contains no puzzles right now.")
             return
 
-        description = puzzle_printerizer(puzzles[0])
-        for puzzle in puzzles[1:]:
-            puzzle_line = puzzle_printerizer(puzzle)
-            if len(description) + len(puzzle_line) > 2000:
-                await ctx.author.send("", embed=discord.Embed(description=description))
-                description = puzzle_line
-            else:
-                description += "\n" + puzzle_line
-        await ctx.author.send("", embed=discord.Embed(description=description))
+        lines = [self.puzzle_status_line(puzzle, members[puzzle.slug]) for puzzle in puzzles]
+        await send_embeds(_paginate_embeds(round_chosen.name, lines))
+
+    def puzzle_status_line(self, puzzle, members):
+        """
+        One puzzle's line of hb!who, from what _puzzle_status found out about it and whoever's in its voice channel
+        according to the gateway's voice states (which discord.py keeps for us).
+        """
+        text_channel, voice_channel = self.get_channel_pair(puzzle)
+        if puzzle.channel_count > MAX_USER_LIST:
+            watching = puzzle.channel_count
+        else:
+            watching = ", ".join(members) or "no one"
+
+        if voice_channel is None:
+            voice_status = ""
+        elif len(voice_channel.voice_states) > MAX_USER_LIST:
+            voice_status = f", {len(voice_channel.voice_states)} in voice chat"
+        else:
+            in_voice = ", ".join(member.display_name for member in voice_channel.members) or "no one"
+            voice_status = f", {in_voice} in voice chat"
+        where = text_channel.mention if text_channel is not None else f"#{puzzle.slug}"
+        solved = " (SOLVED!)" if puzzle.answer else ""
+        return f"{_abbreviate_name(puzzle)} ({where}){solved}: {watching} watching{voice_status}"
+
+    @commands.hybrid_command(brief="Show which puzzles are hot and which need attention")
+    async def hot(self, ctx):
+        """
+        Lists the unsolved puzzles with the most recent activity, and the ones nobody's in or has touched for the
+        longest.
+        """
+        await self.delete_message_if_possible(ctx)
+        ranking = await sync_to_async(get_ranking)()
+
+        def describe(entry, detail):
+            text_channel, _ = self.get_channel_pair(entry['slug'])
+            where = text_channel.mention if text_channel is not None else entry['slug']
+            return f"{entry['name']} ({where}): {detail}"
+
+        def idle(entry):
+            minutes = entry['idle_seconds'] // 60
+            return f"{minutes // 60}h{minutes % 60:02d}m" if minutes >= 60 else f"{minutes}m"
+
+        hottest = "\n".join(
+            describe(entry, f"{entry['solvers']} active, last activity {idle(entry)} ago")
+            for entry in ranking['hottest'][:HOT_LIST_LENGTH]) or "Nothing's happening!"
+        needs_attention = "\n".join(
+            describe(entry, f"{entry['solvers']} active, idle for {idle(entry)}")
+            for entry in ranking['needs_attention'][:HOT_LIST_LENGTH]) or "Nothing left to solve!"
+        embed = discord.Embed()
+        embed.add_field(name="Hottest", value=hottest[:1024], inline=False)
+        embed.add_field(name="Needs attention", value=needs_attention[:1024], inline=False)
+        if ctx.interaction:
+            await ctx.interaction.response.send_message(embed=embed, ephemeral=True)
+        else:
+            await ctx.author.send(embed=embed)
 
     # Disabled, we're going to using Discord's functionality for this. Keeping everything around just in case we decide that
     #   Discord community mode (required for that functionality) is for some reason intolerable.
@@ -731,10 +1136,10 @@ class HerringCog(commands.Cog):
             raise commands.NotOwner()
 
         run_modes = {
-            "Full Rebuild": (True, True, True),
-            "Create and Fix Only": (True, True, False),
-            "Fix Only": (True, False, False),
-            "Dry Run": (False, False, False)
+            "Full Rebuild": {'fix', 'create', 'delete'},
+            "Create and Fix Only": {'fix', 'create'},
+            "Fix Only": {'fix'},
+            "Dry Run": set(),
         }
 
         run_mode = await self.do_menu(
@@ -747,8 +1152,6 @@ class HerringCog(commands.Cog):
             # timed out, bail
             raise commands.UserInputError("Command timed out!")
 
-        fix, create, delete = run_modes[run_mode]
-
         @sync_to_async
         def get_rounds_and_puzzles():
             rounds = list(Round.objects.filter(hunt_id=settings.HERRING_HUNT_ID))
@@ -757,121 +1160,157 @@ class HerringCog(commands.Cog):
 
         rounds, puzzles = await get_rounds_and_puzzles()
 
-        def split_categories(round):
-            if round.discord_categories is None:
-                return []
-            categories = round.discord_categories.split(",")
-            return [int(category_id) for category_id in categories if category_id]
-
-        rounds_by_category = {category_id: round for round in rounds for category_id in split_categories(round)}
-        puzzles_by_slug = {puzzle.slug: puzzle for puzzle in puzzles}
-        puzzles_by_round = collections.defaultdict(list)
-        metapuzzles_by_round = collections.defaultdict(list)
-        for puzzle in puzzles:
-            puzzles_by_round[puzzle.parent_id].append(puzzle)
-            if puzzle.is_meta:
-                metapuzzles_by_round[puzzle.parent_id].append(puzzle)
-
-        # first delete anything that doesn't seem to be attached to an actual puzzle
-        for category in self.guild.categories:
-            if category.id in settings.HERRING_DISCORD_PROTECTED_CATEGORIES:
-                # these aren't puzzle categories
-                continue
-            for channel in category.channels:
-                if (channel.type in [discord.ChannelType.text, discord.ChannelType.voice]) and (channel.name not in puzzles_by_slug):
-                    # as an extra precaution, only delete things that are spelled like a puzzle channel AND have no chat history:
-                    if re.match(r"r\d+-", channel.name) and not channel.last_message_id:
-                        await ctx.author.send(f"Deleting {channel.type} channel {channel.name} in {category.name} (for real: {delete})")
-                        if delete:
-                            await channel.delete()
-                    else:
-                        await ctx.author.send(f"Skipping {channel.type} channel {channel.name} in {category.name} (last message {channel.last_message_id})")
-
-            # Never delete categories; they are few and we can do them by hand.
-            #if category.id not in rounds_by_category:
-            #    await ctx.author.send(f"Deleting category {category.name} (for real: {delete})")
-            #    if delete:
-            #        await category.delete()
-
-        # There used to be code here to delete channels that were in no category.
-        # Instead we should protect them if they exist; leave them alone.
+        snapshot = GuildSnapshot(
+            categories={
+                category.id: (category.name, [ChannelSnapshot.of(channel) for channel in category.channels])
+                for category in self.guild.categories
+            },
+            puzzle_channels={
+                puzzle.id: tuple(ChannelSnapshot.of(channel) for channel in self.get_channel_pair(puzzle))
+                for puzzle in puzzles
+            },
+        )
+        protected = set(settings.HERRING_DISCORD_PROTECTED_CATEGORIES)
+        warm_pool = self.channels.category(WARM_POOL_CATEGORY)
+        if warm_pool is not None:
+            protected.add(warm_pool.id)
+        plan = plan_cleanup(snapshot, rounds, puzzles, protected)
+
+        allowed = run_modes[run_mode]
+        report = await ctx.author.send(f"cleanup_channels ({run_mode}): {len(plan.actions)} actions planned, starting...")
+        results = await self._run_cleanup(plan, allowed, report, run_mode)
+        await report.edit(content=self._cleanup_report(plan, results, run_mode, done=True))
+
+    async def _run_cleanup(self, plan, allowed, report, run_mode):
+        """
+        Carries out the actions in the plan (the kinds allowed by the run mode, anyway), a stage at a time, and
+        returns a dict of the index of each action in the plan to its result: True if it worked, None if the run mode
+        skipped it, or the exception it failed with. Edits the report message with our progress after each stage.
+        """
+        # where each round's categories are, as we find or make them
+        categories = {}
+        for round_id, layout in plan.layouts.items():
+            for idx, category_id in enumerate(layout):
+                if category_id is not None:
+                    categories[(round_id, idx)] = self.guild.get_channel(category_id)
+
+        def category_for(target):
+            if target is None:
+                return None
+            category = categories.get(target)
+            if category is None:
+                raise ValueError(f"category {target[1]} of round {target[0]} doesn't exist")
+            return category
+
+        async def delete_channel(channel_id):
+            channel = self.guild.get_channel(channel_id)
+            if channel is not None:
+                await channel.delete()
+
+        async def create_category(target):
+            round_id, idx, name = target
+            categories[(round_id, idx)] = await _make_category_inner(self.guild, self.channels, name, self.bot.user)
 
-        for round in rounds:
-            # next, create any categories that don't seem to exist for whatever reason
-            new_categories = []
-            for idx, category_id in enumerate(split_categories(round)):
-                category = self.guild.get_channel(category_id)
-                if category is None:
-                    await ctx.author.send(f"creating new category for {round.name} {idx} (for real: {create})")
-                    if create:
-                        category = await _make_category_inner(self.guild, f"{round.name} {idx}" if idx > 0 else round.name)
-                new_categories.append(category)
-
-            # pretend rounds with no puzzles have one puzzle, just in case
-            while max(1, len(puzzles_by_round[round.id])) > len(new_categories) * PUZZLES_PER_CATEGORY:
-                await ctx.author.send(f"creating new category for {round.name} {len(new_categories)} (for real: {create})")
-                if create:
-                    category = await _make_category_inner(self.guild, f"{round.name} {len(new_categories)}" if len(new_categories) > 0 else round.name)
-                else:
-                    category = None
-                new_categories.append(category)
+        @sync_to_async
+        def save_categories(round):
+            round.discord_categories = ",".join(
+                str(category_for((round.id, idx)).id) for idx in range(len(plan.layouts[round.id])))
+            round.save()
+
+        async def create_channels(target):
+            puzzle, round_id, idx = target
+            await _make_puzzle_channels_inner(category_for((round_id, idx)), puzzle, self.channels, self.channel_creation_locks, self.bot.http)
+
+        async def edit_channel(target):
+            channel_id, changes = target
+            channel = self.guild.get_channel(channel_id)
+            if channel is None:
+                raise ValueError(f"channel {channel_id} doesn't exist anymore")
+            await channel.edit(**changes)
+
+        async def arrange_round(target):
+            round_id, round_puzzles = target
+            category_ids = [category_for((round_id, idx)).id for idx in range(len(plan.layouts[round_id]))]
+            await _arrange_channels(self.bot.http, self.guild.id, _position_updates(
+                layout_round(round_puzzles, len(category_ids)),
+                category_ids,
+                {puzzle.id: self.get_channel_pair(puzzle) for puzzle in round_puzzles}))
+
+        async def record_channels(puzzle):
+            text_channel, voice_channel = self.get_channel_pair(puzzle)
+            if text_channel is None:
+                return
 
-            @sync_to_async
-            def save_categories(round, categories):
-                round.discord_categories = categories
-                round.save()
+            def update_puzzle(locked_puzzle):
+                _store_channel_ids(locked_puzzle, text_channel, voice_channel)
+                self._update_channel_participation(locked_puzzle)
+            await _manipulate_puzzle(puzzle, update_puzzle)
+
+        handlers = {
+            'delete_channel': delete_channel,
+            'create_category': create_category,
+            'save_categories': save_categories,
+            'create_channels': create_channels,
+            'edit_channel': edit_channel,
+            'arrange_round': arrange_round,
+            'record_channels': record_channels,
+        }
+        # discord.py waits out rate limits itself; this just keeps us from queueing up hundreds of requests at once
+        semaphores = {kind: asyncio.Semaphore(CLEANUP_CONCURRENCY) for kind in handlers}
 
-            new_categories_value = ",".join(str(category.id) for category in new_categories)
-            if new_categories_value != round.discord_categories:
-                await ctx.author.send(f"saving {new_categories_value} to round {round.name} (for real: {create})")
-                if create:
-                    await save_categories(round, new_categories_value)
-
-            async def fixup_puzzle(puzzle, category_idx):
-                text_channel, voice_channel = self.get_channel_pair(puzzle.slug)
-                if text_channel is None:
-                    await ctx.author.send(f"creating channels for {puzzle.name} in {round.name} {category_idx} (for real: {create})")
-                    if create:
-                        text_channel, voice_channel = await _make_puzzle_channels_inner(new_categories[category_idx], puzzle)
-                if text_channel is not None and text_channel.category != new_categories[category_idx]:
-                    await ctx.author.send(f"Moving {puzzle.name} (text) to category {round.name} {category_idx} (for real: {fix})")
-                    if fix:
-                        await text_channel.edit(category=new_categories[category_idx])
-                if voice_channel is not None and voice_channel.category != new_categories[category_idx]:
-                    await ctx.author.send(f"Moving {puzzle.name} (voice) to category {round.name} {category_idx} (for real: {fix})")
-                    if fix:
-                        await voice_channel.edit(category=new_categories[category_idx])
-
-                new_topic = _build_topic(puzzle)
-                if text_channel is not None and text_channel.topic != new_topic:
-                    await ctx.author.send(f"Fixing topic of {puzzle.name} (for real: {fix})")
-                    if fix:
-                        await text_channel.edit(topic=new_topic)
-                if fix and text_channel is not None:
-                    await _manipulate_puzzle(puzzle, self._update_channel_participation)
-
-            # now, rearrange puzzle channels into categories
-            # first, stash metapuzzles somewhere else, to give us a little elbow room
-            for puzzle in metapuzzles_by_round[round.id]:
-                if fix:
-                    # if either are None we'll fix it later
-                    text_channel, voice_channel = self.get_channel_pair(puzzle.slug)
-                    if text_channel is not None:
-                        await text_channel.edit(category=None)
-                    if voice_channel is not None:
-                        await voice_channel.edit(category=None)
-
-            # then, move and/or create the normal puzzles where they're supposed to be
-            for idx, puzzle in enumerate(puzzles_by_round[round.id]):
-                if puzzle.is_meta:
+        async def run(action):
+            async with semaphores[action.kind]:
+                try:
+                    await handlers[action.kind](action.target)
+                    return True
+                except Exception as e:
+                    logging.warning(f"cleanup_channels: failed to {action.description}", exc_info=True)
+                    return e
+
+        results = {}
+        for stage in CLEANUP_STAGES:
+            to_run = []
+            for i, action in enumerate(plan.actions):
+                if action.stage != stage:
                     continue
-                await fixup_puzzle(puzzle, idx // PUZZLES_PER_CATEGORY)
-
-            # finally, put the metapuzzles back
-            for puzzle in metapuzzles_by_round[round.id]:
-                await fixup_puzzle(puzzle, 0)
+                if CLEANUP_KINDS[action.kind] in allowed:
+                    to_run.append(i)
+                else:
+                    results[i] = None
+            for i, result in zip(to_run, await asyncio.gather(*[run(plan.actions[i]) for i in to_run])):
+                results[i] = result
+            if to_run:
+                await report.edit(content=self._cleanup_report(plan, results, run_mode, done=False))
+        return results
 
-        await ctx.author.send("cleanup_channels: Done.")
+    @staticmethod
+    def _cleanup_report(plan, results, run_mode, done):
+        """
+        Summarizes how cleanup_channels is going, given the results so far from _run_cleanup (keyed by the index of
+        each action in the plan).
+        """
+        lines = [f"cleanup_channels ({run_mode}): {'Done.' if done else 'working...'}"]
+        for kind in CLEANUP_KINDS:
+            indices = [i for i, action in enumerate(plan.actions) if action.kind == kind]
+            if not indices:
+                continue
+            succeeded = sum(1 for i in indices if results.get(i) is True)
+            failed = sum(1 for i in indices if isinstance(results.get(i), Exception))
+            not_allowed = sum(1 for i in indices if i in results and results[i] is None)
+            lines.append(f"{kind}: {len(indices)} planned, {succeeded} done, {failed} failed, {not_allowed} not allowed in this mode")
+        if plan.skipped:
+            lines.append(f"skipped {len(plan.skipped)} channels that didn't look safe to delete: " + "; ".join(plan.skipped[:5]))
+        not_run = [
+            action.description for i, action in enumerate(plan.actions)
+            if i in results and results[i] is None and action.kind != 'record_channels'
+        ]
+        if not_run:
+            lines.append("would have: " + "; ".join(not_run[:15]))
+        failures = [f"{plan.actions[i].description}: {result}" for i, result in results.items() if isinstance(result, Exception)]
+        if failures:
+            lines.append("failures: " + "; ".join(failures[:10]))
+        # a DM can only be this long
+        return "\n".join(lines)[:2000]
 
     @staticmethod
     async def delete_message_if_possible(request_context):
@@ -884,7 +1323,7 @@ class HerringCog(commands.Cog):
             await request_message.delete()
 
     async def add_user_to_puzzle(self, member: discord.Member, puzzle_name: str):
-        text_channel, voice_channel = self.get_channel_pair(puzzle_name)
+        text_channel, voice_channel = self.get_channel_pair(await _find_puzzle(puzzle_name) or puzzle_name)
 
         changed = await _add_user_to_channels(member, text_channel, voice_channel)
 
@@ -893,14 +1332,12 @@ class HerringCog(commands.Cog):
             await text_channel.send(f"{member.mention} joined the puzzle.")
         return text_channel, changed
 
-    def get_channel_pair(self, puzzle_name):
-        text_channel: discord.TextChannel = get(self.guild.text_channels, name=puzzle_name)
-        voice_channel: discord.VoiceChannel = get(self.guild.voice_channels, name=puzzle_name)
-        return text_channel, voice_channel
+    def get_channel_pair(self, puzzle: typing.Union[Puzzle, str]):
+        return _get_channel_pair(self.channels, puzzle)
 
     async def remove_user_from_puzzle(self, member: discord.Member, puzzle_name: str):
         if member.bot: return
-        text_channel, voice_channel = self.get_channel_pair(puzzle_name)
+        text_channel, voice_channel = self.get_channel_pair(await _find_puzzle(puzzle_name) or puzzle_name)
 
         await text_channel.set_permissions(member, overwrite=None)
         if voice_channel is not None:
@@ -942,6 +1379,14 @@ class HerringCog(commands.Cog):
         logging.error(f"Ran out of options in a menu! {[printerizer(option) for option in options]}")
         return None
 
+    @commands.command(hidden=True)
+    async def activity_stats(self, ctx: commands.Context):
+        stats = self.activity.stats
+        await ctx.author.send(
+            f"{stats['flushes']} flushes, {stats['messages']} messages in {stats['entries']} entries; "
+            f"last batch {stats['last_batch']} entries, lag {stats['last_lag']:.1f}s (max {stats['max_lag']:.1f}s); "
+            f"{len(self.activity.entries)} entries waiting")
+
     @commands.command(hidden=True)
     async def test_positions(self, ctx: commands.Context):
         for category in self.guild.categories:
@@ -1095,10 +1540,10 @@ class HerringListenerBot(commands.Bot):
 
 class HerringAnnouncerBot(discord.Client):
     """
-    The announcer bot is run in each Celery worker thread. Its job is to take actions in Discord in reaction to
-    things happening in Django: creating categories and puzzles, announcing new puzzles, and announcing solved status.
-    It's critical that this bot doesn't listen for anything happening in Discord, because there are multiple copies of it
-    running at once, so each copy would react.
+    The announcer bot is run exactly once, by run_announcer_service, next to the listener bot. Its job is to take
+    actions in Discord in reaction to things happening in Django: creating categories and puzzles, announcing new
+    puzzles, and announcing solved status. Everything else asks it to do these things through ANNOUNCER (see
+    puzzles/announcer.py). It doesn't listen for anything happening in Discord; that's the listener's job.
     """
     def __init__(self, *args, **kwargs):
         intents = discord.Intents.default()
@@ -1108,34 +1553,158 @@ class HerringAnnouncerBot(discord.Client):
         super(HerringAnnouncerBot, self).__init__(*args, intents=intents, **kwargs)
         self.guild : Optional[discord.Guild] = None
         self.announce_channel : Optional[discord.TextChannel] = None
+        self.channels = ChannelIndex()
+        # puzzle id -> lock held while making its channels (see _make_puzzle_channels_inner)
+        self.channel_creation_locks = {}
+        self.rest_only = False
+        # member id -> member, in REST-only mode (see load_members)
+        self.members = {}
+        self._members_loaded_at = None
         self._really_ready = asyncio.Event()
 
+    async def run_rest_only(self, token):
+        """
+        An alternative to start() that never connects to the gateway. Everything
+        the announcer does (making channels, posting messages, adding reactions
+        and setting permissions) goes through Discord's REST API anyway, so
+        instead of waiting for READY and the guild's member list to arrive
+        over the gateway, we fetch just the guild, its channels and its
+        members. discord.py's HTTP client still handles connection pooling and
+        rate limits for us.
+        """
+        self.rest_only = True
+        await self.login(token)
+        self.guild = await self.fetch_guild(settings.HERRING_DISCORD_GUILD_ID)
+        await self.load_members()
+        while True:
+            try:
+                await self.load_channels()
+            except Exception:
+                # keep going with the channels we have, and try again soon
+                logging.warning("REST-only announcer couldn't reload the guild's channels", exc_info=True)
+                await asyncio.sleep(REST_RETRY_SECONDS)
+                continue
+            if not self._really_ready.is_set():
+                self.announce_channel = self.channels.text(settings.HERRING_DISCORD_PUZZLE_ANNOUNCEMENTS)
+                self._really_ready.set()
+                logging.info("REST-only announcer bot is really ready")
+            await asyncio.sleep(REST_REFRESH_SECONDS)
+
+    # discord.py's guild caches are normally filled in by gateway events. We
+    # leave them empty in REST-only mode, and keep what we fetch in
+    # self.channels and self.members instead.
+
+    async def load_channels(self):
+        self.channels.rebuild(await self.guild.fetch_channels())
+
+    async def load_members(self):
+        self.members = {member.id: member async for member in self.guild.fetch_members(limit=None)}
+        self._members_loaded_at = time.monotonic()
+
+    async def reload_channel(self, channel):
+        # to see the permission changes we just made
+        if self.rest_only:
+            channel = await self.fetch_channel(channel.id)
+            self.channels.add(channel)
+        return channel
+
+    def find_member_named(self, name):
+        if self.rest_only:
+            return _find_member_named(self.members.values(), name)
+        return self.guild.get_member_named(name)
+
+    async def get_member_named(self, name):
+        member = self.find_member_named(name)
+        if member is None and self.rest_only and time.monotonic() - self._members_loaded_at > 60:
+            # maybe they joined since we last looked
+            await self.load_members()
+            member = self.find_member_named(name)
+        return member
+
+    async def resolve_member(self, target):
+        # channel overwrites name members discord.py hasn't cached (all of them, in REST-only mode) by ID alone
+        if not (self.rest_only and isinstance(target, discord.Object)):
+            return target
+        member = self.members.get(target.id)
+        if member is None:
+            try:
+                member = self.members[target.id] = await self.guild.fetch_member(target.id)
+            except discord.NotFound:
+                # they've left the server, but their overwrite is still there
+                return None
+            except discord.HTTPException as e:
+                logging.warning(f"couldn't fetch member {target.id}: {e}")
+                return target
+        return member
+
     async def on_ready(self):
         self.guild = self.get_guild(settings.HERRING_DISCORD_GUILD_ID)
         if not self.guild:
             logging.info("couldn't find the right guild; are you sure you have the right bot token?")
 
-        self.announce_channel = get(self.guild.text_channels, name = settings.HERRING_DISCORD_PUZZLE_ANNOUNCEMENTS)
+        self.channels.rebuild(self.guild.channels)
+        self.announce_channel = self.channels.text(settings.HERRING_DISCORD_PUZZLE_ANNOUNCEMENTS)
         self._really_ready.set()
         logging.info("announcer bot is really ready")
 
-    def do_in_loop(self, coro, timeout=20):
-        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
-        try:
-            return future.result(timeout=timeout)
-        except concurrent.futures.TimeoutError:
-            logging.error(f"Timed out running {coro} in bot from thread {threading.current_thread()}", exc_info=True)
-            raise RuntimeError("seems like the announcer bot is dead")
+    # These don't react to anything; they just keep self.channels current.
+
+    async def on_guild_channel_create(self, channel):
+        if channel.guild.id == settings.HERRING_DISCORD_GUILD_ID:
+            self.channels.add(channel)
+
+    async def on_guild_channel_update(self, before, after):
+        if after.guild.id == settings.HERRING_DISCORD_GUILD_ID and before.name != after.name:
+            self.channels.update(before, after)
+
+    async def on_guild_channel_delete(self, channel):
+        if channel.guild.id == settings.HERRING_DISCORD_GUILD_ID:
+            self.channels.remove(channel)
+
+    async def run_command(self, command):
+        """
+        Runs a command from AnnouncerClient (see puzzles/announcer.py) and
+        returns its result.
+        """
+        method = getattr(self, f"command_{command['method']}", None)
+        if method is None:
+            raise ValueError(f"unknown announcer command {command['method']}")
+        return await method(*command['args'])
 
-    def do_in_loop_nonblocking(self, coro):
-        def handle_future_result(f):
-            # Retrieve and ignore result.
-            # I don't think this actually does anything?
-            # The goal was to suppress the warning that we ignored the result.
-            future.result()
+    # Commands for AnnouncerClient. These take and return only JSON-friendly
+    # values, since they come from other processes through Redis.
 
-        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
-        future.add_done_callback(handle_future_result)
+    async def command_is_ready(self, timeout):
+        return await self.wait_until_really_ready(timeout)
+
+    async def command_make_category(self, name):
+        category = await self.make_category(name)
+        return category.id
+
+    async def command_make_puzzle_channels(self, puzzle_id):
+        puzzle = await sync_to_async(Puzzle.objects.get)(id=puzzle_id)
+        await self.make_puzzle_channels(puzzle)
+
+    async def command_open_round(self, round_id, puzzle_ids):
+        return await self.open_round(round_id, puzzle_ids)
+
+    async def command_park_channels(self, count):
+        return await self.park_channels(count)
+
+    async def command_post_message(self, channel_name, message, embed_description=None):
+        embed = discord.Embed(description=embed_description) if embed_description is not None else None
+        await self.post_message(channel_name, message, embed=embed)
+
+    async def command_post_local_and_global(self, puzzle_name, local_content, global_content, local_reaction=None, global_reaction=None):
+        await self.post_local_and_global(puzzle_name, local_content, global_content, local_reaction, global_reaction)
+
+    async def command_add_user_to_puzzle(self, user_id, puzzle_name):
+        user_profile = await sync_to_async(UserProfile.objects.get)(user_id=user_id)
+        channel = await self.add_user_to_puzzle(user_profile, puzzle_name)
+        return channel.id if channel is not None else None
+
+    async def command_backfill_channel_ids(self, hunt_id):
+        return await self.backfill_channel_ids(hunt_id)
 
     async def wait_until_really_ready(self, timeout=None):
         try:
@@ -1147,20 +1716,26 @@ class HerringAnnouncerBot(discord.Client):
     async def make_category(self, name):
         await self._really_ready.wait()
         logging.info(f"making category called {name}")
-        return await _make_category_inner(self.guild, name)
-
-    async def make_puzzle_channels(self, puzzle: Puzzle):
-        await self._really_ready.wait()
+        return await _make_category_inner(self.guild, self.channels, name, self.user)
 
+    async def ensure_category_ready(self, round_id, num_puzzles=None):
+        """
+        Returns the round and the category its next puzzle's channels should go
+        in, making a new category if the round's are full. If the puzzle isn't
+        the round's last, num_puzzles says how many puzzles in the round come
+        up to and including it.
+        """
         # don't get these swapped! they have to be in this order, with sync_to_async applying last (appearing first)
         @sync_to_async
         @transaction.atomic
         def ensure_category_ready():
-            round: Round = Round.objects.select_for_update().get(id=puzzle.parent_id)
+            round: Round = Round.objects.select_for_update().get(id=round_id)
             if round.discord_categories is None or len(round.discord_categories) == 0:
                 raise ValueError(f"round {round.name} has no categories yet, try again soon")
 
-            num_puzzles = round.puzzle_set.count()
+            nonlocal num_puzzles
+            if num_puzzles is None:
+                num_puzzles = round.puzzle_set.count()
             categories = [int(i) for i in round.discord_categories.split(",")]
             if num_puzzles > len(categories) * PUZZLES_PER_CATEGORY:
                 # need to make a new category, which means getting back to async-land
@@ -1171,21 +1746,110 @@ class HerringAnnouncerBot(discord.Client):
                 round.discord_categories += "," + str(category.id)
                 round.save()
             else:
-                category = self.get_channel(categories[-1])
+                category = self.channels.get(categories[-1])
                 if category is None:
                     raise ValueError(f"category {categories[-1]} not found!")
                 logging.debug(f"found category {category.name}")
             return round, category
 
-        round, category = await ensure_category_ready()
+        return await ensure_category_ready()
 
-        text_channel, voice_channel = await _make_puzzle_channels_inner(category, puzzle)
+    async def make_puzzle_channels(self, puzzle: Puzzle):
+        await self._really_ready.wait()
+        round, category = await self.ensure_category_ready(puzzle.parent_id)
+
+        text_channel, voice_channel = await _make_puzzle_channels_inner(category, puzzle, self.channels, self.channel_creation_locks, self.http)
         announcement = await self.announce_channel.send(f"New puzzle {puzzle.name} opened in round {round.name}! {SIGNUP_EMOJI} this message to join, then click here to jump to the channel: {text_channel.mention}.")
+        await sync_to_async(reactions.record)(announcement.id, [SIGNUP_EMOJI, LEAVE_EMOJI], puzzle.slug)
         await announcement.add_reaction(SIGNUP_EMOJI)
 
+    async def open_round(self, round_id, puzzle_ids):
+        """
+        Like make_puzzle_channels, but for a batch of new puzzles in the same
+        round: makes their channels several at a time, and announces them all
+        at once. Returns how long each stage took, in seconds.
+
+        Puzzles that already have channels are left out, since they've been
+        announced already (or were on their way to it), e.g. by an earlier
+        try that tasks.open_round gave up waiting for.
+        """
+        await self._really_ready.wait()
+        timings = {}
+
+        start = time.perf_counter()
+        puzzles = await sync_to_async(list)(Puzzle.objects.filter(id__in=puzzle_ids, parent_id=round_id, discord_text_channel_id=None).order_by('-is_meta', 'number', 'id'))
+        num_earlier = await sync_to_async(Puzzle.objects.filter(parent_id=round_id).exclude(id__in=[puzzle.id for puzzle in puzzles]).count)()
+        # one at a time, since each may fill up the round's current category
+        categories = [await self.ensure_category_ready(round_id, num_earlier + i + 1) for i in range(len(puzzles))]
+        timings['categories'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(OPEN_ROUND_CONCURRENCY)
+
+        async def make_channels(puzzle, category):
+            async with semaphore:
+                text_channel, _ = await _make_puzzle_channels_inner(category, puzzle, self.channels, self.channel_creation_locks, self.http)
+                return text_channel
+
+        text_channels = await asyncio.gather(*[
+            make_channels(puzzle, category) for puzzle, (_, category) in zip(puzzles, categories)
+        ])
+        timings['channels'] = time.perf_counter() - start
+
+        # making them concurrently leaves them in whatever order Discord got to them, so sort out the whole round
+        start = time.perf_counter()
+        if puzzles:
+            try:
+                await self.arrange_round(categories[-1][0])
+            except discord.HTTPException:
+                # the channels are all there, just maybe out of order; cleanup_channels can fix that later
+                logging.warning(f"couldn't arrange the channels of round {round_id}", exc_info=True)
+        timings['arrange'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if puzzles:
+            round = categories[0][0]
+            # A select menu holds at most 25 options, so that's how many puzzles each announcement can offer.
+            for first in range(0, len(puzzles), 25):
+                batch = puzzles[first:first + 25]
+                channel_list = ", ".join(channel.mention for channel in text_channels[first:first + 25])
+                announcement = await self.announce_channel.send(
+                    f"New puzzles opened in round {round.name}: {channel_list}! Choose one below to join it.",
+                    view=NewPuzzlesView(batch))
+                # reactions here are about the first puzzle mentioned, as they would be on any message
+                await sync_to_async(reactions.record)(announcement.id, [SIGNUP_EMOJI, LEAVE_EMOJI], batch[0].slug)
+        timings['announcement'] = time.perf_counter() - start
+        return timings
+
+    async def arrange_round(self, round: Round):
+        """
+        Puts all of the round's puzzle channels in the categories and positions layout_round says, with one request.
+        """
+        round_puzzles = await sync_to_async(list)(Puzzle.objects.filter(parent_id=round.id))
+        category_ids = [int(category_id) for category_id in round.discord_categories.split(",") if category_id]
+        await _arrange_channels(self.http, self.guild.id, _position_updates(
+            layout_round(round_puzzles, len(category_ids)),
+            category_ids,
+            {puzzle.id: self.get_channel_pair(puzzle) for puzzle in round_puzzles}))
+
+    async def park_channels(self, count):
+        """
+        Makes up to `count` spare text channels for the warm pool, hidden in
+        WARM_POOL_CATEGORY until a puzzle claims them, and returns their IDs.
+        """
+        category = await self.make_category(WARM_POOL_CATEGORY)
+        # Discord won't let a category hold more than 50 channels
+        count = min(count, 50 - len(self.channels.in_category(category.id)))
+        channel_ids = []
+        for _ in range(count):
+            channel = await category.create_text_channel(f"spare-{uuid.uuid4().hex[:8]}")
+            self.channels.add(channel)
+            channel_ids.append(channel.id)
+        return channel_ids
+
     async def post_message(self, channel_name, message, **kwargs):
         await self._really_ready.wait()
-        channel: discord.TextChannel = get(self.guild.text_channels, name=channel_name)
+        channel: discord.TextChannel = self.channels.text(channel_name)
         if channel is None:
             logging.error(f"Couldn't get Discord channel {channel_name} in post_local_and_global!")
             return
@@ -1193,7 +1857,7 @@ class HerringAnnouncerBot(discord.Client):
 
     async def post_local_and_global(self, puzzle_name, local_content, global_content:str, local_reaction=None, global_reaction=None):
         await self._really_ready.wait()
-        channel: discord.TextChannel = get(self.guild.text_channels, name=puzzle_name)
+        channel, _ = self.get_channel_pair(await _find_puzzle(puzzle_name) or puzzle_name)
         if channel is None:
             logging.error(f"Couldn't get Discord channel {puzzle_name} in post_local_and_global!")
             return
@@ -1201,6 +1865,11 @@ class HerringAnnouncerBot(discord.Client):
         local_message = await channel.send(local_content)
         global_content = global_content.replace(f"#{puzzle_name}", channel.mention)
         global_message = await self.announce_channel.send(global_content)
+        # the same reactions the listener would find these messages are about if it fetched them
+        if TRIUMPH_EMOJI in local_content:
+            await sync_to_async(reactions.record)(local_message.id, [LEAVE_EMOJI], channel.name)
+        if channel.mention in global_content:
+            await sync_to_async(reactions.record)(global_message.id, [SIGNUP_EMOJI, LEAVE_EMOJI], channel.name)
         if local_reaction:
             await local_message.add_reaction(local_reaction)
         if global_reaction:
@@ -1208,51 +1877,46 @@ class HerringAnnouncerBot(discord.Client):
 
     async def add_user_to_puzzle(self, user_profile: UserProfile, puzzle_name):
         await self._really_ready.wait()
-        text_channel, voice_channel = self.get_channel_pair(puzzle_name)
+        text_channel, voice_channel = self.get_channel_pair(await _find_puzzle(puzzle_name) or puzzle_name)
         if text_channel is None:
             return
-        member = self.guild.get_member_named(user_profile.discord_identifier)
+        member = await self.get_member_named(user_profile.discord_identifier)
         if member is None:
             logging.warning(f"couldn't find member named {user_profile.discord_identifier}")
             return
         changed = await _add_user_to_channels(member, text_channel, voice_channel)
-        membership = [member for member in text_channel.overwrites if member.id != self.guild.me.id and member.id != self.guild.default_role.id]
+        if changed:
+            text_channel = await self.reload_channel(text_channel)
+        membership = []
+        for target in text_channel.overwrites:
+            if target.id == self.user.id or _is_role(target):
+                continue
+            member = await self.resolve_member(target)
+            if member is not None:
+                membership.append(member)
         await _manipulate_puzzle(puzzle_name, lambda puzzle: _update_channel_participation_inner(puzzle, membership))
         if changed:
             await text_channel.send(f"{member.mention} joined the puzzle.")
         return text_channel
 
-    def get_channel_pair(self, puzzle_name):
-        text_channel: discord.TextChannel = get(self.guild.text_channels, name=puzzle_name)
-        voice_channel: discord.VoiceChannel = get(self.guild.voice_channels, name=puzzle_name)
-        return text_channel, voice_channel
-
-@lazy_object
-def DISCORD_ANNOUNCER() -> Optional[HerringAnnouncerBot]:
-    if not settings.HERRING_ACTIVATE_DISCORD:
-        logging.warning("Running without Discord integration!")
-        return None
-    bot = make_announcer_bot()
-    if bot:
-        # Absolutely must not use any other method to send this here, because they all directly or indirectly call DISCORD_ANNOUNCER and would explode.
-        #bot.do_in_loop(bot.post_message(settings.HERRING_DISCORD_DEBUG_CHANNEL, f"Discord announcer bot created in app: {settings.HEROKU_APP_NAME} / dyno {settings.HEROKU_DYNO_NAME}"))
-        return bot
-    else:
-        logging.info("Oh no, failed to create discord announcer bot :-(")
-        return None  # whoever called us will fail to say things to discover forever after :-\
-
-def do_in_discord(coro):
-    try:
-        return DISCORD_ANNOUNCER.do_in_loop(coro)
-    except RuntimeError:
-        # probably the discord bot is busted, try to make it rebuild
-        logging.error("Invalidating discord announcer bot!")
-        del DISCORD_ANNOUNCER.__target__
-        raise
-
-def do_in_discord_nonblocking(coro):
-    DISCORD_ANNOUNCER.do_in_loop_nonblocking(coro)
+    def get_channel_pair(self, puzzle: typing.Union[Puzzle, str]):
+        return _get_channel_pair(self.channels, puzzle)
 
+    async def backfill_channel_ids(self, hunt_id):
+        """
+        Stores the IDs of the channels named after each of the hunt's puzzles,
+        for puzzles whose channels were made before we kept track of them.
+        Returns the number of puzzles updated.
+        """
+        await self._really_ready.wait()
+        puzzles = await sync_to_async(list)(Puzzle.objects.filter(hunt_id=hunt_id))
+        changed = []
+        for puzzle in puzzles:
+            text_channel, voice_channel = self.get_channel_pair(puzzle)
+            if _store_channel_ids(puzzle, text_channel, voice_channel):
+                changed.append(puzzle)
+        await sync_to_async(Puzzle.objects.bulk_update)(changed, ['discord_text_channel_id', 'discord_voice_channel_id'], batch_size=100)
+        return len(changed)
 
 def log_to_discord(message, exn=None, add_stacktrace=False):
     try:
@@ -1263,30 +1927,344 @@ def log_to_discord(message, exn=None, add_stacktrace=False):
         else:
             stack_trace = "".join(traceback.format_exception(None, exn, exn.__traceback__, limit=5))
         if exn or add_stacktrace:
-            stack = discord.Embed(description=discord.utils.escape_markdown(stack_trace)[:MAX_DISCORD_EMBED_LEN])
+            stack = discord.utils.escape_markdown(stack_trace)[:MAX_DISCORD_EMBED_LEN]
         else:
             stack = None
-        do_in_discord_nonblocking(DISCORD_ANNOUNCER.post_message(settings.HERRING_DISCORD_DEBUG_CHANNEL, f"`log_to_discord`: `{message}` `({thread_info})`", embed=stack))
+        ANNOUNCER.send('post_message', settings.HERRING_DISCORD_DEBUG_CHANNEL, f"`log_to_discord`: `{message}` `({thread_info})`", stack)
     except Exception as e:
         logging.error(f"Logging to Discord failed, ignoring it! message={message} exn={exn} (failed with: {e})")
 
 # Shared utilities that both bots use
 
-async def _make_puzzle_channels_inner(category: discord.CategoryChannel, puzzle: Puzzle):
-    @async_to_sync
-    async def do_make_channels(locked_puzzle):
-        topic = _build_topic(locked_puzzle)
+class ChannelIndex:
+    """
+    A guild's text channels, voice channels and categories, indexed by name
+    and by ID. discord.utils.get(guild.text_channels, name=...) is a linear
+    scan (and guild.text_channels sorts every channel in the guild each time
+    it's called), which adds up once a hunt has hundreds of puzzle channels.
+
+    Each bot builds one of these in on_ready and keeps it up to date from the
+    guild channel events. A REST-only announcer hears no events and has no
+    guild cache, so it rebuilds one from the channels it fetches instead, and
+    this is its only record of them. Lookups by name return the same channel
+    that the linear scan would have (the first by position, if several share
+    a name).
+    """
+    KINDS = {
+        discord.ChannelType.text: 'text',
+        discord.ChannelType.news: 'text',
+        discord.ChannelType.voice: 'voice',
+        discord.ChannelType.category: 'category',
+    }
+
+    def __init__(self):
+        self.by_kind = {kind: collections.defaultdict(dict) for kind in set(self.KINDS.values())}
+        self.by_id = {}
+
+    def rebuild(self, channels: typing.Iterable[discord.abc.GuildChannel]):
+        for index in self.by_kind.values():
+            index.clear()
+        self.by_id.clear()
+        for channel in channels:
+            self.add(channel)
+
+    def add(self, channel, name=None):
+        kind = self.KINDS.get(channel.type)
+        if kind is not None:
+            self.by_kind[kind][name or channel.name][channel.id] = channel
+            self.by_id[channel.id] = channel
+
+    def remove(self, channel, name=None):
+        kind = self.KINDS.get(channel.type)
+        if kind is None:
+            return
+        self.by_id.pop(channel.id, None)
+        index = self.by_kind[kind]
+        channels = index.get(name or channel.name)
+        if channels is not None:
+            channels.pop(channel.id, None)
+            if not channels:
+                del index[name or channel.name]
+
+    def update(self, before, after):
+        self.remove(after, name=before.name)
+        self.add(after)
+
+    def _get(self, kind, name):
+        channels = self.by_kind[kind].get(name)
+        if not channels:
+            return None
+        return min(channels.values(), key=lambda channel: (channel.position, channel.id))
+
+    def text(self, name) -> Optional[discord.TextChannel]:
+        return self._get('text', name)
+
+    def voice(self, name) -> Optional[discord.VoiceChannel]:
+        return self._get('voice', name)
+
+    def category(self, name) -> Optional[discord.CategoryChannel]:
+        return self._get('category', name)
+
+    def get(self, channel_id) -> Optional[discord.abc.GuildChannel]:
+        return self.by_id.get(channel_id)
+
+    def in_category(self, category_id) -> typing.List[discord.abc.GuildChannel]:
+        return [channel for channel in self.by_id.values() if channel.category_id == category_id]
+
+
+class ChannelSnapshot(typing.NamedTuple):
+    """
+    What cleanup_channels needs to know about a channel, copied out of the
+    guild so that plan_cleanup doesn't have to touch discord.py objects.
+    """
+    id: int
+    name: str
+    type: discord.ChannelType
+    category_id: Optional[int]
+    position: int
+    topic: Optional[str]
+    last_message_id: Optional[int]
+
+    @classmethod
+    def of(cls, channel):
+        if channel is None:
+            return None
+        return cls(channel.id, channel.name, channel.type, channel.category_id, channel.position,
+                   getattr(channel, 'topic', None), getattr(channel, 'last_message_id', None))
+
+
+class GuildSnapshot(typing.NamedTuple):
+    # category id -> (category name, [ChannelSnapshot of each channel in it])
+    categories: dict
+    # puzzle id -> (text ChannelSnapshot or None, voice ChannelSnapshot or None)
+    puzzle_channels: dict
+
+
+class CleanupAction(typing.NamedTuple):
+    stage: str  # one of CLEANUP_STAGES
+    kind: str   # one of CLEANUP_KINDS
+    description: str
+    target: Any
+
+
+class CleanupPlan(typing.NamedTuple):
+    actions: list
+    # descriptions of channels we'd have deleted if they looked safe to delete
+    skipped: list
+    # round id -> what each of its categories should be: the id of an existing category, or None for one we have
+    # to make
+    layouts: dict
+
+
+# cleanup_channels runs its actions a stage at a time, in this order, and everything within a stage concurrently
+CLEANUP_STAGES = ['delete', 'categories', 'create', 'topics', 'arrange', 'record']
+
+# each kind of cleanup action, and which part of cleanup_channels' run mode allows it
+CLEANUP_KINDS = {
+    'delete_channel': 'delete',
+    'create_category': 'create',
+    'save_categories': 'create',
+    'create_channels': 'create',
+    'edit_channel': 'fix',
+    'arrange_round': 'fix',
+    'record_channels': 'fix',
+}
+
+
+def _layout_order(puzzle):
+    # metapuzzles first, then in the order they were numbered (or made)
+    return (not puzzle.is_meta, puzzle.number or puzzle.id, puzzle.id)
+
+
+def layout_round(puzzles, num_categories):
+    """
+    Works out where all of a round's puzzle channels belong, at once: returns a dict of each puzzle's ID to the index
+    (among the round's categories) of the category its channels go in, and their position there.
+    """
+    layout = {}
+    for i, puzzle in enumerate(sorted(puzzles, key=_layout_order)):
         # setting position=0 doesn't work
-        position = 1 if locked_puzzle.is_meta else (locked_puzzle.number or locked_puzzle.id) + 10
-        text_channel = get(category.guild.text_channels, name=locked_puzzle.slug) or \
-                       await category.create_text_channel(locked_puzzle.slug, topic=topic, position=position)
+        layout[puzzle.id] = (min(i // PUZZLES_PER_CATEGORY, num_categories - 1), i + 1)
+    return layout
+
+
+def _position_updates(layout, category_ids, channel_pairs):
+    """
+    Returns what Discord's "modify guild channel positions" endpoint needs to put every channel where the layout
+    says, leaving out channels that are already there. channel_pairs is a dict of puzzle IDs to their text and voice
+    channels (or ChannelSnapshots), either of which may be None.
+    """
+    updates = []
+    for puzzle_id, (category_idx, position) in layout.items():
+        category_id = category_ids[category_idx]
+        for channel in channel_pairs.get(puzzle_id, ()):
+            if channel is None:
+                continue
+            if category_id is None or channel.category_id != category_id or channel.position != position:
+                updates.append({'id': channel.id, 'parent_id': category_id, 'position': position})
+    return updates
+
+
+async def _arrange_channels(http: discord.http.HTTPClient, guild_id: int, updates):
+    """
+    Moves channels to the categories and positions in `updates` (from _position_updates), in one request rather than
+    one per channel. `http` is the calling bot's HTTP client.
+    """
+    if updates:
+        # this is the request GuildChannel.move makes, but for every channel at once, and without needing the channels
+        # in discord.py's guild cache (which a REST-only announcer doesn't fill in)
+        await http.bulk_channel_update(guild_id, updates, reason="arranging puzzle channels")
+
+
+def plan_cleanup(snapshot: GuildSnapshot, rounds, puzzles, protected_categories) -> CleanupPlan:
+    """
+    Works out everything cleanup_channels has to do to get the guild's puzzle channels and categories laid out the
+    way the database says they should be, given a snapshot of the guild. This doesn't change anything, in Discord or
+    in the database.
+    """
+    actions = []
+    skipped = []
+    puzzles_by_slug = {puzzle.slug: puzzle for puzzle in puzzles}
+    puzzles_by_round = collections.defaultdict(list)
+    for puzzle in puzzles:
+        puzzles_by_round[puzzle.parent_id].append(puzzle)
+
+    # first delete anything that doesn't seem to be attached to an actual puzzle
+    for category_id, (category_name, channels) in snapshot.categories.items():
+        if category_id in protected_categories:
+            # these aren't puzzle categories
+            continue
+        for channel in channels:
+            if (channel.type in [discord.ChannelType.text, discord.ChannelType.voice]) and (channel.name not in puzzles_by_slug):
+                # as an extra precaution, only delete things that are spelled like a puzzle channel AND have no chat history:
+                if re.match(r"r\d+-", channel.name) and not channel.last_message_id:
+                    actions.append(CleanupAction('delete', 'delete_channel', f"delete {channel.type} channel {channel.name} in {category_name}", channel.id))
+                else:
+                    skipped.append(f"{channel.type} channel {channel.name} in {category_name} (last message {channel.last_message_id})")
+    # Never delete categories; they are few and we can do them by hand.
+
+    layouts = {}
+    for round in rounds:
+        # next, create any categories that don't seem to exist for whatever reason
+        category_ids = [int(category_id) for category_id in (round.discord_categories or "").split(",") if category_id]
+        layout = [category_id if category_id in snapshot.categories else None for category_id in category_ids]
+        # pretend rounds with no puzzles have one puzzle, just in case
+        while max(1, len(puzzles_by_round[round.id])) > len(layout) * PUZZLES_PER_CATEGORY:
+            layout.append(None)
+        layouts[round.id] = layout
+        for idx, category_id in enumerate(layout):
+            if category_id is None:
+                name = f"{round.name} {idx}" if idx > 0 else round.name
+                actions.append(CleanupAction('categories', 'create_category', f"create category {name}", (round.id, idx, name)))
+        if None in layout or ",".join(str(category_id) for category_id in layout) != round.discord_categories:
+            actions.append(CleanupAction('create', 'save_categories', f"save categories of round {round.name}", round))
+
+        # then make sure each puzzle has channels, with the right topic, and arrange the whole round's channels in one go
+        round_layout = layout_round(puzzles_by_round[round.id], len(layout))
+        missing_channels = False
+        for puzzle in puzzles_by_round[round.id]:
+            category_idx, _ = round_layout[puzzle.id]
+            text_channel, voice_channel = snapshot.puzzle_channels.get(puzzle.id, (None, None))
+            if text_channel is None:
+                missing_channels = True
+                actions.append(CleanupAction('create', 'create_channels', f"create channels for {puzzle.name} in {round.name} {category_idx}", (puzzle, round.id, category_idx)))
+            elif text_channel.topic != _build_topic(puzzle):
+                actions.append(CleanupAction('topics', 'edit_channel', f"fix topic of {puzzle.name}", (text_channel.id, {'topic': _build_topic(puzzle)})))
+            actions.append(CleanupAction('record', 'record_channels', f"record channels of {puzzle.name}", puzzle))
+        if missing_channels or _position_updates(round_layout, layout, snapshot.puzzle_channels):
+            actions.append(CleanupAction('arrange', 'arrange_round', f"arrange channels of round {round.name}", (round.id, puzzles_by_round[round.id])))
+
+    return CleanupPlan(actions, skipped, layouts)
+
+
+async def _make_puzzle_channels_inner(category: discord.CategoryChannel, puzzle: Puzzle, channels: ChannelIndex, locks: dict, http: discord.http.HTTPClient):
+    # This talks to Discord without holding the puzzle's row lock, so that
+    # several puzzles' channels can be made at once. Instead, `locks` (the
+    # calling bot's, of puzzle IDs to locks) keeps two callers from both
+    # deciding a puzzle needs channels and making two sets.
+    lock = locks.setdefault(puzzle.id, asyncio.Lock())
+    async with lock:
+        topic = _build_topic(puzzle)
+        # setting position=0 doesn't work
+        position = 1 if puzzle.is_meta else (puzzle.number or puzzle.id) + 10
+        text_channel, voice_channel = _get_channel_pair(channels, puzzle)
+        if text_channel is None:
+            text_channel = await _claim_parked_channel(category, puzzle.slug, topic, position, channels, http)
+        if text_channel is None:
+            text_channel = await category.create_text_channel(puzzle.slug, topic=topic, position=position)
+            # don't wait for the gateway event to tell us about it
+            channels.add(text_channel)
         if settings.HERRING_CREATE_DISCORD_VOICE_CHANNELS:
-            voice_channel = get(category.guild.voice_channels, name=locked_puzzle.slug) or \
-                            await category.create_voice_channel(locked_puzzle.slug, position=position, bitrate=settings.HERRING_DISCORD_BITRATE)
+            if voice_channel is None:
+                voice_channel = await category.create_voice_channel(puzzle.slug, position=position, bitrate=settings.HERRING_DISCORD_BITRATE)
+                channels.add(voice_channel)
         else:
             voice_channel = None
-        return text_channel, voice_channel
-    return await _manipulate_puzzle(puzzle, do_make_channels)
+    # once the channels exist, anyone who comes along later will find them, lock or no lock
+    if locks.get(puzzle.id) is lock:
+        del locks[puzzle.id]
+
+    # _manipulate_puzzle saves these
+    await _manipulate_puzzle(puzzle, lambda locked_puzzle: _store_channel_ids(locked_puzzle, text_channel, voice_channel))
+    return text_channel, voice_channel
+
+
+async def _claim_parked_channel(category: discord.CategoryChannel, name: str, topic: str, position: int, channels: ChannelIndex, http: discord.http.HTTPClient):
+    """
+    Takes a spare text channel out of the warm pool and turns it into the
+    given puzzle channel. Returns None if the pool is empty.
+    """
+    while True:
+        channel_id = await sync_to_async(warmpool.claim)('channels')
+        if channel_id is None:
+            return None
+        channel = channels.get(int(channel_id))
+        if channel is None:
+            logging.warning(f"spare channel {channel_id} is gone, trying another")
+            continue
+        spare_name = channel.name
+        try:
+            # copying the category's overwrites makes it visible to whoever can see the category. (sync_permissions and
+            # position would do the same, but discord.py works those out from its guild cache, and quietly skips the
+            # move if the channel isn't in it.)
+            channel = await channel.edit(name=name, category=category, topic=topic, overwrites=category.overwrites) or channel
+            await _arrange_channels(http, category.guild.id, [{'id': channel.id, 'parent_id': category.id, 'position': position}])
+        except discord.NotFound:
+            logging.warning(f"spare channel {channel_id} is gone, trying another")
+            continue
+        # don't wait for the gateway event to tell us about it
+        channels.remove(channel, name=spare_name)
+        channels.add(channel)
+        return channel
+
+
+def _get_channel_pair(channels: ChannelIndex, puzzle: typing.Union[Puzzle, str]):
+    """
+    Finds a puzzle's text and voice channels, by the IDs stored on the Puzzle
+    where we have them, and otherwise (given just a slug, or for channels
+    made before we stored IDs) by name.
+    """
+    if isinstance(puzzle, str):
+        return channels.text(puzzle), channels.voice(puzzle)
+    text_channel = voice_channel = None
+    if puzzle.discord_text_channel_id is not None:
+        text_channel = channels.get(puzzle.discord_text_channel_id)
+    if puzzle.discord_voice_channel_id is not None:
+        voice_channel = channels.get(puzzle.discord_voice_channel_id)
+    return text_channel or channels.text(puzzle.slug), voice_channel or channels.voice(puzzle.slug)
+
+
+def _store_channel_ids(puzzle: Puzzle, text_channel, voice_channel):
+    """
+    Records the given channels' IDs on the puzzle (without saving it),
+    returning whether anything changed.
+    """
+    text_id = text_channel.id if text_channel is not None else None
+    voice_id = voice_channel.id if voice_channel is not None else None
+    changed = (puzzle.discord_text_channel_id, puzzle.discord_voice_channel_id) != (text_id, voice_id)
+    puzzle.discord_text_channel_id = text_id
+    puzzle.discord_voice_channel_id = voice_id
+    return changed
 
 
 def _build_topic(puzzle):
@@ -1302,13 +2280,18 @@ def _abbreviate_name(puzzle):
     return puzzle_name
 
 
-async def _make_category_inner(guild: discord.Guild, name: str):
+async def _make_category_inner(guild: discord.Guild, channels: ChannelIndex, name: str, me: discord.abc.Snowflake):
+    # `me` is the calling bot's user, rather than guild.me, which needs the member cache
     overwrites = {
         guild.default_role: discord.PermissionOverwrite(read_messages=False),
-        guild.me: discord.PermissionOverwrite(read_messages=True)
+        me: discord.PermissionOverwrite(read_messages=True)
     }
-    existing = get(guild.categories, name=name)
-    return existing or await guild.create_category(name, overwrites=overwrites)
+    existing = channels.category(name)
+    if existing is not None:
+        return existing
+    category = await guild.create_category(name, overwrites=overwrites)
+    channels.add(category)
+    return category
 
 
 @sync_to_async
@@ -1326,13 +2309,108 @@ def _manipulate_puzzle(puzzle:typing.Union[Puzzle, str], func):
         return
 
 @sync_to_async
-def _get_puzzle_by_slug(slug):
-    return Puzzle.objects.get(slug=slug, hunt_id=settings.HERRING_HUNT_ID)
+def _save_activity_batch(entries):
+    """
+    Writes an ActivityBuffer's worth of entries to the puzzles' activity
+    trackers and to ChannelParticipation, in one transaction.
+    """
+    slugs = {slug for slug, _ in entries}
+    user_ids = {user_id for _, user_id in entries}
+    puzzle_ids = dict(Puzzle.objects.filter(hunt_id=settings.HERRING_HUNT_ID, slug__in=slugs).values_list('slug', 'id'))
+    dts_by_slug = collections.defaultdict(dict)
+    for (slug, _), entry in entries.items():
+        dts_by_slug[slug].update(entry['dts'])
+    # Each of these commits on its own, outside the transaction below, so we
+    # never hold a puzzle's row for longer than one UPDATE.
+    changed = []
+    for slug, puzzle_id in puzzle_ids.items():
+        results = [Puzzle.update_activity(puzzle_id, dt) for _, dt in sorted(dts_by_slug[slug].items())]
+        if any(results):
+            changed.append(Puzzle(id=puzzle_id))
+    # update() doesn't send post_save, so let the feed know ourselves.
+    record_changes(changed)
+
+    def record_histograms():
+        for (slug, user_id), entry in entries.items():
+            if slug in puzzle_ids:
+                times = {minute * 60: count for minute, count in entry['minute_counts'].items()}
+                histogram.record(puzzle_ids[slug], times, user_id, entry['display_name'])
+
+    with transaction.atomic():
+        # Like presence.record_activity below, this only happens if the batch is saved; otherwise it's put back and
+        # retried, and we'd count it twice. (Updating the activity trackers again is harmless.)
+        transaction.on_commit(record_histograms)
+        known_slugs = set(puzzle_ids)
+        rows = {
+            (row.channel_puzzle_id, row.user_id): row
+            for row in ChannelParticipation.objects.filter(channel_puzzle_id__in=known_slugs, user_id__in=user_ids)
+        }
+        to_create = []
+        to_update = []
+        for (slug, user_id), entry in entries.items():
+            if slug not in known_slugs:
+                continue
+            row = rows.get((slug, user_id))
+            if row is None:
+                row = ChannelParticipation(
+                    channel_puzzle_id=slug,
+                    user_id=user_id,
+                    last_active=entry['last_active'],
+                    is_member=True,
+                    display_name=entry['display_name'],
+                )
+                to_create.append(row)
+            elif row.last_active is None or row.last_active < entry['last_active']:
+                row.last_active = entry['last_active']
+                row.display_name = entry['display_name']
+                row.is_member = True
+                to_update.append(row)
+            else:
+                continue
+            presence.record_activity(slug, user_id, row.display_name, row.last_active)
+        ChannelParticipation.objects.bulk_create(to_create)
+        ChannelParticipation.objects.bulk_update(to_update, ['last_active', 'is_member', 'display_name'], batch_size=100)
+        if to_create or to_update:
+            # neither of those sends post_save
+            invalidate_state()
+
+
+def _channel_kind(channel):
+    return 'voice' if isinstance(channel, discord.VoiceChannel) else 'text'
+
+@sync_to_async
+def _get_puzzle_channel_ids():
+    return list(Puzzle.objects.filter(hunt_id=settings.HERRING_HUNT_ID).values_list('slug', 'discord_text_channel_id', 'discord_voice_channel_id'))
+
+@sync_to_async
+def _find_puzzle_slug_for_channel(channel_id, name, kind):
+    puzzles = Puzzle.objects.filter(hunt_id=settings.HERRING_HUNT_ID)
+    slug = puzzles.filter(Q(discord_text_channel_id=channel_id) | Q(discord_voice_channel_id=channel_id)).values_list('slug', flat=True).first()
+    if slug is None:
+        slug = puzzles.filter(slug=name, **{f'discord_{kind}_channel_id__isnull': True}).values_list('slug', flat=True).first()
+    return slug
+
+@sync_to_async
+def _find_puzzle(slug) -> Optional[Puzzle]:
+    return Puzzle.objects.filter(slug=slug, hunt_id=settings.HERRING_HUNT_ID).first()
+
+def _find_member_named(members: typing.Iterable[discord.Member], name) -> Optional[discord.Member]:
+    """
+    Guild.get_member_named, but over members we fetched ourselves: "name#1234" matches that name and discriminator,
+    and failing that, `name` matches a nickname or username.
+    """
+    members = list(members)
+    if len(name) > 5 and name[-5] == '#':
+        member = discord.utils.get(members, name=name[:-5], discriminator=name[-4:])
+        if member is not None:
+            return member
+    return discord.utils.find(lambda member: member.nick == name or member.name == name, members)
+
 
 async def _add_user_to_channels(member, text_channel:discord.TextChannel, voice_channel):
     if member.bot: return False
-    current_perms = text_channel.overwrites
-    if member not in current_perms:
+    # by ID, since in REST-only mode the overwrites name members by discord.Object
+    if all(target.id != member.id for target in text_channel.overwrites):
         await text_channel.set_permissions(member, read_messages=True)
         if voice_channel is not None:
             await voice_channel.set_permissions(member, view_channel=True)
@@ -1340,6 +2418,47 @@ async def _add_user_to_channels(member, text_channel:discord.TextChannel, voice_
     return False
 
 
+def _puzzle_status(**filters):
+    """
+    Finds the puzzles matching the given filters, for hb!who, and who's in each of their channels according to the
+    database (most recently active first), in two queries. Returns the puzzles and a dict of each one's slug to a
+    list of names.
+    """
+    puzzles = list(Puzzle.objects.filter(hunt_id=settings.HERRING_HUNT_ID, **filters))
+    members = {puzzle.slug: [] for puzzle in puzzles}
+    participations = ChannelParticipation.objects \
+        .filter(channel_puzzle__in=members.keys(), is_member=True) \
+        .order_by(F('last_active').desc(nulls_last=True)) \
+        .values_list('channel_puzzle_id', 'user_id', 'display_name')
+    for slug, user_id, display_name in participations:
+        members[slug].append(display_name or f"<@{user_id}>")
+    return puzzles, members
+
+
+def _paginate_embeds(title, lines):
+    """
+    Splits lines of text into as many embeds as it takes to fit them all in.
+    """
+    pages = [[]]
+    length = 0
+    for line in lines:
+        if pages[-1] and length + len(line) + 1 > EMBED_DESCRIPTION_LENGTH:
+            pages.append([])
+            length = 0
+        pages[-1].append(line[:EMBED_DESCRIPTION_LENGTH])
+        length += len(line) + 1
+    embeds = [discord.Embed(title=title, description="\n".join(page)) for page in pages]
+    if len(embeds) > 1:
+        for i, embed in enumerate(embeds):
+            embed.set_footer(text=f"page {i + 1} of {len(embeds)}")
+    return embeds
+
+
+def _is_role(target):
+    # uncached overwrite targets come back as discord.Objects that only know their type
+    return isinstance(target, discord.Role) or getattr(target, 'type', None) is discord.Role
+
+
 def _update_channel_participation_inner(puzzle, membership):
     n = len(membership)
     logging.info(f"updating membership for {puzzle.slug} to {membership}")
@@ -1354,9 +2473,11 @@ def _update_channel_participation_inner(puzzle, membership):
             .update_or_create(defaults=dict(
                     user_id=str(member.id),
                     is_member=True,
-                    display_name=member.display_name,
+                    # None if we couldn't fetch the member; _puzzle_status shows their ID instead
+                    display_name=getattr(member, 'display_name', None),
                     channel_puzzle=puzzle,
             ))
+    presence.sync_puzzle(puzzle)
 
 
 # Public factory methods
@@ -1369,36 +2490,40 @@ async def run_listener_bot():
             await bot.start(settings.HERRING_SECRETS['discord-bot-token'])
 
 
-def make_announcer_bot():
-    # create it in a new thread
-    evt = threading.Event()
-    bot = None
-
-    def start_bot_thread():
-        nonlocal bot
+async def run_announcer_service():
+    """
+    Runs the announcer bot, and carries out the commands everyone else sends
+    it through ANNOUNCER, forever.
+    """
+    logging.info("Starting Discord announcer service")
+    # Hack hack: prevent discord from emitting a warning during startup, which would wreck our day
+    discord.VoiceClient.warn_nacl = False
+    # receive() blocks its connection while it waits, so it gets its own.
+    redis = connect()
+    loop = asyncio.get_running_loop()
+    running = set()
+
+    async def run_command(bot, command):
         try:
-            logging.info("Trying to start announcer bot in thread...")
-            # Hack hack: prevent discord from emitting a warning during startup, which would wreck our day
-            discord.VoiceClient.warn_nacl = False
-            async def run_bot():
-                nonlocal bot
-                async with HerringAnnouncerBot() as bot:
-                    logging.info("Created announcer bot object, signalling Event.")
-                    evt.set()
-                    await bot.start(settings.HERRING_SECRETS['discord-bot-token'])
-
-            asyncio.run(run_bot())
+            result = await bot.run_command(command)
         except Exception as e:
-            # This is at info because I don't want to risk problems (this code can be called from logs at WARNING and higher)
-            logging.info("Oh no, announcer bot thread exception! {e}")
-
-    # make it a daemon thread so it doesn't keep the process alive
-    bot_thread = threading.Thread(target=start_bot_thread, daemon=True)
-    bot_thread.start()
-    result = evt.wait(timeout=5)
-    if result:
-        logging.info(f"got bot, it is a {type(bot)}")
-        return bot
-    else:
-        logging.error(f"failed to create discord announcer bot (timed out trying). Is bot thread alive: {bot_thread.is_alive()}. bot_thread: {bot_thread}")
-        return None
+            logging.error(f"announcer command {command['method']} failed", exc_info=True)
+            await loop.run_in_executor(None, announcer.reply, redis, command, None, repr(e))
+        else:
+            await loop.run_in_executor(None, announcer.reply, redis, command, result)
+
+    async with HerringAnnouncerBot() as bot:
+        if settings.HERRING_DISCORD_ANNOUNCER_REST_ONLY:
+            run_bot = bot.run_rest_only(settings.HERRING_SECRETS['discord-bot-token'])
+        else:
+            run_bot = bot.start(settings.HERRING_SECRETS['discord-bot-token'])
+        bot_task = asyncio.create_task(run_bot, name="announcer_bot")
+        while not bot_task.done():
+            command = await loop.run_in_executor(None, announcer.receive, redis, 5)
+            if command is None:
+                continue
+            task = asyncio.create_task(run_command(bot, command))
+            running.add(task)
+            task.add_done_callback(running.discard)
+        # if the bot died, say why
+        bot_task.result()
@@ -0,0 +1,258 @@
+"""
+The hunt feed: the tree of rounds and puzzles that every open Herring tab
+polls from GET /puzzles/.
+
+Rather than rebuilding that tree from the database on every poll, we keep a
+serialized snapshot of it in Redis, tagged with a version number. Whenever a
+Round or Puzzle changes, the version is bumped (see puzzles/signals.py), and
+the next poll to notice that the snapshot's version is out of date rebuilds
+it. Everyone else just reads it.
+
+Each bump also appends the changed objects to a bounded change log, so that
+clients which already have a recent copy of the tree can ask for just what
+changed since their version (see get_changes).
+
+Separately, we keep a "state" version that covers the rest of what GET
+/puzzles/ serves (channel participation and user profiles), so that a poll
+can be answered with 304 Not Modified based on the two versions alone.
+
+Whenever either version is bumped, both are published on a Redis channel
+(see events_channel), which the push server
+(puzzles/management/commands/pushserver.py) relays to browsers so they can
+fetch changes as soon as they happen.
+"""
+import hashlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.db import transaction
+from lazy_object_proxy import Proxy as lazy_object
+from redis.exceptions import RedisError
+
+from puzzles.cache import REDIS
+from puzzles.encoding import dumps, loads
+from puzzles.models import Puzzle, Round, to_json_value
+
+
+# Who counts as active in a puzzle depends on the time as well as on the
+# database, so ETags also roll over this often even when nothing is written.
+STATE_REFRESH_SECONDS = 300
+
+# How many changed objects we remember. Clients further behind than this get
+# a full snapshot instead of a list of changes.
+CHANGE_LOG_LENGTH = 1000
+
+
+def _key(name):
+    return f'puzzles.feed.{settings.HERRING_HUNT_ID}.{name}'
+
+
+def events_channel():
+    return _key('events')
+
+
+def parse_event(data):
+    """
+    Returns the snapshot and state versions from a message published on
+    events_channel.
+    """
+    version, state = data.decode('utf-8').split(':')
+    return int(version), int(state)
+
+
+def build_snapshot():
+    return to_json_value(Round.objects.filter(hunt_id=settings.HERRING_HUNT_ID))
+
+
+def get_snapshot():
+    """
+    Returns the current version and the JSON-ready list of rounds (and their
+    puzzles) for the current hunt, from the cached snapshot if it's up to
+    date, or from the database otherwise. If Redis is unavailable, this
+    always hits the database, and the version is None.
+    """
+    try:
+        version, cached = REDIS.mget(_key('version'), _key('snapshot'))
+    except RedisError:
+        logging.warning("feed: couldn't read the hunt snapshot from Redis", exc_info=True)
+        return None, build_snapshot()
+
+    version = int(version or 0)
+    if cached is not None:
+        snapshot = loads(cached)
+        if snapshot['version'] == version:
+            return version, snapshot['rounds']
+
+    # Note that we tag the snapshot with the version we read *before*
+    # building it. If something changes while we're building, the version
+    # will have moved on by the time we store it, and the next reader will
+    # just build it again.
+    rounds = build_snapshot()
+    try:
+        REDIS.set(_key('snapshot'), dumps({'version': version, 'rounds': rounds}))
+    except RedisError:
+        logging.warning("feed: couldn't store the hunt snapshot in Redis", exc_info=True)
+    return version, rounds
+
+
+# Bumps the version and logs every changed object under it in one step, so
+# that versions in the log are contiguous and readers can tell when they've
+# fallen off the end of it.
+_RECORD_CHANGES_SCRIPT = """
+local version = redis.call('INCR', KEYS[1])
+for i = 2, #ARGV do
+    redis.call('ZADD', KEYS[2], version, version .. ':' .. ARGV[i])
+end
+redis.call('ZREMRANGEBYRANK', KEYS[2], 0, -tonumber(ARGV[1]) - 1)
+redis.call('PUBLISH', KEYS[3], version .. ':' .. (redis.call('GET', KEYS[4]) or 0))
+return version
+"""
+
+
+@lazy_object
+def _record_changes():
+    return REDIS.register_script(_RECORD_CHANGES_SCRIPT)
+
+
+def _bump_on_commit(bump, description):
+    # Bumping a version before the transaction commits would let a concurrent
+    # poll rebuild from (or validate against) data that is about to change.
+    def do_bump():
+        try:
+            bump()
+        except RedisError:
+            logging.warning(f"feed: couldn't record {description}", exc_info=True)
+
+    transaction.on_commit(do_bump)
+
+
+def record_changes(instances):
+    """
+    Marks the cached snapshot (and any ETag built from it) as out of date, and
+    logs the given Rounds and/or Puzzles as changed, once the current
+    transaction (if any) commits.
+    """
+    members = [f'{instance._meta.model_name}:{instance.pk}' for instance in instances]
+    if not members:
+        return
+    _bump_on_commit(
+        lambda: _record_changes(
+            keys=[_key('version'), _key('changes'), events_channel(), _key('state')],
+            args=[CHANGE_LOG_LENGTH] + members),
+        f"changes to {members}")
+
+
+def invalidate_state():
+    """
+    Marks ETags as out of date without rebuilding the snapshot, for changes
+    that aren't part of the snapshot itself.
+    """
+    def bump_state():
+        with REDIS.pipeline(transaction=True) as pipe:
+            pipe.incr(_key('state'))
+            pipe.get(_key('version'))
+            state, version = pipe.execute()
+        REDIS.publish(events_channel(), f'{int(version or 0)}:{state}')
+
+    _bump_on_commit(bump_state, "a state change")
+
+
+def get_versions():
+    """
+    Returns the current snapshot and state versions, for caching anything
+    derived from the hunt. Raises RedisError if Redis is unavailable.
+    """
+    version, state = REDIS.mget(_key('version'), _key('state'))
+    return int(version or 0), int(state or 0)
+
+
+def get_state_version():
+    """
+    Returns the current state version, or None if Redis is unavailable. Read
+    this before reading the state itself, so that a change made in between
+    looks newer than what was read.
+    """
+    try:
+        return int(REDIS.get(_key('state')) or 0)
+    except RedisError:
+        logging.warning("feed: couldn't read the state version from Redis", exc_info=True)
+        return None
+
+
+def state_etag(user_id, service_status):
+    """
+    Returns an ETag for what GET /puzzles/ would currently serve to the given
+    user, or None if Redis is unavailable. This never touches the database.
+    """
+    try:
+        version, state = get_versions()
+    except RedisError:
+        logging.warning("feed: couldn't read the hunt versions from Redis", exc_info=True)
+        return None
+
+    parts = [
+        settings.HERRING_HUNT_ID,
+        version,
+        state,
+        user_id,
+        int(time.time()) // STATE_REFRESH_SECONDS,
+        json.dumps(service_status, sort_keys=True),
+    ]
+    return hashlib.sha1(":".join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def get_changes(since):
+    """
+    Returns a dict describing what changed after version `since`:
+
+        {'version': ..., 'rounds': [...], 'puzzles': [...],
+         'deleted': {'rounds': [...], 'puzzles': [...]}}
+
+    Rounds are serialized without their puzzle_set; each puzzle instead
+    carries the id of its round as 'round'. If `since` is too old (or from
+    the future, e.g. because Redis was flushed), this returns None, and the
+    caller should fall back to a full snapshot.
+    """
+    try:
+        with REDIS.pipeline(transaction=True) as pipe:
+            pipe.get(_key('version'))
+            pipe.zrange(_key('changes'), 0, 0, withscores=True)
+            pipe.zrangebyscore(_key('changes'), f'({since}', '+inf')
+            version, oldest, entries = pipe.execute()
+    except RedisError:
+        logging.warning("feed: couldn't read the change log from Redis", exc_info=True)
+        return None
+
+    version = int(version or 0)
+    if since > version:
+        return None
+    if since < version and (not oldest or int(oldest[0][1]) > since + 1):
+        return None
+
+    changed = {'round': set(), 'puzzle': set()}
+    for entry in entries:
+        _, model_name, pk = entry.decode('utf-8').split(':')
+        changed[model_name].add(int(pk))
+
+    rounds = Round.objects.filter(hunt_id=settings.HERRING_HUNT_ID, id__in=changed['round'])
+    puzzles = Puzzle.objects.filter(parent__hunt_id=settings.HERRING_HUNT_ID, id__in=changed['puzzle'])
+
+    round_fields = [field for field in Round.Json.include_fields if field != 'puzzle_set']
+    rounds_json = [{field: to_json_value(getattr(r, field)) for field in round_fields} for r in rounds]
+    puzzles_json = []
+    for puzzle in puzzles:
+        puzzle_json = puzzle.to_json()
+        puzzle_json['round'] = puzzle.parent_id
+        puzzles_json.append(puzzle_json)
+
+    return {
+        'version': version,
+        'rounds': rounds_json,
+        'puzzles': puzzles_json,
+        'deleted': {
+            'rounds': sorted(changed['round'] - {r['id'] for r in rounds_json}),
+            'puzzles': sorted(changed['puzzle'] - {p['id'] for p in puzzles_json}),
+        },
+    }
@@ -0,0 +1,177 @@
+"""
+How much activity each puzzle has seen, over a longer window and in more
+detail than Puzzle.activity_tracker: instead of one bit per two minutes for
+two hours, a count of messages and edits per HERRING_ACTIVITY_BUCKET_SECONDS
+for HERRING_ACTIVITY_WINDOW_HOURS (by default, five minutes for two days).
+
+Each puzzle's counts live in Redis as a ring buffer of 16-bit counters in
+one string, which we update with BITFIELD, so a puzzle costs a couple of
+kilobytes at most. Activity we can pin on someone (messages and time in
+voice, but not sheet edits) is also counted in a ring per puzzle and user,
+so that we can tell who's been working on what and how hard. The newest
+bucket written to each ring is kept in a hash alongside, so that we know
+which slots are stale, as are the display names of the people with rings;
+rings expire once a whole window has passed without anything being written
+to them.
+
+Puzzle.activity_histo (and the activity_tracker it's derived from) is
+unaffected; this is just for when we want to know more.
+"""
+import array
+import logging
+import sys
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from lazy_object_proxy import Proxy as lazy_object
+from redis.exceptions import RedisError
+
+from puzzles.cache import REDIS
+
+
+def bucket_seconds():
+    return settings.HERRING_ACTIVITY_BUCKET_SECONDS
+
+
+def num_buckets():
+    return settings.HERRING_ACTIVITY_WINDOW_HOURS * 3600 // bucket_seconds()
+
+
+def _key(name):
+    # Changing the bucket size or window changes what every slot means, so
+    # start over rather than misread the old rings.
+    return f'puzzles.histogram.{settings.HERRING_HUNT_ID}.{bucket_seconds()}x{num_buckets()}.{name}'
+
+
+def _ring(puzzle_id, user_id=None):
+    return str(puzzle_id) if user_id is None else f'{puzzle_id}.{user_id}'
+
+
+# Adds counts to one ring. Moving the ring's head forward zeroes the slots it
+# passes over, since they hold counts from a whole window ago; counts for
+# buckets that have already fallen out of the window are dropped.
+_RECORD_SCRIPT = """
+local n = tonumber(ARGV[2])
+local head = tonumber(redis.call('HGET', KEYS[2], ARGV[1]) or -1)
+for i = 4, #ARGV, 2 do
+    local bucket = tonumber(ARGV[i])
+    if bucket > head then
+        for b = math.max(head + 1, bucket - n + 1), bucket do
+            redis.call('BITFIELD', KEYS[1], 'SET', 'u16', '#' .. (b % n), 0)
+        end
+        head = bucket
+    end
+    if bucket > head - n then
+        redis.call('BITFIELD', KEYS[1], 'OVERFLOW', 'SAT', 'INCRBY', 'u16', '#' .. (bucket % n), ARGV[i + 1])
+    end
+end
+redis.call('HSET', KEYS[2], ARGV[1], head)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return head
+"""
+
+
+@lazy_object
+def _record():
+    return REDIS.register_script(_RECORD_SCRIPT)
+
+
+def record(puzzle_id, times, user_id=None, display_name=None):
+    """
+    Counts activity in the given puzzle at each of the given Unix timestamps,
+    and if it was by someone in particular, by them. `times` is a dict of
+    timestamps to how many things happened then.
+    """
+    # Anything from the future (by our clock) counts as now, so that a ring's
+    # head is never ahead of the buckets get_histograms shows.
+    now = int(time.time()) // bucket_seconds()
+    counts = Counter()
+    for timestamp, count in times.items():
+        counts[min(int(timestamp) // bucket_seconds(), now)] += count
+    if not counts:
+        return
+    rings = [_ring(puzzle_id)]
+    if user_id is not None:
+        rings.append(_ring(puzzle_id, user_id))
+    args = [num_buckets(), num_buckets() * bucket_seconds()]
+    for bucket, count in sorted(counts.items()):
+        args += [bucket, count]
+    try:
+        with REDIS.pipeline(transaction=False) as pipe:
+            for ring in rings:
+                _record(keys=[_key(f'counts.{ring}'), _key('heads')], args=[ring, *args], client=pipe)
+            if user_id is not None and display_name:
+                pipe.hset(_key('names'), user_id, display_name)
+            pipe.execute()
+    except RedisError:
+        logging.warning(f"histogram: couldn't record activity in puzzle {puzzle_id}", exc_info=True)
+
+
+def _unpack(data, n):
+    # BITFIELD stores counters big-endian, and leaves off trailing slots it
+    # hasn't written yet.
+    counts = array.array('H', data[:2 * n].ljust(2 * n, b'\0'))
+    if sys.byteorder == 'little':
+        counts.byteswap()
+    return counts
+
+
+def get_histograms():
+    """
+    Returns the last HERRING_ACTIVITY_WINDOW_HOURS of activity counts for
+    every puzzle that has any, as a dict of puzzle IDs to lists of counts
+    (oldest first, ending with the current bucket); the same for each person
+    who was active in them, as a dict of puzzle IDs to dicts of display names
+    to lists of counts; and the Unix time at which the current bucket started.
+    """
+    n = num_buckets()
+    now = int(time.time()) // bucket_seconds()
+    end = now * bucket_seconds()
+    try:
+        with REDIS.pipeline(transaction=False) as pipe:
+            pipe.hgetall(_key('heads'))
+            pipe.hgetall(_key('names'))
+            heads, names = pipe.execute()
+        heads = {ring.decode('utf-8'): int(head) for ring, head in heads.items()}
+        # Rings that have gone a whole window without anything new have
+        # expired (or soon will), so forget their heads too, and the names of
+        # anyone who no longer has a ring.
+        expired = [ring for ring, head in heads.items() if now - head >= n]
+        live_users = {ring.partition('.')[2].encode('utf-8') for ring, head in heads.items() if now - head < n}
+        gone = [user_id for user_id in names if user_id not in live_users]
+        with REDIS.pipeline(transaction=False) as pipe:
+            for ring in heads:
+                pipe.get(_key(f'counts.{ring}'))
+            if expired:
+                pipe.hdel(_key('heads'), *expired)
+            if gone:
+                pipe.hdel(_key('names'), *gone)
+            rings = pipe.execute()[:len(heads)]
+    except RedisError:
+        logging.warning("histogram: couldn't read activity from Redis", exc_info=True)
+        return {}, {}, end
+
+    histograms = {}
+    by_user = defaultdict(dict)
+    zeros = array.array('H', bytes(2 * n))
+    for (ring, head), data in zip(heads.items(), rings):
+        stale = now - head
+        if data is None or stale >= n:
+            continue
+        counts = _unpack(data, n)
+        # rotate so that the slot after the current bucket's (which holds
+        # the oldest bucket in the window) comes first...
+        start = (now + 1) % n
+        counts = counts[start:] + counts[:start]
+        # ...and blank out the buckets since the head, whose slots still hold
+        # counts from a whole window ago
+        if stale > 0:
+            counts[n - stale:] = zeros[:stale]
+        puzzle_id, _, user_id = ring.partition('.')
+        if user_id:
+            name = names.get(user_id.encode('utf-8'))
+            by_user[int(puzzle_id)][name.decode('utf-8') if name is not None else user_id] = counts.tolist()
+        else:
+            histograms[int(puzzle_id)] = counts.tolist()
+    return histograms, by_user, end
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from puzzles.announcer import ANNOUNCER
+
+
+class Command(BaseCommand):
+    help = "Records the Discord channel IDs of puzzles whose channels predate Herring keeping track of them"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hunt-id', type=int, default=settings.HERRING_HUNT_ID)
+
+    def handle(self, *args, **options):
+        if not settings.HERRING_ACTIVATE_DISCORD:
+            self.stdout.write(self.style.WARNING("Not backfilling channel IDs, because ACTIVATE_DISCORD is not set."))
+            return
+        count = ANNOUNCER.call('backfill_channel_ids', options['hunt_id'], timeout=120)
+        self.stdout.write(self.style.SUCCESS(f"Updated channel IDs for {count} puzzles."))
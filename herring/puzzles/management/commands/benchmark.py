@@ -0,0 +1,230 @@
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import discord
+from django.core.management.base import BaseCommand
+from django.db import connection, connections, transaction
+from django.test.utils import CaptureQueriesContext
+
+from puzzles import encoding
+from puzzles.discordbot import ChannelIndex
+from puzzles.models import Puzzle, Round, serialize_rounds
+
+
+HUNT_ID = -1  # so that the synthetic hunt can't be confused with a real one
+
+
+# The synthetic hunt is made and deleted without sending any signals, so that
+# it doesn't get Discord categories and channels or Google Sheets of its own,
+# and doesn't bump the live feed's version.
+
+def make_synthetic_hunt(num_rounds, puzzles_per_round):
+    Round.objects.bulk_create(
+        Round(hunt_id=HUNT_ID, number=r, name=f"Benchmark Round {r}")
+        for r in range(num_rounds)
+    )
+    # not every database tells bulk_create the IDs it assigned
+    rounds = Round.objects.filter(hunt_id=HUNT_ID)
+    Puzzle.objects.bulk_create(
+        Puzzle(
+            hunt_id=HUNT_ID,
+            parent=round,
+            name=f"Benchmark Puzzle {round.number}-{p}",
+            slug=f"bench-{round.number}-{p}",
+            number=p,
+            is_meta=(p == 0),
+        )
+        for round in rounds
+        for p in range(puzzles_per_round)
+    )
+
+
+def delete_synthetic_hunt():
+    # QuerySet.delete() would send post_delete for every row
+    with connection.cursor() as cursor:
+        for model in (Puzzle, Round):
+            cursor.execute(f"DELETE FROM {model._meta.db_table} WHERE hunt_id = %s", [HUNT_ID])
+
+
+def measure(func, repeat):
+    """
+    Runs func `repeat` times, returning the number of queries it made (on the
+    last run) and its median wall time in milliseconds.
+    """
+    times = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            func()
+            times.append((time.perf_counter() - start) * 1000)
+    return len(queries.captured_queries), statistics.median(times)
+
+
+def benchmark_feed(command, options):
+    rounds = Round.objects.filter(hunt_id=HUNT_ID)
+    serializers = {
+        'one round at a time': lambda: [r.to_json() for r in rounds.all()],
+        'serialize_rounds': lambda: serialize_rounds(rounds.all()),
+    }
+    for name, serializer in serializers.items():
+        num_queries, ms = measure(serializer, options['repeat'])
+        command.stdout.write(f"{name:>24}: {num_queries:5d} queries, {ms:9.2f} ms")
+
+
+def benchmark_json(command, options):
+    rounds = serialize_rounds(Round.objects.filter(hunt_id=HUNT_ID))
+    encoders = {'json': encoding._stdlib_dumps}
+    if encoding.orjson is not None:
+        encoders['orjson'] = encoding.orjson.dumps
+    else:
+        command.stdout.write("orjson isn't installed; only timing the json module")
+    for name, dumps in encoders.items():
+        size = len(dumps(rounds))
+        _, ms = measure(lambda: dumps(rounds), options['repeat'])
+        command.stdout.write(f"{name:>24}: {size:9d} bytes, {ms:9.2f} ms")
+
+
+class FakeGuild:
+    """
+    Just enough of discord.Guild for ChannelIndex and for the linear scans it
+    replaces, which sort the channel list on every access just like this.
+    """
+    def __init__(self, channels):
+        self.channels = channels
+
+    @property
+    def text_channels(self):
+        return sorted((c for c in self.channels if c.type == discord.ChannelType.text), key=lambda c: (c.position, c.id))
+
+    @property
+    def voice_channels(self):
+        return sorted((c for c in self.channels if c.type == discord.ChannelType.voice), key=lambda c: (c.position, c.id))
+
+
+def benchmark_channels(command, options):
+    slugs = list(Puzzle.objects.filter(hunt_id=HUNT_ID).values_list('slug', flat=True))
+    channels = [
+        SimpleNamespace(id=i * 2 + offset, name=slug, type=kind, position=i)
+        for i, slug in enumerate(slugs)
+        for offset, kind in enumerate([discord.ChannelType.text, discord.ChannelType.voice])
+    ]
+    guild = FakeGuild(channels)
+    index = ChannelIndex()
+    index.rebuild(guild.channels)
+    command.stdout.write(f"looking up each of {len(slugs)} puzzles' channels among {len(channels)}")
+
+    def scan():
+        for slug in slugs:
+            discord.utils.get(guild.text_channels, name=slug), discord.utils.get(guild.voice_channels, name=slug)
+
+    def lookup():
+        for slug in slugs:
+            index.text(slug), index.voice(slug)
+
+    for name, func in {'linear scan': scan, 'ChannelIndex': lookup, 'ChannelIndex.rebuild': lambda: index.rebuild(guild.channels)}.items():
+        _, ms = measure(func, options['repeat'])
+        command.stdout.write(f"{name:>24}: {ms:9.2f} ms")
+
+
+def benchmark_activity(command, options):
+    """
+    Records activity on a few puzzles from several threads at once, as the
+    Discord listener, the Sheets poller and so on would, once by locking each
+    puzzle and calling record_activity (as we used to) and once with
+    update_activity. Checks that no activity got lost either way. Only
+    meaningful on Postgres, since SQLite serializes all writers anyway.
+    """
+    puzzle_ids = list(Puzzle.objects.filter(hunt_id=HUNT_ID).order_by('id').values_list('id', flat=True)[:5])
+    initial = {p.id: (p.last_active, p.activity_tracker) for p in Puzzle.objects.filter(id__in=puzzle_ids)}
+    now = datetime.now(timezone.utc)
+    rng = random.Random(0)
+    work = [
+        [(rng.choice(puzzle_ids), now + timedelta(seconds=rng.randint(-7200, 600))) for _ in range(options['updates'])]
+        for _ in range(options['threads'])
+    ]
+
+    expected = {}
+    for puzzle_id, (last_active, activity_tracker) in initial.items():
+        expected[puzzle_id] = Puzzle(last_active=last_active, activity_tracker=activity_tracker)
+    for updates in work:
+        for puzzle_id, dt in updates:
+            expected[puzzle_id].record_activity(dt)
+
+    def lock_and_record(puzzle_id, dt):
+        with transaction.atomic():
+            puzzle = Puzzle.objects.select_for_update().get(id=puzzle_id)
+            if puzzle.record_activity(dt):
+                Puzzle.objects.filter(id=puzzle_id).update(last_active=puzzle.last_active, activity_tracker=puzzle.activity_tracker)
+
+    strategies = {
+        'select_for_update': lock_and_record,
+        'update_activity': Puzzle.update_activity,
+    }
+    command.stdout.write(f"{options['threads']} threads x {options['updates']} updates to {len(puzzle_ids)} puzzles")
+    for name, record in strategies.items():
+        for puzzle_id, (last_active, activity_tracker) in initial.items():
+            Puzzle.objects.filter(id=puzzle_id).update(last_active=last_active, activity_tracker=activity_tracker)
+
+        def run(updates):
+            try:
+                for puzzle_id, dt in updates:
+                    record(puzzle_id, dt)
+            finally:
+                connections.close_all()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+            list(executor.map(run, work))
+        ms = (time.perf_counter() - start) * 1000
+
+        lost = sum(
+            1 for p in Puzzle.objects.filter(id__in=puzzle_ids)
+            if (p.last_active, p.activity_tracker) != (expected[p.id].last_active, expected[p.id].activity_tracker))
+        rate = options['threads'] * options['updates'] / (ms / 1000)
+        command.stdout.write(f"{name:>24}: {ms:9.2f} ms, {rate:9.0f} updates/s, {lost} puzzles with lost updates")
+
+
+BENCHMARKS = {
+    'activity': benchmark_activity,
+    'channels': benchmark_channels,
+    'feed': benchmark_feed,
+    'json': benchmark_json,
+}
+
+# Benchmarks that use several database connections at once can't see a
+# synthetic hunt that's rolled back at the end, so they get one that's
+# committed and then deleted instead.
+NEEDS_COMMITTED_HUNT = {'activity'}
+
+
+class Command(BaseCommand):
+    help = "Runs performance benchmarks against a synthetic hunt, which is removed afterwards"
+
+    def add_arguments(self, parser):
+        parser.add_argument('benchmark', choices=BENCHMARKS.keys())
+        parser.add_argument('--rounds', type=int, default=50)
+        parser.add_argument('--puzzles', type=int, default=20, help="puzzles per round")
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--threads', type=int, default=8, help="for the activity benchmark")
+        parser.add_argument('--updates', type=int, default=200, help="per thread, for the activity benchmark")
+
+    def handle(self, *args, **options):
+        if options['benchmark'] in NEEDS_COMMITTED_HUNT:
+            make_synthetic_hunt(options['rounds'], options['puzzles'])
+            try:
+                self.run_benchmark(options)
+            finally:
+                delete_synthetic_hunt()
+        else:
+            with transaction.atomic():
+                make_synthetic_hunt(options['rounds'], options['puzzles'])
+                self.run_benchmark(options)
+                transaction.set_rollback(True)
+
+    def run_benchmark(self, options):
+        self.stdout.write(f"{options['benchmark']}: {options['rounds']} rounds x {options['puzzles']} puzzles")
+        BENCHMARKS[options['benchmark']](self, options)
@@ -0,0 +1,82 @@
+import asyncio
+import http
+import logging
+from http.cookies import SimpleCookie
+from importlib import import_module
+
+import websockets
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.management.base import BaseCommand
+
+from puzzles.cache import connect
+from puzzles.feed import events_channel, parse_event
+
+
+class Command(BaseCommand):
+    help = "Runs the WebSocket server that tells browsers when the hunt feed changes (forever)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='0.0.0.0')
+        parser.add_argument('--port', type=int, default=settings.HERRING_PUSH_PORT)
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(f"Launching the push server on port {options['port']}..."))
+        asyncio.run(run_push_server(options['host'], options['port']))
+
+
+def is_allowed_origin(request_headers):
+    # Browsers send the session cookie with WebSocket handshakes from any
+    # page, so only let Herring's own pages connect. (Not ALLOWED_HOSTS,
+    # which is ['*'] in production.)
+    origin = request_headers.get('Origin')
+    if not origin:
+        return False
+    allowed = {allowed.rstrip('/').lower() for allowed in settings.HERRING_PUSH_ALLOWED_ORIGINS}
+    return origin.rstrip('/').lower() in allowed
+
+
+@sync_to_async
+def is_logged_in(request_headers):
+    cookie = SimpleCookie(request_headers.get('Cookie', ''))
+    morsel = cookie.get(settings.SESSION_COOKIE_NAME)
+    if morsel is None:
+        return False
+    session = import_module(settings.SESSION_ENGINE).SessionStore(morsel.value)
+    return session.get(SESSION_KEY) is not None
+
+
+async def run_push_server(host, port):
+    clients = set()
+    loop = asyncio.get_running_loop()
+
+    def relay_events():
+        # redis-py is synchronous, so the subscription lives in its own thread
+        # (and on its own connection, since it holds it open forever).
+        pubsub = connect().pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(events_channel())
+        for message in pubsub.listen():
+            version, state = parse_event(message['data'])
+            event = f'{{"version": {version}, "state_version": {state}}}'
+            loop.call_soon_threadsafe(websockets.broadcast, clients, event)
+
+    async def check_session(path, request_headers):
+        if not is_allowed_origin(request_headers):
+            return http.HTTPStatus.FORBIDDEN, [], b"Connect from Herring's own pages.\n"
+        if not await is_logged_in(request_headers):
+            return http.HTTPStatus.FORBIDDEN, [], b"Please log in to Herring first.\n"
+
+    async def handler(websocket):
+        clients.add(websocket)
+        try:
+            # We never expect to hear anything from the browser; this just
+            # waits until it goes away.
+            await websocket.wait_closed()
+        finally:
+            clients.discard(websocket)
+
+    async with websockets.serve(handler, host, port, process_request=check_session):
+        logging.info("push server is listening on %s:%d", host, port)
+        # If we lose Redis, give up and let whoever runs us restart us.
+        await loop.run_in_executor(None, relay_events)
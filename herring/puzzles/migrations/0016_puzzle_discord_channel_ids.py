@@ -0,0 +1,23 @@
+# Generated by Django 3.2.16 on 2026-10-18 17:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('puzzles', '0015_channelparticipation_display_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='puzzle',
+            name='discord_text_channel_id',
+            field=models.BigIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='puzzle',
+            name='discord_voice_channel_id',
+            field=models.BigIntegerField(editable=False, null=True),
+        ),
+    ]
@@ -1,6 +1,8 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from django.conf import settings
 from django.db import models
+from django.db.models import Case, F, Func, Value, When
+from django.db.models.functions import Cast, Floor, Greatest
 from autoslug import AutoSlugField
 from puzzles.slugtools import puzzle_to_slug
 from model_utils import FieldTracker
@@ -13,6 +15,17 @@ optional = {
 }
 
 
+class _EpochSeconds(Func):
+    """
+    Seconds since the Unix epoch of a datetime expression, in SQL.
+    """
+    template = 'EXTRACT(EPOCH FROM %(expressions)s)'
+    output_field = models.FloatField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template="CAST(strftime('%%%%s', %(expressions)s) AS REAL)", **extra_context)
+
+
 # A mixin class which adds a to_json method to a model
 class JSONMixin(object):
     def to_json(self):
@@ -31,6 +44,10 @@ def to_json_value(field):
         return field
     if isinstance(field, dict):
         return { key: to_json_value(value) for key, value in field.items() }
+    if isinstance(field, models.query.QuerySet):
+        bulk_serializer = getattr(getattr(field.model, 'Json', None), 'bulk_serializer', None)
+        if bulk_serializer is not None:
+            return bulk_serializer(field)
     if isinstance(field, (list, models.query.QuerySet)):
         return [to_json_value(item) for item in field]
     if isinstance(field, models.manager.Manager):
@@ -38,7 +55,8 @@ def to_json_value(field):
     if isinstance(field, JSONMixin):
         return field.to_json()
     if isinstance(field, datetime):
-        return field.isoformat()
+        # left for the encoder (see puzzles/encoding.py) to format
+        return field
 
 
 class Round(models.Model,JSONMixin):
@@ -57,6 +75,12 @@ class Round(models.Model,JSONMixin):
     class Json:
         include_fields = ['id', 'name', 'number', 'puzzle_set', 'hunt_url']
 
+        # Serializing rounds one at a time would cost a query per round for
+        # its puzzle_set, so querysets of rounds go through this instead.
+        @staticmethod
+        def bulk_serializer(rounds):
+            return serialize_rounds(rounds)
+
 
 class Puzzle(models.Model,JSONMixin):
     # class for all puzzles, including metas
@@ -80,6 +104,8 @@ class Puzzle(models.Model,JSONMixin):
     channel_count = models.PositiveIntegerField(default=0, editable=False)
     activity_tracker = models.BigIntegerField(default=0, editable=False)
     slack_channel_id = models.CharField(max_length=30, default='', editable=False)
+    discord_text_channel_id = models.BigIntegerField(null=True, editable=False)
+    discord_voice_channel_id = models.BigIntegerField(null=True, editable=False)
 
     tracker = FieldTracker()
 
@@ -102,6 +128,14 @@ class Puzzle(models.Model,JSONMixin):
     def is_answered(self):
         return bool(self.answer)
 
+    # Let time be divided into a fixed set of observation periods of size
+    # P. activity_tracker is a bitset where each bit represents whether
+    # there was or was not activity during a certain period. Bit 0 always
+    # corresponds to the period containing the last_active datetime, and
+    # a total of N periods are tracked. For now,
+    ACTIVITY_PERIOD_SECONDS = 120  # = two minutes
+    ACTIVITY_PERIODS = 60  # for a total window of two hours
+
     def record_activity(self, dt):
         """
         Updates the last_active and activity_tracker fields to be consistent
@@ -109,13 +143,8 @@ class Puzzle(models.Model,JSONMixin):
         whether this model was changed as a consequence.
         """
 
-        # Let time be divided into a fixed set of observation periods of size
-        # P. activity_tracker is a bitset where each bit represents whether
-        # there was or was not activity during a certain period. Bit 0 always
-        # corresponds to the period containing the last_active datetime, and
-        # a total of N periods are tracked. For now,
-        P = 120  # = two minutes
-        N = 60   # for a total window of two hours
+        P = self.ACTIVITY_PERIOD_SECONDS
+        N = self.ACTIVITY_PERIODS
         # record_activity needs to do two things: ensure last_active is equal
         # to or later than dt (bitshifting activity_tracker in the process if
         # necessary), and set the bit corresponding to the period of dt in
@@ -155,11 +184,93 @@ class Puzzle(models.Model,JSONMixin):
         This is a slightly friendlier representation of activity_tracker,
         intended for JSON transport.
         """
-        return f"{self.activity_tracker:015x}"
+        return self.format_activity_histo(self.activity_tracker)
+
+    @staticmethod
+    def format_activity_histo(activity_tracker):
+        return f"{activity_tracker:015x}"
 
     @classmethod
-    def batch_save_activity(cls, objs):
-        cls.objects.bulk_update(objs, ['last_active', 'activity_tracker'], batch_size=50)
+    def update_activity(cls, puzzle_id, dt):
+        """
+        Does what record_activity(dt) does to the given puzzle, directly in
+        the database, as a single UPDATE. Since the database does the whole
+        read-modify-write atomically, this doesn't need the puzzle locked
+        beforehand, and never waits on anyone holding it for longer than the
+        UPDATE itself. Returns whether the puzzle changed.
+        """
+        P = cls.ACTIVITY_PERIOD_SECONDS
+        N = cls.ACTIVITY_PERIODS
+        period = int(dt.timestamp()) // P
+
+        def period_start(k):
+            # the start of the k'th period after (or before, if negative) dt's
+            return datetime.fromtimestamp((period + k) * P, timezone.utc)
+
+        # how many periods last_active is ahead of dt (negative if behind)
+        periods_ahead = Cast(Floor(_EpochSeconds('last_active') / P), models.IntegerField()) - period
+        bits = F('activity_tracker')
+        one = Cast(Value(1), models.BigIntegerField())  # so it can be shifted past bit 31
+        activity_tracker = Case(
+            # last_active is far enough behind dt that none of its bits survive the shift
+            When(last_active__lt=period_start(-N + 1), then=one),
+            # it's behind: shift, and set the bit for dt's period
+            When(last_active__lt=period_start(0), then=bits.bitleftshift(-periods_ahead).bitand((1 << N) - 1).bitor(1)),
+            # it's in the same period or ahead: just set the bit for dt's period, if it's not too old
+            When(last_active__lt=period_start(N), then=bits.bitor(one.bitleftshift(periods_ahead))),
+            default=bits,
+            output_field=models.BigIntegerField())
+
+        # Only touch the row if that changes anything, so we know whether it did.
+        period_bit = Case(
+            When(last_active__gte=period_start(0), last_active__lt=period_start(N), then=one.bitleftshift(periods_ahead)),
+            default=Value(0),
+            output_field=models.BigIntegerField())
+        updated = cls.objects \
+            .annotate(period_bit=period_bit, period_bit_set=bits.bitand(period_bit)) \
+            .filter(id=puzzle_id) \
+            .filter(models.Q(last_active__lt=dt) | models.Q(period_bit__gt=0, period_bit_set=0)) \
+            .update(activity_tracker=activity_tracker, last_active=Greatest('last_active', Value(dt)))
+        return updated > 0
+
+
+def serialize_rounds(rounds):
+    """
+    Serializes a queryset of Rounds, including each one's puzzle_set, exactly
+    the way to_json_value would serialize them one by one, but in two queries
+    total: one for the rounds and one for all of their puzzles.
+    """
+    round_fields = [field for field in Round.Json.include_fields if field != 'puzzle_set']
+    puzzle_fields = [field for field in Puzzle.Json.include_fields if field != 'activity_histo']
+
+    round_values = list(rounds.values(*round_fields))
+    puzzle_sets = {values['id']: [] for values in round_values}
+
+    # Puzzle's default ordering would sort by parent too, which means a join;
+    # we're grouping by parent ourselves anyway, so skip it.
+    puzzle_values = Puzzle.objects \
+        .filter(parent__in=list(puzzle_sets)) \
+        .order_by('-is_meta', 'number', 'id') \
+        .values('parent', 'activity_tracker', *puzzle_fields)
+    for values in puzzle_values:
+        puzzle_json = {}
+        for field in Puzzle.Json.include_fields:
+            if field == 'activity_histo':
+                puzzle_json[field] = Puzzle.format_activity_histo(values['activity_tracker'])
+            else:
+                puzzle_json[field] = to_json_value(values[field])
+        puzzle_sets[values['parent']].append(puzzle_json)
+
+    rounds_json = []
+    for values in round_values:
+        round_json = {}
+        for field in Round.Json.include_fields:
+            if field == 'puzzle_set':
+                round_json[field] = puzzle_sets[values['id']]
+            else:
+                round_json[field] = to_json_value(values[field])
+        rounds_json.append(round_json)
+    return rounds_json
 
 
 class UserProfile(models.Model, JSONMixin):
@@ -0,0 +1,216 @@
+"""
+Who has recently been active in each puzzle channel, as shown in the
+channel_active lists of the puzzle feed.
+
+The Discord listener keeps this up to date in Redis as it sees activity and
+membership changes, so that the feed can read it in one round trip instead
+of querying ChannelParticipation. All of it lives in one sorted set, whose
+members are "<slug>\t<user id>" and whose scores are last-active timestamps,
+plus a hash of user ids to display names. Readers skip anyone who hasn't
+been active in the last ACTIVE_WINDOW; the prune_presence beat task trims
+both down to the rest every few minutes (see prune).
+
+Who's in each puzzle's voice channel right now is kept alongside, in a hash
+of slugs to lists of display names, which the listener replaces whenever it
+changes (see VoicePresence in puzzles/discordbot.py).
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db import transaction
+from lazy_object_proxy import Proxy as lazy_object
+from redis.exceptions import RedisError
+
+from puzzles.cache import REDIS
+from puzzles.encoding import dumps, loads
+from puzzles.models import ChannelParticipation
+
+
+ACTIVE_WINDOW = timedelta(hours=2)
+
+# The listener rewrites the voice channel occupants at least this often, so
+# that if it stops, they soon disappear rather than staying on call forever.
+VOICE_EXPIRY_SECONDS = 300
+
+
+def _key(name):
+    return f'puzzles.presence.{settings.HERRING_HUNT_ID}.{name}'
+
+
+def _member(slug, user_id):
+    return f'{slug}\t{user_id}'
+
+
+def _display_name(user_id, display_name):
+    if display_name:
+        return display_name
+    hash_pos = user_id.rfind('#')
+    if hash_pos >= 0:
+        return user_id[:hash_pos]
+    return user_id
+
+
+# Drops the display names of users who aren't in the sorted set anymore. This
+# has to happen in Redis, so that a user becoming active again in between
+# can't lose their freshly recorded name.
+_PRUNE_NAMES_SCRIPT = """
+local active = {}
+for _, member in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+    active[string.match(member, '\t(.*)$')] = true
+end
+for _, user_id in ipairs(redis.call('HKEYS', KEYS[2])) do
+    if not active[user_id] then
+        redis.call('HDEL', KEYS[2], user_id)
+    end
+end
+"""
+
+
+@lazy_object
+def _prune_names():
+    return REDIS.register_script(_PRUNE_NAMES_SCRIPT)
+
+
+def _cutoff():
+    return datetime.utcnow().replace(tzinfo=timezone.utc) - ACTIVE_WINDOW
+
+
+def _after_commit(func, description):
+    def do_update():
+        try:
+            func()
+        except RedisError:
+            logging.warning(f"presence: couldn't record {description}", exc_info=True)
+
+    transaction.on_commit(do_update)
+
+
+def record_activity(slug, user_id, display_name, dt):
+    """
+    Notes that the given user was active in the given puzzle channel at time
+    dt, once the current transaction (if any) commits.
+    """
+    def update():
+        with REDIS.pipeline(transaction=False) as pipe:
+            pipe.zadd(_key('active'), {_member(slug, user_id): dt.timestamp()})
+            pipe.hset(_key('names'), user_id, _display_name(user_id, display_name))
+            pipe.execute()
+
+    _after_commit(update, f"activity by {user_id} in {slug}")
+
+
+def sync_puzzle(puzzle):
+    """
+    Replaces what we know about the given puzzle with what's in its
+    ChannelParticipation rows, once the current transaction (if any) commits.
+    Call this after changing who is a member of the puzzle's channel.
+    """
+    def update():
+        rows = list(puzzle.channelparticipation_set.values_list('user_id', 'is_member', 'last_active', 'display_name'))
+        with REDIS.pipeline(transaction=True) as pipe:
+            if rows:
+                pipe.zrem(_key('active'), *[_member(puzzle.slug, user_id) for user_id, _, _, _ in rows])
+            for user_id, is_member, last_active, display_name in rows:
+                if is_member and last_active is not None:
+                    pipe.zadd(_key('active'), {_member(puzzle.slug, user_id): last_active.timestamp()})
+                    pipe.hset(_key('names'), user_id, _display_name(user_id, display_name))
+            pipe.execute()
+
+    _after_commit(update, f"membership of {puzzle.slug}")
+
+
+def _recently_active_rows():
+    return ChannelParticipation.objects \
+        .filter(is_member=True, last_active__gt=_cutoff()) \
+        .order_by('-last_active') \
+        .values_list('channel_puzzle_id', 'user_id', 'last_active', 'display_name')
+
+
+def _group_by_slug(rows):
+    channel_users = defaultdict(list)
+    for slug, user_id, _, display_name in rows:
+        channel_users[slug].append(_display_name(user_id, display_name))
+    return channel_users
+
+
+def rebuild():
+    """
+    Repopulates Redis from the database (for example, after Redis has been
+    flushed), returning the same thing as get_active_users.
+    """
+    rows = list(_recently_active_rows())
+    with REDIS.pipeline(transaction=True) as pipe:
+        pipe.delete(_key('active'), _key('names'))
+        for slug, user_id, last_active, display_name in rows:
+            pipe.zadd(_key('active'), {_member(slug, user_id): last_active.timestamp()})
+            pipe.hset(_key('names'), user_id, _display_name(user_id, display_name))
+        pipe.set(_key('ready'), 1)
+        pipe.execute()
+    return _group_by_slug(rows)
+
+
+def prune():
+    """
+    Drops the users who haven't been active in the last ACTIVE_WINDOW, and
+    then the display names of anyone who isn't left, so that neither grows
+    without bound. This scans the whole index, so it's run by a beat task
+    rather than by readers.
+    """
+    with REDIS.pipeline(transaction=True) as pipe:
+        pipe.zremrangebyscore(_key('active'), '-inf', _cutoff().timestamp())
+        _prune_names(keys=[_key('active'), _key('names')], client=pipe)
+        pipe.execute()
+
+
+def get_active_users():
+    """
+    Returns a dict of puzzle slugs to the display names of the members who
+    have been active there in the last ACTIVE_WINDOW, most recent first.
+    """
+    cutoff = _cutoff().timestamp()
+    try:
+        with REDIS.pipeline(transaction=True) as pipe:
+            pipe.get(_key('ready'))
+            pipe.zrevrangebyscore(_key('active'), '+inf', f'({cutoff}')
+            pipe.hgetall(_key('names'))
+            ready, members, names = pipe.execute()
+        if not ready:
+            return rebuild()
+    except RedisError:
+        logging.warning("presence: couldn't read active users from Redis", exc_info=True)
+        return _group_by_slug(_recently_active_rows())
+
+    channel_users = defaultdict(list)
+    for member in members:
+        slug, user_id = member.decode('utf-8').split('\t')
+        name = names.get(user_id.encode('utf-8'))
+        channel_users[slug].append(name.decode('utf-8') if name is not None else user_id)
+    return channel_users
+
+
+def set_voice_users(voice_users):
+    """
+    Replaces the record of who's in each puzzle's voice channel with the given
+    dict of slugs to display names.
+    """
+    with REDIS.pipeline(transaction=True) as pipe:
+        pipe.delete(_key('voice'))
+        if voice_users:
+            pipe.hset(_key('voice'), mapping={slug: dumps(names) for slug, names in voice_users.items()})
+            pipe.expire(_key('voice'), VOICE_EXPIRY_SECONDS)
+        pipe.execute()
+
+
+def get_voice_users():
+    """
+    Returns a dict of puzzle slugs to the display names of who's in their
+    voice channels, as of the listener's last report.
+    """
+    try:
+        voice = REDIS.hgetall(_key('voice'))
+    except RedisError:
+        logging.warning("presence: couldn't read voice channel occupants from Redis", exc_info=True)
+        return {}
+    return {slug.decode('utf-8'): loads(names) for slug, names in voice.items()}
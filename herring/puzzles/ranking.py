@@ -0,0 +1,110 @@
+"""
+Which unsolved puzzles are hottest (the most recent activity) and which need
+attention (nobody's in them, and nobody has touched them in a while),
+worked out on the server for every puzzle at once, rather than by every
+open tab from each puzzle's activity_histo.
+
+The ranking only changes when the hunt does (see puzzles/feed.py) or as
+time passes, so it's cached in Redis under the feed's versions and the
+current activity period, and recomputed only when one of them moves on.
+"""
+import logging
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db.models import F
+from redis.exceptions import RedisError
+
+from puzzles.cache import REDIS
+from puzzles.encoding import dumps, loads
+from puzzles.feed import get_versions
+from puzzles.models import Puzzle
+from puzzles.presence import get_active_users
+
+
+# How quickly old activity stops counting towards a puzzle's score: activity
+# this long ago counts half as much as activity now.
+HALF_LIFE_SECONDS = 15 * 60
+
+
+def _key():
+    return f'puzzles.ranking.{settings.HERRING_HUNT_ID}'
+
+
+def compute_ranking(puzzles, active_users, now):
+    """
+    Ranks the given puzzles (dicts with id, slug, name, round, answer,
+    last_active and activity_tracker), given who's active where (as from
+    presence.get_active_users) and the current Unix time.
+    """
+    P = Puzzle.ACTIVITY_PERIOD_SECONDS
+    N = Puzzle.ACTIVITY_PERIODS
+    unsolved = [puzzle for puzzle in puzzles if not puzzle['answer']]
+    if not unsolved:
+        return {'computed_at': now, 'hottest': [], 'needs_attention': []}
+
+    trackers = np.array([puzzle['activity_tracker'] for puzzle in unsolved], dtype=np.uint64)
+    last_active = np.array([puzzle['last_active'].timestamp() for puzzle in unsolved])
+    solvers = np.array([len(active_users.get(puzzle['slug'], ())) for puzzle in unsolved])
+
+    # one row per puzzle, one column per bit of its activity tracker
+    bits = (trackers[:, np.newaxis] >> np.arange(N, dtype=np.uint64)) & np.uint64(1)
+    # bit k is for the period k periods before the one last_active is in
+    periods_ago = (now // P - last_active // P)[:, np.newaxis] + np.arange(N)
+    scores = (bits * 0.5 ** (periods_ago * P / HALF_LIFE_SECONDS)).sum(axis=1)
+    idle = np.maximum(now - last_active, 0)
+
+    def entry(i):
+        puzzle = unsolved[i]
+        return {
+            'id': puzzle['id'],
+            'slug': puzzle['slug'],
+            'name': puzzle['name'],
+            'round': puzzle['round'],
+            'score': round(float(scores[i]), 3),
+            'solvers': int(solvers[i]),
+            'idle_seconds': int(idle[i]),
+        }
+
+    hottest = [i for i in np.argsort(-scores, kind='stable') if scores[i] > 0]
+    # puzzles nobody's in first, then the longest-neglected first
+    needs_attention = np.lexsort((-idle, solvers > 0))
+    return {
+        'computed_at': now,
+        'hottest': [entry(i) for i in hottest],
+        'needs_attention': [entry(i) for i in needs_attention],
+    }
+
+
+def _build_ranking():
+    puzzles = Puzzle.objects \
+        .filter(hunt_id=settings.HERRING_HUNT_ID) \
+        .values('id', 'slug', 'name', 'answer', 'last_active', 'activity_tracker', round=F('parent__name'))
+    return compute_ranking(list(puzzles), get_active_users(), time.time())
+
+
+def get_ranking():
+    """
+    Returns the current ranking (see compute_ranking), from the cache if it's
+    up to date.
+    """
+    try:
+        version, state = get_versions()
+        stamp = f'{version}:{state}:{int(time.time()) // Puzzle.ACTIVITY_PERIOD_SECONDS}'
+        cached = REDIS.get(_key())
+    except RedisError:
+        logging.warning("ranking: couldn't read the cached ranking from Redis", exc_info=True)
+        return _build_ranking()
+
+    if cached is not None:
+        cached = loads(cached)
+        if cached['stamp'] == stamp:
+            return cached['ranking']
+
+    ranking = _build_ranking()
+    try:
+        REDIS.set(_key(), dumps({'stamp': stamp, 'ranking': ranking}))
+    except RedisError:
+        logging.warning("ranking: couldn't store the ranking in Redis", exc_info=True)
+    return ranking
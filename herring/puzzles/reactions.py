@@ -0,0 +1,57 @@
+"""
+Which puzzle each of the announcer's messages is about, as far as signup and
+leave reactions go, so that the listener can act on those reactions without
+fetching the message from Discord to find out.
+
+The announcer records its announcements and "solved" messages here as it
+sends them, as one key per "<message id>:<emoji>" holding a slug, listing
+only the reactions that message would have meant something for. Each key
+expires after REACTION_EXPIRY_SECONDS, so that a long-running deployment
+doesn't keep every message it has ever sent; a reaction to an older message
+just costs the listener a fetch of that message, as it would have before.
+The listener keeps the ones it's looked up in an LRU in front of this (see
+HerringCog.reaction_target).
+"""
+import logging
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from puzzles.cache import REDIS
+
+
+# how long we remember what a message is about; most reactions come within a day or so of the message
+REACTION_EXPIRY_SECONDS = 7 * 24 * 60 * 60
+
+
+def _key(message_id, emoji):
+    return f'puzzles.reactions.{settings.HERRING_HUNT_ID}.{message_id}:{emoji}'
+
+
+def record(message_id, emojis, slug):
+    """
+    Notes that reacting to the given message with any of the given emojis is
+    about the puzzle with the given slug.
+    """
+    if not emojis:
+        return
+    try:
+        with REDIS.pipeline(transaction=False) as pipe:
+            for emoji in emojis:
+                pipe.set(_key(message_id, emoji), slug, ex=REACTION_EXPIRY_SECONDS)
+            pipe.execute()
+    except RedisError:
+        logging.warning(f"reactions: couldn't record message {message_id}", exc_info=True)
+
+
+def lookup(message_id, emoji):
+    """
+    Returns the slug of the puzzle that reacting to the given message with
+    the given emoji is about, or None if the announcer didn't record it.
+    """
+    try:
+        slug = REDIS.get(_key(message_id, emoji))
+    except RedisError:
+        logging.warning(f"reactions: couldn't look up message {message_id}", exc_info=True)
+        return None
+    return slug.decode('utf-8') if slug is not None else None
@@ -1,14 +1,41 @@
+import threading
+from contextlib import contextmanager
+
 from django.contrib.auth.models import User
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from django.db import transaction
-from puzzles.tasks import create_puzzle_sheet_and_channel, post_answer, post_update, create_round_category
-from puzzles.models import Puzzle, Round, UserProfile
+from puzzles.tasks import create_puzzle_sheet_and_channel, open_round, post_answer, post_update, create_round_category
+from puzzles.feed import invalidate_state, record_changes
+from puzzles.models import ChannelParticipation, Puzzle, Round, UserProfile
+
+_opening_round = threading.local()
+
+
+@contextmanager
+def opening_round(round_id):
+    """
+    Puzzles created inside this block (which must all be in the given round)
+    are set up together by one open_round task once the transaction commits,
+    instead of each by its own create_puzzle_sheet_and_channel.
+    """
+    slugs = _opening_round.slugs = []
+    try:
+        yield
+    finally:
+        _opening_round.slugs = None
+    if slugs:
+        transaction.on_commit(lambda: open_round.delay(round_id, slugs))
+
 
 @receiver(post_save, sender=Puzzle)
 def on_puzzle_save(sender, instance, created, **kwargs):
     if created:
-        transaction.on_commit(lambda: create_puzzle_sheet_and_channel.delay(instance.slug))
+        batch = getattr(_opening_round, 'slugs', None)
+        if batch is not None:
+            batch.append(instance.slug)
+        else:
+            transaction.on_commit(lambda: create_puzzle_sheet_and_channel.delay(instance.slug))
 
 
 @receiver(pre_save, sender=Puzzle)
@@ -30,6 +57,21 @@ def on_round_save(sender, instance, created, **kwargs):
         transaction.on_commit(lambda: create_round_category.delay(instance.id))
 
 
+@receiver(post_save, sender=Puzzle)
+@receiver(post_delete, sender=Puzzle)
+@receiver(post_save, sender=Round)
+@receiver(post_delete, sender=Round)
+def on_hunt_change(sender, instance, **kwargs):
+    record_changes([instance])
+
+
+@receiver(post_save, sender=ChannelParticipation)
+@receiver(post_delete, sender=ChannelParticipation)
+@receiver(post_save, sender=UserProfile)
+def on_feed_state_change(sender, instance, **kwargs):
+    invalidate_state()
+
+
 @receiver(post_save, sender=User)
 def on_user_save(sender, instance, created, **kwargs):
     if created or not hasattr(instance, 'profile'):
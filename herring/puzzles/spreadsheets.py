@@ -3,7 +3,9 @@ from datetime import datetime
 from django.conf import settings
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from lazy_object_proxy import Proxy as lazy_object
+from puzzles import warmpool
 from puzzles.discordbot import log_to_discord
 
 
@@ -23,7 +25,11 @@ def service():
         return None
 
 
-def make_sheet(title):
+# Drive won't take more than this many calls in one batch request.
+DRIVE_BATCH_SIZE = 100
+
+
+def _copy_template(title):
     body = {
         'mimeType': 'application/vnd.google-apps.spreadsheet',
         'name': title,
@@ -32,10 +38,89 @@ def make_sheet(title):
             'readOnly': False,  # Not sure if this is necessary or sufficient
         },
     }
-    got = service.files().copy(fileId=settings.HERRING_SECRETS['gapps-doc-to-clone'], body=body).execute()
+    return service.files().copy(fileId=settings.HERRING_SECRETS['gapps-doc-to-clone'], body=body)
+
+
+def make_sheet(title):
+    got = _copy_template(title).execute()
     return got['id']
 
 
+def rename_sheet(sheet_id, title):
+    service.files().update(fileId=sheet_id, body={'name': title}).execute()
+
+
+def claim_sheet(title):
+    """
+    Like make_sheet, but renames a spare sheet from the warm pool instead of
+    copying the template, if there's one ready.
+    """
+    sheet_id = warmpool.claim('sheets')
+    if sheet_id is not None:
+        try:
+            rename_sheet(sheet_id, title)
+            return sheet_id
+        except HttpError:
+            logging.warning("Couldn't rename spare sheet %s, making a new one instead", sheet_id, exc_info=True)
+    return make_sheet(title)
+
+
+def make_sheets(titles):
+    """
+    Like make_sheet, but for many sheets at once, in as few HTTP requests as
+    Drive allows. Takes a dict of keys to sheet titles, and returns a dict of
+    the same keys to sheet IDs. Sheets that couldn't be made are left out.
+    """
+    sheet_ids = {}
+
+    def on_response(key, response, exception):
+        if exception is not None:
+            logging.error("Couldn't make sheet %s", titles[key], exc_info=exception)
+        else:
+            sheet_ids[key] = response['id']
+
+    keys = list(titles)
+    for start in range(0, len(keys), DRIVE_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=on_response)
+        for key in keys[start:start + DRIVE_BATCH_SIZE]:
+            batch.add(_copy_template(titles[key]), request_id=key)
+        batch.execute()
+    return sheet_ids
+
+
+def claim_sheets(titles):
+    """
+    Like make_sheets, but renames spare sheets from the warm pool for as many
+    of the titles as it has (in batches, as make_sheets copies them), and only
+    copies the template for the rest.
+    """
+    spares = {}
+    for key in titles:
+        sheet_id = warmpool.claim('sheets')
+        if sheet_id is None:
+            break
+        spares[key] = sheet_id
+    sheet_ids = {}
+
+    def on_response(key, response, exception):
+        if exception is not None:
+            logging.warning("Couldn't rename spare sheet %s, making a new one instead", spares[key], exc_info=exception)
+        else:
+            sheet_ids[key] = spares[key]
+
+    keys = list(spares)
+    for start in range(0, len(keys), DRIVE_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=on_response)
+        for key in keys[start:start + DRIVE_BATCH_SIZE]:
+            batch.add(service.files().update(fileId=spares[key], body={'name': titles[key]}), request_id=key)
+        batch.execute()
+
+    remaining = {key: title for key, title in titles.items() if key not in sheet_ids}
+    if remaining:
+        sheet_ids.update(make_sheets(remaining))
+    return sheet_ids
+
+
 def iterate_changes(page_token=None):
     if page_token is None:
         page_token = service.changes().getStartPageToken().execute()['startPageToken']
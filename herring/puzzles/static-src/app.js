@@ -6,6 +6,18 @@ import request from 'then-request';
 import store from 'store';
 import NavHeaderComponent from './components/nav-header';
 import RoundsComponent from './components/rounds';
+import { applyChanges, withActivity } from './utils';
+
+// Who counts as active in a puzzle changes with the passage of time, which the
+// change feed doesn't report, so every so often we fetch everything anyway.
+const FULL_RELOAD_INTERVAL = 5 * 60 * 1000;
+const PUSH_RECONNECT_DELAY = 5000;
+// Nor does it report changes to who's active (the "state"), so when the push
+// server tells us about those, we fetch everything, but at most this often.
+const STATE_RELOAD_INTERVAL = 15 * 1000;
+// The activity histograms are too big to send with every change, and only
+// move a bucket at a time, so they're fetched separately, this often.
+const ACTIVITY_RELOAD_INTERVAL = 60 * 1000;
 
 class Page extends React.Component {
   state = {
@@ -17,7 +29,9 @@ class Page extends React.Component {
 
     this.setState({uiSettings: store.get('uiSettings', {app_links: false})});
     this.loadDataFromServer();
-    setInterval(this.loadDataFromServer, this.props.pollInterval);
+    setInterval(this.pollServer, this.props.pollInterval);
+    this.loadActivityFromServer();
+    setInterval(this.loadActivityFromServer, ACTIVITY_RELOAD_INTERVAL);
 
 
     // Request permission to send web notifications--this has to take place in
@@ -43,7 +57,7 @@ class Page extends React.Component {
             <NavHeaderComponent rounds={ this.state.rounds }
                                 settings={ this.state.settings }
             />
-            <RoundsComponent rounds={ this.state.rounds }
+            <RoundsComponent rounds={ withActivity(this.state.rounds, this.state.activity) }
                              changeMade={ this.loadDataFromServer }
                              settings={ this.state.settings }
                              uiSettings={ this.state.uiSettings }
@@ -54,9 +68,76 @@ class Page extends React.Component {
         return null;
     }
   }
-  loadDataFromServer = () => {
-    request('GET', '/puzzles/').done(res =>
-      this.setState(JSON.parse(res.getBody())));
+  pollServer = () => {
+    // While the push server is telling us about changes, polling is only needed to catch up on the things it
+    // doesn't tell us about.
+    const pushing = this.socket && this.socket.readyState === WebSocket.OPEN;
+    if (!pushing || Date.now() - this.lastFullLoad > FULL_RELOAD_INTERVAL) {
+      this.loadDataFromServer();
+    }
+  };
+  connectToPushServer = (url) => {
+    if (this.socket) {
+      return;
+    }
+    this.socket = new WebSocket(url);
+    this.socket.onmessage = event => this.onPushEvent(JSON.parse(event.data));
+    this.socket.onopen = () => this.loadDataFromServer();
+    this.socket.onclose = () => {
+      this.socket = null;
+      setTimeout(() => this.connectToPushServer(url), PUSH_RECONNECT_DELAY);
+    };
+  };
+  onPushEvent = ({ version, state_version }) => {
+    if (state_version !== this.state.state_version) {
+      this.reloadState();
+    } else if (version !== this.state.version) {
+      this.loadDataFromServer();
+    }
+  };
+  reloadState = () => {
+    if (this.stateReload) {
+      return;
+    }
+    const wait = Math.max(0, this.lastFullLoad + STATE_RELOAD_INTERVAL - Date.now());
+    this.stateReload = setTimeout(() => {
+      this.stateReload = null;
+      this.loadDataFromServer(true);
+    }, wait);
+  };
+  loadDataFromServer = (full) => {
+    const version = this.state.version;
+    if (full === true || version === undefined || version === null ||
+        Date.now() - this.lastFullLoad > FULL_RELOAD_INTERVAL) {
+      request('GET', '/puzzles/').done(res => {
+        const data = JSON.parse(res.getBody());
+        this.lastFullLoad = Date.now();
+        this.setState(data);
+        if (data.settings.push_url) {
+          this.connectToPushServer(data.settings.push_url);
+        }
+      });
+      return;
+    }
+    request('GET', '/puzzles/changes/', {qs: {since: version}}).done(res => {
+      const changes = JSON.parse(res.getBody());
+      this.setState(state => {
+        if (state.version !== version) {
+          // something else updated us while this was in flight
+          return null;
+        }
+        if (changes.full) {
+          return {rounds: changes.rounds, settings: changes.settings, version: changes.version,
+                  state_version: changes.state_version};
+        }
+        return {rounds: applyChanges(state.rounds, changes), settings: changes.settings, version: changes.version};
+      });
+    });
+  };
+  loadActivityFromServer = () => {
+    request('GET', '/puzzles/activity/').done(res => {
+      this.setState({activity: JSON.parse(res.getBody())});
+    });
   };
   toggleLinkType = () => {
     // this just deep-merges into state.uiSettings
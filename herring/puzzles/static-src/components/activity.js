@@ -8,11 +8,14 @@ const B = 6;       // number of periods in a bucket
 
 export default function ActivityComponent(props) {
     const { className, activity } = props;
-    const { channelCount, channelActive, activityHisto, lastActive } = activity;
+    const { channelCount, channelActive, voiceActive, activityHisto, activityCounts, activityUsers, windowHours, lastActive } = activity;
     const now = new Date();
     const buckets = histoToBuckets(activityHisto, lastActive, now);
+    const intensity = describeIntensity(activityCounts, activityUsers, windowHours);
     const activeInvisible = channelActive.length === 0 ? 'invisible' : '';
     const activeUsers = channelActive.join(', ');
+    const voiceInvisible = voiceActive.length === 0 ? 'invisible' : '';
+    const voiceUsers = voiceActive.join(', ');
     return (
         <div className={className}>
             <span className="allMembers">
@@ -23,8 +26,13 @@ export default function ActivityComponent(props) {
             <span className={`activeMembers ${activeInvisible}`} title={activeUsers}>
                 {pad(channelActive.length)}
                 <span className="glyphicon glyphicon-user" aria-hidden="true"></span>
+            </span>
+            &nbsp;
+            <span className={`voiceMembers ${voiceInvisible}`} title={voiceUsers}>
+                {pad(voiceActive.length)}
+                <span className="glyphicon glyphicon-headphones" aria-hidden="true"></span>
             </span> {
-            buckets && <BarChart data={buckets} max={B} width={30} height={13} />} {
+            buckets && <span title={intensity}><BarChart data={buckets} max={B} width={30} height={13} /></span>} {
             lastActive <= 0 ? 'never' : renderTimeDelta(now - lastActive)}
         </div>);
 }
@@ -47,6 +55,16 @@ function histoToBuckets(activityHisto, lastActive, now) {
     return buckets;
 }
 
+// e.g. "134 in the last 48h: alice 80, bob 54"; the counts are messages,
+// minutes in voice and sheet edits (which aren't anyone's in particular)
+function describeIntensity(activityCounts, activityUsers, windowHours) {
+    const total = activityCounts.reduce((sum, count) => sum + count, 0);
+    const users = Object.entries(activityUsers)
+        .sort(([, a], [, b]) => b - a)
+        .map(([name, count]) => `${name} ${count}`);
+    return `${total} in the last ${windowHours}h${users.length ? ': ' + users.join(', ') : ''}`;
+}
+
 function popcnt(x) {
     let count;
     for (count = 0; x; count++) {
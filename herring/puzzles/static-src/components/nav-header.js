@@ -21,13 +21,18 @@ export default function NavHeaderComponent({ rounds, settings }) {
     rs = Utils.interleave(' | ', roundTags);
     var discord;
     var gapps;
+    // how many spare channels/sheets are ready for new puzzles, if there's a warm pool
+    var warmPool = settings.service_status.warm_pool;
+    var spares = function(kind) {
+      return warmPool ? `${warmPool[kind]} spare ${kind} ready` : undefined;
+    };
     if (settings.discord) {
-      discord = <span className={cx({"messaging-logo": true, "broken": !settings.service_status.discord})}>
+      discord = <span className={cx({"messaging-logo": true, "broken": !settings.service_status.discord})} title={ spares('channels') }>
         <img className="messaging-logo" src={ discordIcon } alt={ `Discord` } />
       </span>
     }
     if (settings.gapps) {
-      gapps = <span className={cx({"messaging-logo": true, "broken": !settings.service_status.gapps})}>
+      gapps = <span className={cx({"messaging-logo": true, "broken": !settings.service_status.gapps})} title={ spares('sheets') }>
         <img className="messaging-logo" src={ gappsIcon } alt={ `Google Sheets` } />
       </span>
     }
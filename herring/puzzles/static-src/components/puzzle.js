@@ -133,7 +133,11 @@ export default class PuzzleComponent extends React.Component {
                         activity={ {
                             channelCount: puzzle.channel_count,
                             channelActive: puzzle.channel_active,
+                            voiceActive: puzzle.voice_active || [],
                             activityHisto: puzzle.activity_histo,
+                            activityCounts: puzzle.activity_counts || [],
+                            activityUsers: puzzle.activity_users || {},
+                            windowHours: this.props.settings.activity_window_hours,
                             lastActive: new Date(puzzle.last_active),
                         } }
                     />
@@ -13,3 +13,72 @@ export function interleave(element, array) {
     }
     return retval;
 }
+
+function comparePuzzles(a, b) {
+    // mirrors Puzzle.Meta.ordering on the server: metas first, then by number, then by id
+    if (a.is_meta !== b.is_meta) {
+        return a.is_meta ? -1 : 1;
+    }
+    if (a.number !== b.number) {
+        // Postgres sorts nulls last
+        if (a.number === null) return 1;
+        if (b.number === null) return -1;
+        return a.number - b.number;
+    }
+    return a.id - b.id;
+}
+
+function compareRounds(a, b) {
+    return (a.number - b.number) || (a.id - b.id);
+}
+
+// Applies a response from /puzzles/changes/ to a list of rounds from /puzzles/, returning a new list.
+export function applyChanges(rounds, changes) {
+    const deletedRounds = new Set(changes.deleted.rounds);
+    const deletedPuzzles = new Set(changes.deleted.puzzles);
+    const changedPuzzles = new Map(changes.puzzles.map(puzzle => [puzzle.id, puzzle]));
+
+    const roundsById = new Map();
+    rounds.forEach(round => {
+        if (!deletedRounds.has(round.id)) {
+            roundsById.set(round.id, round);
+        }
+    });
+    changes.rounds.forEach(round => {
+        const existing = roundsById.get(round.id);
+        roundsById.set(round.id, {...round, puzzle_set: existing ? existing.puzzle_set : []});
+    });
+
+    const puzzleSets = new Map();
+    roundsById.forEach((round, id) => {
+        puzzleSets.set(id, round.puzzle_set.filter(puzzle =>
+            !deletedPuzzles.has(puzzle.id) && !changedPuzzles.has(puzzle.id)));
+    });
+    changedPuzzles.forEach(puzzle => {
+        const puzzleSet = puzzleSets.get(puzzle.round);
+        if (puzzleSet) {
+            puzzleSet.push(puzzle);
+        }
+    });
+
+    return Array.from(roundsById.values())
+        .map(round => ({...round, puzzle_set: puzzleSets.get(round.id).sort(comparePuzzles)}))
+        .sort(compareRounds);
+}
+
+// Fills in each puzzle's activity_counts, and activity_users (totals per person), from a response from
+// /puzzles/activity/, returning a new list of rounds.
+export function withActivity(rounds, activity) {
+    if (!activity) {
+        return rounds;
+    }
+    const sum = counts => counts.reduce((a, b) => a + b, 0);
+    return rounds.map(round => ({...round, puzzle_set: round.puzzle_set.map(puzzle => {
+        const users = activity.users[puzzle.id] || {};
+        const totals = {};
+        Object.keys(users).forEach(name => {
+            totals[name] = sum(users[name]);
+        });
+        return {...puzzle, activity_counts: activity.puzzles[puzzle.id] || [], activity_users: totals};
+    })}));
+}
@@ -32,4 +32,4 @@ object-assign
  *
  * This source code is licensed under the MIT license found in the
  * LICENSE file in the root directory of this source tree.
- */function r(e){return(r="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}var o,i,a,l,u;if("undefined"==typeof window||"function"!=typeof MessageChannel){var c=null,s=null,f=function e(){if(null!==c)try{var n=t.unstable_now();c(!0,n),c=null}catch(t){throw setTimeout(e,0),t}},p=Date.now();t.unstable_now=function(){return Date.now()-p},o=function(e){null!==c?setTimeout(o,0,e):(c=e,setTimeout(f,0))},i=function(e,t){s=setTimeout(e,t)},a=function(){clearTimeout(s)},l=function(){return!1},u=t.unstable_forceFrameRate=function(){}}else{var d=window.performance,m=window.Date,h=window.setTimeout,y=window.clearTimeout;if("undefined"!=typeof console){var g=window.cancelAnimationFrame;"function"!=typeof window.requestAnimationFrame&&console.error("This browser doesn't support requestAnimationFrame. Make sure that you load a polyfill in older browsers. https://fb.me/react-polyfills"),"function"!=typeof g&&console.error("This browser doesn't support cancelAnimationFrame. Make sure that you load a polyfill in older browsers. https://fb.me/react-polyfills")}if("object"===r(d)&&"function"==typeof d.now)t.unstable_now=function(){return d.now()};else{var v=m.now();t.unstable_now=function(){return m.now()-v}}var b=!1,w=null,k=-1,S=5,E=0;l=function(){return t.unstable_now()>=E},u=function(){},t.unstable_forceFrameRate=function(e){0>e||125<e?console.error("forceFrameRate takes a positive int between 0 and 125, forcing framerates higher than 125 fps is not unsupported"):S=0<e?Math.floor(1e3/e):5};var x=new MessageChannel,T=x.port2;x.port1.onmessage=function(){if(null!==w){var e=t.unstable_now();E=e+S;try{w(!0,e)?T.postMessage(null):(b=!1,w=null)}catch(e){throw T.postMessage(null),e}}else b=!1},o=function(e){w=e,b||(b=!0,T.postMessage(null))},i=function(e,n){k=h((function(){e(t.unstable_now())}),n)},a=function(){y(k),k=-1}}function _(e,t){var n=e.length;e.push(t);e:for(;;){var r=n-1>>>1,o=e[r];if(!(void 0!==o&&0<O(o,t)))break e;e[r]=t,e[n]=o,n=r}}function C(e){return void 0===(e=e[0])?null:e}function P(e){var t=e[0];if(void 0!==t){var n=e.pop();if(n!==t){e[0]=n;e:for(var r=0,o=e.length;r<o;){var i=2*(r+1)-1,a=e[i],l=i+1,u=e[l];if(void 0!==a&&0>O(a,n))void 0!==u&&0>O(u,a)?(e[r]=u,e[l]=n,r=l):(e[r]=a,e[i]=n,r=i);else{if(!(void 0!==u&&0>O(u,n)))break e;e[r]=u,e[l]=n,r=l}}}return t}return null}function O(e,t){var n=e.sortIndex-t.sortIndex;return 0!==n?n:e.id-t.id}var N=[],j=[],R=1,z=null,D=3,M=!1,F=!1,A=!1;function I(e){for(var t=C(j);null!==t;){if(null===t.callback)P(j);else{if(!(t.startTime<=e))break;P(j),t.sortIndex=t.expirationTime,_(N,t)}t=C(j)}}function L(e){if(A=!1,I(e),!F)if(null!==C(N))F=!0,o(U);else{var t=C(j);null!==t&&i(L,t.startTime-e)}}function U(e,n){F=!1,A&&(A=!1,a()),M=!0;var r=D;try{for(I(n),z=C(N);null!==z&&(!(z.expirationTime>n)||e&&!l());){var o=z.callback;if(null!==o){z.callback=null,D=z.priorityLevel;var u=o(z.expirationTime<=n);n=t.unstable_now(),"function"==typeof u?z.callback=u:z===C(N)&&P(N),I(n)}else P(N);z=C(N)}if(null!==z)var c=!0;else{var s=C(j);null!==s&&i(L,s.startTime-n),c=!1}return c}finally{z=null,D=r,M=!1}}function V(e){switch(e){case 1:return-1;case 2:return 250;case 5:return 1073741823;case 4:return 1e4;default:return 5e3}}var W=u;t.unstable_IdlePriority=5,t.unstable_ImmediatePriority=1,t.unstable_LowPriority=4,t.unstable_NormalPriority=3,t.unstable_Profiling=null,t.unstable_UserBlockingPriority=2,t.unstable_cancelCallback=function(e){e.callback=null},t.unstable_continueExecution=function(){F||M||(F=!0,o(U))},t.unstable_getCurrentPriorityLevel=function(){return D},t.unstable_getFirstCallbackNode=function(){return C(N)},t.unstable_next=function(e){switch(D){case 1:case 2:case 3:var t=3;break;default:t=D}var n=D;D=t;try{return e()}finally{D=n}},t.unstable_pauseExecution=function(){},t.unstable_requestPaint=W,t.unstable_runWithPriority=function(e,t){switch(e){case 1:case 2:case 3:case 4:case 5:break;default:e=3}var n=D;D=e;try{return t()}finally{D=n}},t.unstable_scheduleCallback=function(e,n,l){var u=t.unstable_now();if("object"===r(l)&&null!==l){var c=l.delay;c="number"==typeof c&&0<c?u+c:u,l="number"==typeof l.timeout?l.timeout:V(e)}else l=V(e),c=u;return e={id:R++,callback:n,priorityLevel:e,startTime:c,expirationTime:l=c+l,sortIndex:-1},c>u?(e.sortIndex=c,_(j,e),null===C(N)&&e===C(j)&&(A?a():A=!0,i(L,c-u))):(e.sortIndex=l,_(N,e),F||M||(F=!0,o(U))),e},t.unstable_shouldYield=function(){var e=t.unstable_now();I(e);var n=C(N);return n!==z&&null!==z&&null!==n&&null!==n.callback&&n.startTime<=e&&n.expirationTime<z.expirationTime||l()},t.unstable_wrapCallback=function(e){var t=D;return function(){var n=D;D=t;try{return e.apply(this,arguments)}finally{D=n}}}},function(e,t,n){"use strict";function r(e){return(r="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}var o=function(){function e(e,t,n,o){if("number"!=typeof e)throw new TypeError("statusCode must be a number but was "+r(e));if(null===t)throw new TypeError("headers cannot be null");if("object"!==r(t))throw new TypeError("headers must be an object but was "+r(t));this.statusCode=e;var i={};for(var a in t)i[a.toLowerCase()]=t[a];this.headers=i,this.body=n,this.url=o}return e.prototype.isError=function(){return 0===this.statusCode||this.statusCode>=400},e.prototype.getBody=function(e){var t;if(0===this.statusCode)throw(t=new Error("This request to "+this.url+" resulted in a status code of 0. This usually indicates some kind of network error in a browser (e.g. CORS not being set up or the DNS failing to resolve):\n"+this.body.toString())).statusCode=this.statusCode,t.headers=this.headers,t.body=this.body,t.url=this.url,t;if(this.statusCode>=300)throw(t=new Error("Server responded to "+this.url+" with status code "+this.statusCode+":\n"+this.body.toString())).statusCode=this.statusCode,t.headers=this.headers,t.body=this.body,t.url=this.url,t;return e&&"string"!=typeof this.body?this.body.toString(e):this.body},e}();e.exports=o},function(e,t,n){"use strict";e.exports=n(2),n(22),n(23),n(24),n(25),n(27)},function(e,t,n){"use strict";var r=n(2);e.exports=r,r.prototype.done=function(e,t){var n=arguments.length?this.then.apply(this,arguments):this;n.then(null,(function(e){setTimeout((function(){throw e}),0)}))}},function(e,t,n){"use strict";var r=n(2);e.exports=r,r.prototype.finally=function(e){return this.then((function(t){return r.resolve(e()).then((function(){return t}))}),(function(t){return r.resolve(e()).then((function(){throw t}))}))}},function(e,t,n){"use strict";function r(e){return(r="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}var o=n(2);e.exports=o;var i=f(!0),a=f(!1),l=f(null),u=f(void 0),c=f(0),s=f("");function f(e){var t=new o(o._0);return t._V=1,t._W=e,t}o.resolve=function(e){if(e instanceof o)return e;if(null===e)return l;if(void 0===e)return u;if(!0===e)return i;if(!1===e)return a;if(0===e)return c;if(""===e)return s;if("object"===r(e)||"function"==typeof e)try{var t=e.then;if("function"==typeof t)return new o(t.bind(e))}catch(e){return new o((function(t,n){n(e)}))}return f(e)};var p=function(e){return"function"==typeof Array.from?(p=Array.from,Array.from(e)):(p=function(e){return Array.prototype.slice.call(e)},Array.prototype.slice.call(e))};o.all=function(e){var t=p(e);return new o((function(e,n){if(0===t.length)return e([]);var i=t.length;function a(l,u){if(u&&("object"===r(u)||"function"==typeof u)){if(u instanceof o&&u.then===o.prototype.then){for(;3===u._V;)u=u._W;return 1===u._V?a(l,u._W):(2===u._V&&n(u._W),void u.then((function(e){a(l,e)}),n))}var c=u.then;if("function"==typeof c)return void new o(c.bind(u)).then((function(e){a(l,e)}),n)}t[l]=u,0==--i&&e(t)}for(var l=0;l<t.length;l++)a(l,t[l])}))},o.reject=function(e){return new o((function(t,n){n(e)}))},o.race=function(e){return new o((function(t,n){p(e).forEach((function(e){o.resolve(e).then(t,n)}))}))},o.prototype.catch=function(e){return this.then(null,e)}},function(e,t,n){"use strict";var r=n(2),o=n(26);e.exports=r,r.denodeify=function(e,t){return"number"==typeof t&&t!==1/0?function(e,t){for(var n=[],o=0;o<t;o++)n.push("a"+o);var a=["return function ("+n.join(",")+") {","var self = this;","return new Promise(function (rs, rj) {","var res = fn.call(",["self"].concat(n).concat([i]).join(","),");","if (res &&",'(typeof res === "object" || typeof res === "function") &&','typeof res.then === "function"',") {rs(res);}","});","};"].join("");return Function(["Promise","fn"],a)(r,e)}(e,t):function(e){for(var t=Math.max(e.length-1,3),n=[],o=0;o<t;o++)n.push("a"+o);var a=["return function ("+n.join(",")+") {","var self = this;","var args;","var argLength = arguments.length;","if (arguments.length > "+t+") {","args = new Array(arguments.length + 1);","for (var i = 0; i < arguments.length; i++) {","args[i] = arguments[i];","}","}","return new Promise(function (rs, rj) {","var cb = "+i+";","var res;","switch (argLength) {",n.concat(["extra"]).map((function(e,t){return"case "+t+":res = fn.call("+["self"].concat(n.slice(0,t)).concat("cb").join(",")+");break;"})).join(""),"default:","args[argLength] = cb;","res = fn.apply(self, args);","}","if (res &&",'(typeof res === "object" || typeof res === "function") &&','typeof res.then === "function"',") {rs(res);}","});","};"].join("");return Function(["Promise","fn"],a)(r,e)}(e)};var i="function (err, res) {if (err) { rj(err); } else { rs(res); }}";r.nodeify=function(e){return function(){var t=Array.prototype.slice.call(arguments),n="function"==typeof t[t.length-1]?t.pop():null,i=this;try{return e.apply(this,arguments).nodeify(n,i)}catch(e){if(null==n)return new r((function(t,n){n(e)}));o((function(){n.call(i,e)}))}}},r.prototype.nodeify=function(e,t){if("function"!=typeof e)return this;this.then((function(n){o((function(){e.call(t,null,n)}))}),(function(n){o((function(){e.call(t,n)}))}))}},function(e,t,n){"use strict";var r=n(10),o=[],i=[],a=r.makeRequestCallFromTimer((function(){if(i.length)throw i.shift()}));function l(e){var t;(t=o.length?o.pop():new u).task=e,r(t)}function u(){this.task=null}e.exports=l,u.prototype.call=function(){try{this.task.call()}catch(e){l.onerror?l.onerror(e):(i.push(e),a())}finally{this.task=null,o[o.length]=this}}},function(e,t,n){"use strict";var r=n(2);e.exports=r,r.enableSynchronous=function(){r.prototype.isPending=function(){return 0==this.getState()},r.prototype.isFulfilled=function(){return 1==this.getState()},r.prototype.isRejected=function(){return 2==this.getState()},r.prototype.getValue=function(){if(3===this._V)return this._W.getValue();if(!this.isFulfilled())throw new Error("Cannot get a value of an unfulfilled promise.");return this._W},r.prototype.getReason=function(){if(3===this._V)return this._W.getReason();if(!this.isRejected())throw new Error("Cannot get a rejection reason of a non-rejected promise.");return this._W},r.prototype.getState=function(){return 3===this._V?this._W.getState():-1===this._V||-2===this._V?0:this._V}},r.disableSynchronous=function(){r.prototype.isPending=void 0,r.prototype.isFulfilled=void 0,r.prototype.isRejected=void 0,r.prototype.getValue=void 0,r.prototype.getReason=void 0,r.prototype.getState=void 0}},function(e,t,n){"use strict";t.__esModule=!0;n(9);function r(e){return e?"utf8"===e?this.then(i):this.then(function(e){return function(t){return t.getBody(e)}}(e)):this.then(o)}function o(e){return e.getBody()}function i(e){return e.getBody("utf8")}t.default=function(e){return e.getBody=r,e},t.ResponsePromise=void 0},function(e,t,n){"use strict";t.__esModule=!0;var r=n(30);t.default=function(e,t){var n=e.split("?"),o=n[0],i=n[1],a=(i||"").split("#")[0],l=i&&i.split("#").length>1?"#"+i.split("#")[1]:"",u=r.parse(a);for(var c in t)u[c]=t[c];return""!==(a=r.stringify(u))&&(a="?"+a),o+a+l}},function(e,t,n){"use strict";var r=n(31),o=n(32),i=n(12);e.exports={formats:i,parse:o,stringify:r}},function(e,t,n){"use strict";function r(e){return(r="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}var o=n(6),i=n(12),a=Object.prototype.hasOwnProperty,l={brackets:function(e){return e+"[]"},comma:"comma",indices:function(e,t){return e+"["+t+"]"},repeat:function(e){return e}},u=Array.isArray,c=Array.prototype.push,s=function(e,t){c.apply(e,u(t)?t:[t])},f=Date.prototype.toISOString,p=i.default,d={addQueryPrefix:!1,allowDots:!1,charset:"utf-8",charsetSentinel:!1,delimiter:"&",encode:!0,encoder:o.encode,encodeValuesOnly:!1,format:p,formatter:i.formatters[p],indices:!1,serializeDate:function(e){return f.call(e)},skipNulls:!1,strictNullHandling:!1},m=function e(t,n,i,a,l,c,f,p,m,h,y,g,v){var b,w=t;if("function"==typeof f?w=f(n,w):w instanceof Date?w=h(w):"comma"===i&&u(w)&&(w=o.maybeMap(w,(function(e){return e instanceof Date?h(e):e})).join(",")),null===w){if(a)return c&&!g?c(n,d.encoder,v,"key"):n;w=""}if("string"==typeof(b=w)||"number"==typeof b||"boolean"==typeof b||"symbol"===r(b)||"bigint"==typeof b||o.isBuffer(w))return c?[y(g?n:c(n,d.encoder,v,"key"))+"="+y(c(w,d.encoder,v,"value"))]:[y(n)+"="+y(String(w))];var k,S=[];if(void 0===w)return S;if(u(f))k=f;else{var E=Object.keys(w);k=p?E.sort(p):E}for(var x=0;x<k.length;++x){var T=k[x],_=w[T];if(!l||null!==_){var C=u(w)?"function"==typeof i?i(n,T):n:n+(m?"."+T:"["+T+"]");s(S,e(_,C,i,a,l,c,f,p,m,h,y,g,v))}}return S};e.exports=function(e,t){var n,o=e,c=function(e){if(!e)return d;if(null!==e.encoder&&void 0!==e.encoder&&"function"!=typeof e.encoder)throw new TypeError("Encoder has to be a function.");var t=e.charset||d.charset;if(void 0!==e.charset&&"utf-8"!==e.charset&&"iso-8859-1"!==e.charset)throw new TypeError("The charset option must be either utf-8, iso-8859-1, or undefined");var n=i.default;if(void 0!==e.format){if(!a.call(i.formatters,e.format))throw new TypeError("Unknown format option provided.");n=e.format}var r=i.formatters[n],o=d.filter;return("function"==typeof e.filter||u(e.filter))&&(o=e.filter),{addQueryPrefix:"boolean"==typeof e.addQueryPrefix?e.addQueryPrefix:d.addQueryPrefix,allowDots:void 0===e.allowDots?d.allowDots:!!e.allowDots,charset:t,charsetSentinel:"boolean"==typeof e.charsetSentinel?e.charsetSentinel:d.charsetSentinel,delimiter:void 0===e.delimiter?d.delimiter:e.delimiter,encode:"boolean"==typeof e.encode?e.encode:d.encode,encoder:"function"==typeof e.encoder?e.encoder:d.encoder,encodeValuesOnly:"boolean"==typeof e.encodeValuesOnly?e.encodeValuesOnly:d.encodeValuesOnly,filter:o,formatter:r,serializeDate:"function"==typeof e.serializeDate?e.serializeDate:d.serializeDate,skipNulls:"boolean"==typeof e.skipNulls?e.skipNulls:d.skipNulls,sort:"function"==typeof e.sort?e.sort:null,strictNullHandling:"boolean"==typeof e.strictNullHandling?e.strictNullHandling:d.strictNullHandling}}(t);"function"==typeof c.filter?o=(0,c.filter)("",o):u(c.filter)&&(n=c.filter);var f,p=[];if("object"!==r(o)||null===o)return"";f=t&&t.arrayFormat in l?t.arrayFormat:t&&"indices"in t?t.indices?"indices":"repeat":"indices";var h=l[f];n||(n=Object.keys(o)),c.sort&&n.sort(c.sort);for(var y=0;y<n.length;++y){var g=n[y];c.skipNulls&&null===o[g]||s(p,m(o[g],g,h,c.strictNullHandling,c.skipNulls,c.encode?c.encoder:null,c.filter,c.sort,c.allowDots,c.serializeDate,c.formatter,c.encodeValuesOnly,c.charset))}var v=p.join(c.delimiter),b=!0===c.addQueryPrefix?"?":"";return c.charsetSentinel&&("iso-8859-1"===c.charset?b+="utf8=%26%2310003%3B&":b+="utf8=%E2%9C%93&"),v.length>0?b+v:""}},function(e,t,n){"use strict";var r=n(6),o=Object.prototype.hasOwnProperty,i=Array.isArray,a={allowDots:!1,allowPrototypes:!1,arrayLimit:20,charset:"utf-8",charsetSentinel:!1,comma:!1,decoder:r.decode,delimiter:"&",depth:5,ignoreQueryPrefix:!1,interpretNumericEntities:!1,parameterLimit:1e3,parseArrays:!0,plainObjects:!1,strictNullHandling:!1},l=function(e){return e.replace(/&#(\d+);/g,(function(e,t){return String.fromCharCode(parseInt(t,10))}))},u=function(e,t){return e&&"string"==typeof e&&t.comma&&e.indexOf(",")>-1?e.split(","):e},c=function(e,t,n,r){if(e){var i=n.allowDots?e.replace(/\.([^.[]+)/g,"[$1]"):e,a=/(\[[^[\]]*])/g,l=n.depth>0&&/(\[[^[\]]*])/.exec(i),c=l?i.slice(0,l.index):i,s=[];if(c){if(!n.plainObjects&&o.call(Object.prototype,c)&&!n.allowPrototypes)return;s.push(c)}for(var f=0;n.depth>0&&null!==(l=a.exec(i))&&f<n.depth;){if(f+=1,!n.plainObjects&&o.call(Object.prototype,l[1].slice(1,-1))&&!n.allowPrototypes)return;s.push(l[1])}return l&&s.push("["+i.slice(l.index)+"]"),function(e,t,n,r){for(var o=r?t:u(t,n),i=e.length-1;i>=0;--i){var a,l=e[i];if("[]"===l&&n.parseArrays)a=[].concat(o);else{a=n.plainObjects?Object.create(null):{};var c="["===l.charAt(0)&&"]"===l.charAt(l.length-1)?l.slice(1,-1):l,s=parseInt(c,10);n.parseArrays||""!==c?!isNaN(s)&&l!==c&&String(s)===c&&s>=0&&n.parseArrays&&s<=n.arrayLimit?(a=[])[s]=o:a[c]=o:a={0:o}}o=a}return o}(s,t,n,r)}};e.exports=function(e,t){var n=function(e){if(!e)return a;if(null!==e.decoder&&void 0!==e.decoder&&"function"!=typeof e.decoder)throw new TypeError("Decoder has to be a function.");if(void 0!==e.charset&&"utf-8"!==e.charset&&"iso-8859-1"!==e.charset)throw new TypeError("The charset option must be either utf-8, iso-8859-1, or undefined");var t=void 0===e.charset?a.charset:e.charset;return{allowDots:void 0===e.allowDots?a.allowDots:!!e.allowDots,allowPrototypes:"boolean"==typeof e.allowPrototypes?e.allowPrototypes:a.allowPrototypes,arrayLimit:"number"==typeof e.arrayLimit?e.arrayLimit:a.arrayLimit,charset:t,charsetSentinel:"boolean"==typeof e.charsetSentinel?e.charsetSentinel:a.charsetSentinel,comma:"boolean"==typeof e.comma?e.comma:a.comma,decoder:"function"==typeof e.decoder?e.decoder:a.decoder,delimiter:"string"==typeof e.delimiter||r.isRegExp(e.delimiter)?e.delimiter:a.delimiter,depth:"number"==typeof e.depth||!1===e.depth?+e.depth:a.depth,ignoreQueryPrefix:!0===e.ignoreQueryPrefix,interpretNumericEntities:"boolean"==typeof e.interpretNumericEntities?e.interpretNumericEntities:a.interpretNumericEntities,parameterLimit:"number"==typeof e.parameterLimit?e.parameterLimit:a.parameterLimit,parseArrays:!1!==e.parseArrays,plainObjects:"boolean"==typeof e.plainObjects?e.plainObjects:a.plainObjects,strictNullHandling:"boolean"==typeof e.strictNullHandling?e.strictNullHandling:a.strictNullHandling}}(t);if(""===e||null==e)return n.plainObjects?Object.create(null):{};for(var s="string"==typeof e?function(e,t){var n,c={},s=t.ignoreQueryPrefix?e.replace(/^\?/,""):e,f=t.parameterLimit===1/0?void 0:t.parameterLimit,p=s.split(t.delimiter,f),d=-1,m=t.charset;if(t.charsetSentinel)for(n=0;n<p.length;++n)0===p[n].indexOf("utf8=")&&("utf8=%E2%9C%93"===p[n]?m="utf-8":"utf8=%26%2310003%3B"===p[n]&&(m="iso-8859-1"),d=n,n=p.length);for(n=0;n<p.length;++n)if(n!==d){var h,y,g=p[n],v=g.indexOf("]="),b=-1===v?g.indexOf("="):v+1;-1===b?(h=t.decoder(g,a.decoder,m,"key"),y=t.strictNullHandling?null:""):(h=t.decoder(g.slice(0,b),a.decoder,m,"key"),y=r.maybeMap(u(g.slice(b+1),t),(function(e){return t.decoder(e,a.decoder,m,"value")}))),y&&t.interpretNumericEntities&&"iso-8859-1"===m&&(y=l(y)),g.indexOf("[]=")>-1&&(y=i(y)?[y]:y),o.call(c,h)?c[h]=r.combine(c[h],y):c[h]=y}return c}(e,n):e,f=n.plainObjects?Object.create(null):{},p=Object.keys(s),d=0;d<p.length;++d){var m=p[d],h=c(m,s[m],n,"string"==typeof e);f=r.merge(f,h,n)}return r.compact(f)}},function(e,t,n){var r=n(3),o=r.slice,i=r.pluck,a=r.each,l=r.bind,u=r.create,c=r.isList,s=r.isFunction,f=r.isObject;e.exports={createStore:d};var p={version:"2.0.12",enabled:!1,get:function(e,t){var n=this.storage.read(this._namespacePrefix+e);return this._deserialize(n,t)},set:function(e,t){return void 0===t?this.remove(e):(this.storage.write(this._namespacePrefix+e,this._serialize(t)),t)},remove:function(e){this.storage.remove(this._namespacePrefix+e)},each:function(e){var t=this;this.storage.each((function(n,r){e.call(t,t._deserialize(n),(r||"").replace(t._namespaceRegexp,""))}))},clearAll:function(){this.storage.clearAll()},hasNamespace:function(e){return this._namespacePrefix=="__storejs_"+e+"_"},createStore:function(){return d.apply(this,arguments)},addPlugin:function(e){this._addPlugin(e)},namespace:function(e){return d(this.storage,this.plugins,e)}};function d(e,t,n){n||(n=""),e&&!c(e)&&(e=[e]),t&&!c(t)&&(t=[t]);var r=n?"__storejs_"+n+"_":"",d=n?new RegExp("^"+r):null;if(!/^[a-zA-Z0-9_\-]*$/.test(n))throw new Error("store.js namespaces can only have alphanumerics + underscores and dashes");var m=u({_namespacePrefix:r,_namespaceRegexp:d,_testStorage:function(e){try{var t="__storejs__test__";e.write(t,t);var n=e.read(t)===t;return e.remove(t),n}catch(e){return!1}},_assignPluginFnProp:function(e,t){var n=this[t];this[t]=function(){var t=o(arguments,0),r=this;function i(){if(n)return a(arguments,(function(e,n){t[n]=e})),n.apply(r,t)}var l=[i].concat(t);return e.apply(r,l)}},_serialize:function(e){return JSON.stringify(e)},_deserialize:function(e,t){if(!e)return t;var n="";try{n=JSON.parse(e)}catch(t){n=e}return void 0!==n?n:t},_addStorage:function(e){this.enabled||this._testStorage(e)&&(this.storage=e,this.enabled=!0)},_addPlugin:function(e){var t=this;if(c(e))a(e,(function(e){t._addPlugin(e)}));else if(!i(this.plugins,(function(t){return e===t}))){if(this.plugins.push(e),!s(e))throw new Error("Plugins must be function values that return objects");var n=e.call(this);if(!f(n))throw new Error("Plugins must return an object of function properties");a(n,(function(n,r){if(!s(n))throw new Error("Bad plugin property: "+r+" from plugin "+e.name+". Plugins should only return functions.");t._assignPluginFnProp(n,r)}))}},addStorage:function(e){!function(){var e="undefined"==typeof console?null:console;if(e){var t=e.warn?e.warn:e.log;t.apply(e,arguments)}}("store.addStorage(storage) is deprecated. Use createStore([storages])"),this._addStorage(e)}},p,{plugins:[]});return m.raw={},a(m,(function(e,t){s(e)&&(m.raw[t]=l(m,e))})),a(e,(function(e){m._addStorage(e)})),a(t,(function(e){m._addPlugin(e)})),m}},function(e,t,n){e.exports=[n(35),n(36),n(37),n(38),n(39),n(40)]},function(e,t,n){var r=n(3).Global;function o(){return r.localStorage}function i(e){return o().getItem(e)}e.exports={name:"localStorage",read:i,write:function(e,t){return o().setItem(e,t)},each:function(e){for(var t=o().length-1;t>=0;t--){var n=o().key(t);e(i(n),n)}},remove:function(e){return o().removeItem(e)},clearAll:function(){return o().clear()}}},function(e,t,n){var r=n(3).Global;e.exports={name:"oldFF-globalStorage",read:function(e){return o[e]},write:function(e,t){o[e]=t},each:i,remove:function(e){return o.removeItem(e)},clearAll:function(){i((function(e,t){delete o[e]}))}};var o=r.globalStorage;function i(e){for(var t=o.length-1;t>=0;t--){var n=o.key(t);e(o[n],n)}}},function(e,t,n){var r=n(3).Global;e.exports={name:"oldIE-userDataStorage",write:function(e,t){if(a)return;var n=u(e);i((function(e){e.setAttribute(n,t),e.save("storejs")}))},read:function(e){if(a)return;var t=u(e),n=null;return i((function(e){n=e.getAttribute(t)})),n},each:function(e){i((function(t){for(var n=t.XMLDocument.documentElement.attributes,r=n.length-1;r>=0;r--){var o=n[r];e(t.getAttribute(o.name),o.name)}}))},remove:function(e){var t=u(e);i((function(e){e.removeAttribute(t),e.save("storejs")}))},clearAll:function(){i((function(e){var t=e.XMLDocument.documentElement.attributes;e.load("storejs");for(var n=t.length-1;n>=0;n--)e.removeAttribute(t[n].name);e.save("storejs")}))}};var o=r.document,i=function(){if(!o||!o.documentElement||!o.documentElement.addBehavior)return null;var e,t,n;try{(t=new ActiveXObject("htmlfile")).open(),t.write('<script>document.w=window<\/script><iframe src="/favicon.ico"></iframe>'),t.close(),e=t.w.frames[0].document,n=e.createElement("div")}catch(t){n=o.createElement("div"),e=o.body}return function(t){var r=[].slice.call(arguments,0);r.unshift(n),e.appendChild(n),n.addBehavior("#default#userData"),n.load("storejs"),t.apply(this,r),e.removeChild(n)}}(),a=(r.navigator?r.navigator.userAgent:"").match(/ (MSIE 8|MSIE 9|MSIE 10)\./);var l=new RegExp("[!\"#$%&'()*+,/\\\\:;<=>?@[\\]^`{|}~]","g");function u(e){return e.replace(/^\d/,"___$&").replace(l,"___")}},function(e,t,n){var r=n(3),o=r.Global,i=r.trim;e.exports={name:"cookieStorage",read:function(e){if(!e||!c(e))return null;var t="(?:^|.*;\\s*)"+escape(e).replace(/[\-\.\+\*]/g,"\\$&")+"\\s*\\=\\s*((?:[^;](?!;))*[^;]?).*";return unescape(a.cookie.replace(new RegExp(t),"$1"))},write:function(e,t){if(!e)return;a.cookie=escape(e)+"="+escape(t)+"; expires=Tue, 19 Jan 2038 03:14:07 GMT; path=/"},each:l,remove:u,clearAll:function(){l((function(e,t){u(t)}))}};var a=o.document;function l(e){for(var t=a.cookie.split(/; ?/g),n=t.length-1;n>=0;n--)if(i(t[n])){var r=t[n].split("="),o=unescape(r[0]);e(unescape(r[1]),o)}}function u(e){e&&c(e)&&(a.cookie=escape(e)+"=; expires=Thu, 01 Jan 1970 00:00:00 GMT; path=/")}function c(e){return new RegExp("(?:^|;\\s*)"+escape(e).replace(/[\-\.\+\*]/g,"\\$&")+"\\s*\\=").test(a.cookie)}},function(e,t,n){var r=n(3).Global;function o(){return r.sessionStorage}function i(e){return o().getItem(e)}e.exports={name:"sessionStorage",read:i,write:function(e,t){return o().setItem(e,t)},each:function(e){for(var t=o().length-1;t>=0;t--){var n=o().key(t);e(i(n),n)}},remove:function(e){return o().removeItem(e)},clearAll:function(){return o().clear()}}},function(e,t){e.exports={name:"memoryStorage",read:function(e){return n[e]},write:function(e,t){n[e]=t},each:function(e){for(var t in n)n.hasOwnProperty(t)&&e(n[t],t)},remove:function(e){delete n[e]},clearAll:function(e){n={}}};var n={}},function(e,t,n){e.exports=function(){return n(42),{}}},function(module,exports){function _typeof(e){return(_typeof="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}"object"!==("undefined"==typeof JSON?"undefined":_typeof(JSON))&&(JSON={}),function(){"use strict";var rx_one=/^[\],:{}\s]*$/,rx_two=/\\(?:["\\\/bfnrt]|u[0-9a-fA-F]{4})/g,rx_three=/"[^"\\\n\r]*"|true|false|null|-?\d+(?:\.\d*)?(?:[eE][+\-]?\d+)?/g,rx_four=/(?:^|:|,)(?:\s*\[)+/g,rx_escapable=/[\\"\u0000-\u001f\u007f-\u009f\u00ad\u0600-\u0604\u070f\u17b4\u17b5\u200c-\u200f\u2028-\u202f\u2060-\u206f\ufeff\ufff0-\uffff]/g,rx_dangerous=/[\u0000\u00ad\u0600-\u0604\u070f\u17b4\u17b5\u200c-\u200f\u2028-\u202f\u2060-\u206f\ufeff\ufff0-\uffff]/g,gap,indent,meta,rep;function f(e){return e<10?"0"+e:e}function this_value(){return this.valueOf()}function quote(e){return rx_escapable.lastIndex=0,rx_escapable.test(e)?'"'+e.replace(rx_escapable,(function(e){var t=meta[e];return"string"==typeof t?t:"\\u"+("0000"+e.charCodeAt(0).toString(16)).slice(-4)}))+'"':'"'+e+'"'}function str(e,t){var n,r,o,i,a,l=gap,u=t[e];switch(u&&"object"===_typeof(u)&&"function"==typeof u.toJSON&&(u=u.toJSON(e)),"function"==typeof rep&&(u=rep.call(t,e,u)),_typeof(u)){case"string":return quote(u);case"number":return isFinite(u)?String(u):"null";case"boolean":case"null":return String(u);case"object":if(!u)return"null";if(gap+=indent,a=[],"[object Array]"===Object.prototype.toString.apply(u)){for(i=u.length,n=0;n<i;n+=1)a[n]=str(n,u)||"null";return o=0===a.length?"[]":gap?"[\n"+gap+a.join(",\n"+gap)+"\n"+l+"]":"["+a.join(",")+"]",gap=l,o}if(rep&&"object"===_typeof(rep))for(i=rep.length,n=0;n<i;n+=1)"string"==typeof rep[n]&&(o=str(r=rep[n],u))&&a.push(quote(r)+(gap?": ":":")+o);else for(r in u)Object.prototype.hasOwnProperty.call(u,r)&&(o=str(r,u))&&a.push(quote(r)+(gap?": ":":")+o);return o=0===a.length?"{}":gap?"{\n"+gap+a.join(",\n"+gap)+"\n"+l+"}":"{"+a.join(",")+"}",gap=l,o}}"function"!=typeof Date.prototype.toJSON&&(Date.prototype.toJSON=function(){return isFinite(this.valueOf())?this.getUTCFullYear()+"-"+f(this.getUTCMonth()+1)+"-"+f(this.getUTCDate())+"T"+f(this.getUTCHours())+":"+f(this.getUTCMinutes())+":"+f(this.getUTCSeconds())+"Z":null},Boolean.prototype.toJSON=this_value,Number.prototype.toJSON=this_value,String.prototype.toJSON=this_value),"function"!=typeof JSON.stringify&&(meta={"\b":"\\b","\t":"\\t","\n":"\\n","\f":"\\f","\r":"\\r",'"':'\\"',"\\":"\\\\"},JSON.stringify=function(e,t,n){var r;if(gap="",indent="","number"==typeof n)for(r=0;r<n;r+=1)indent+=" ";else"string"==typeof n&&(indent=n);if(rep=t,t&&"function"!=typeof t&&("object"!==_typeof(t)||"number"!=typeof t.length))throw new Error("JSON.stringify");return str("",{"":e})}),"function"!=typeof JSON.parse&&(JSON.parse=function(text,reviver){var j;function walk(e,t){var n,r,o=e[t];if(o&&"object"===_typeof(o))for(n in o)Object.prototype.hasOwnProperty.call(o,n)&&(void 0!==(r=walk(o,n))?o[n]=r:delete o[n]);return reviver.call(e,t,o)}if(text=String(text),rx_dangerous.lastIndex=0,rx_dangerous.test(text)&&(text=text.replace(rx_dangerous,(function(e){return"\\u"+("0000"+e.charCodeAt(0).toString(16)).slice(-4)}))),rx_one.test(text.replace(rx_two,"@").replace(rx_three,"]").replace(rx_four,"")))return j=eval("("+text+")"),"function"==typeof reviver?walk({"":j},""):j;throw new SyntaxError("JSON.parse")})}()},function(e,t,n){"use strict";var r=n(44);function o(){}function i(){}i.resetWarningCache=o,e.exports=function(){function e(e,t,n,o,i,a){if(a!==r){var l=new Error("Calling PropTypes validators directly is not supported by the `prop-types` package. Use PropTypes.checkPropTypes() to call them. Read more at http://fb.me/use-check-prop-types");throw l.name="Invariant Violation",l}}function t(){return e}e.isRequired=e;var n={array:e,bool:e,func:e,number:e,object:e,string:e,symbol:e,any:e,arrayOf:t,element:e,elementType:e,instanceOf:t,node:e,objectOf:t,oneOf:t,oneOfType:t,shape:t,exact:t,checkPropTypes:i,resetWarningCache:o};return n.PropTypes=n,n}},function(e,t,n){"use strict";e.exports="SECRET_DO_NOT_PASS_THIS_OR_YOU_WILL_BE_FIRED"},function(e,t,n){"use strict";function r(e){return(r="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}Object.defineProperty(t,"__esModule",{value:!0}),t.CopyToClipboard=void 0;var o=a(n(0)),i=a(n(46));function a(e){return e&&e.__esModule?e:{default:e}}function l(e){return(l="function"==typeof Symbol&&"symbol"===r(Symbol.iterator)?function(e){return r(e)}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":r(e)})(e)}function u(e,t){var n=Object.keys(e);if(Object.getOwnPropertySymbols){var r=Object.getOwnPropertySymbols(e);t&&(r=r.filter((function(t){return Object.getOwnPropertyDescriptor(e,t).enumerable}))),n.push.apply(n,r)}return n}function c(e,t){if(null==e)return{};var n,r,o=function(e,t){if(null==e)return{};var n,r,o={},i=Object.keys(e);for(r=0;r<i.length;r++)n=i[r],t.indexOf(n)>=0||(o[n]=e[n]);return o}(e,t);if(Object.getOwnPropertySymbols){var i=Object.getOwnPropertySymbols(e);for(r=0;r<i.length;r++)n=i[r],t.indexOf(n)>=0||Object.prototype.propertyIsEnumerable.call(e,n)&&(o[n]=e[n])}return o}function s(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function f(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function p(e,t){return!t||"object"!==l(t)&&"function"!=typeof t?m(e):t}function d(e){return(d=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function m(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function h(e,t){return(h=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function y(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}var g=function(e){function t(){var e,n;s(this,t);for(var r=arguments.length,a=new Array(r),l=0;l<r;l++)a[l]=arguments[l];return y(m(n=p(this,(e=d(t)).call.apply(e,[this].concat(a)))),"onClick",(function(e){var t=n.props,r=t.text,a=t.onCopy,l=t.children,u=t.options,c=o.default.Children.only(l),s=(0,i.default)(r,u);a&&a(r,s),c&&c.props&&"function"==typeof c.props.onClick&&c.props.onClick(e)})),n}var n,r,a;return function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&h(e,t)}(t,e),n=t,(r=[{key:"render",value:function(){var e=this.props,t=(e.text,e.onCopy,e.options,e.children),n=c(e,["text","onCopy","options","children"]),r=o.default.Children.only(t);return o.default.cloneElement(r,function(e){for(var t=1;t<arguments.length;t++){var n=null!=arguments[t]?arguments[t]:{};t%2?u(n,!0).forEach((function(t){y(e,t,n[t])})):Object.getOwnPropertyDescriptors?Object.defineProperties(e,Object.getOwnPropertyDescriptors(n)):u(n).forEach((function(t){Object.defineProperty(e,t,Object.getOwnPropertyDescriptor(n,t))}))}return e}({},n,{onClick:this.onClick}))}}])&&f(n.prototype,r),a&&f(n,a),t}(o.default.PureComponent);t.CopyToClipboard=g,y(g,"defaultProps",{onCopy:void 0,options:void 0})},function(e,t,n){"use strict";var r=n(47),o={"text/plain":"Text","text/html":"Url",default:"Text"};e.exports=function(e,t){var n,i,a,l,u,c,s=!1;t||(t={}),n=t.debug||!1;try{if(a=r(),l=document.createRange(),u=document.getSelection(),(c=document.createElement("span")).textContent=e,c.style.all="unset",c.style.position="fixed",c.style.top=0,c.style.clip="rect(0, 0, 0, 0)",c.style.whiteSpace="pre",c.style.webkitUserSelect="text",c.style.MozUserSelect="text",c.style.msUserSelect="text",c.style.userSelect="text",c.addEventListener("copy",(function(r){if(r.stopPropagation(),t.format)if(r.preventDefault(),void 0===r.clipboardData){n&&console.warn("unable to use e.clipboardData"),n&&console.warn("trying IE specific stuff"),window.clipboardData.clearData();var i=o[t.format]||o.default;window.clipboardData.setData(i,e)}else r.clipboardData.clearData(),r.clipboardData.setData(t.format,e);t.onCopy&&(r.preventDefault(),t.onCopy(r.clipboardData))})),document.body.appendChild(c),l.selectNodeContents(c),u.addRange(l),!document.execCommand("copy"))throw new Error("copy command was unsuccessful");s=!0}catch(r){n&&console.error("unable to copy using execCommand: ",r),n&&console.warn("trying IE specific stuff");try{window.clipboardData.setData(t.format||"text",e),t.onCopy&&t.onCopy(window.clipboardData),s=!0}catch(r){n&&console.error("unable to copy using clipboardData: ",r),n&&console.error("falling back to prompt"),i=function(e){var t=(/mac os x/i.test(navigator.userAgent)?"⌘":"Ctrl")+"+C";return e.replace(/#{\s*key\s*}/g,t)}("message"in t?t.message:"Copy to clipboard: #{key}, Enter"),window.prompt(i,e)}}finally{u&&("function"==typeof u.removeRange?u.removeRange(l):u.removeAllRanges()),c&&document.body.removeChild(c),a()}return s}},function(e,t){e.exports=function(){var e=document.getSelection();if(!e.rangeCount)return function(){};for(var t=document.activeElement,n=[],r=0;r<e.rangeCount;r++)n.push(e.getRangeAt(r));switch(t.tagName.toUpperCase()){case"INPUT":case"TEXTAREA":t.blur();break;default:t=null}return e.removeAllRanges(),function(){"Caret"===e.type&&e.removeAllRanges(),e.rangeCount||n.forEach((function(t){e.addRange(t)})),t&&t.focus()}}},function(e,t,n){"use strict";n.r(t);var r=n(0),o=n.n(r),i=n(14),a=n.n(i),l=n(5),u=n.n(l),c=n(7),s=n.n(c);function f(e){return"round-"+e.id.toString()}var p=n(4),d=n.n(p);function m(e){var t,n,r,i,a=e.rounds,l=e.settings;return t=function(e,t){for(var n=[],r=0;r<t.length;r++)n.push(t[r]),r!==t.length-1&&n.push(e);return n}(" | ",a.map((function(e){var t="#"+f(e),n="shortcut-"+e.id.toString();return o.a.createElement("a",{key:n,href:t},"R",e.number)}))),l.slack&&(n=o.a.createElement("span",{className:d()({"messaging-logo":!0,broken:!l.service_status.slack})},o.a.createElement("img",{className:"messaging-logo",src:"/static/Slack_Mark_Web.png",alt:"Slack"}))),l.discord&&(r=o.a.createElement("span",{className:d()({"messaging-logo":!0,broken:!l.service_status.discord})},o.a.createElement("img",{className:"messaging-logo",src:"/static/Discord-Logo-Color.png",alt:"Discord"}))),l.gapps&&(i=o.a.createElement("span",{className:d()({"messaging-logo":!0,broken:!l.service_status.gapps})},o.a.createElement("img",{className:"messaging-logo",src:"/static/sheets_64dp.png",alt:"Google Sheets"}))),o.a.createElement("div",{className:"row"},o.a.createElement("div",{className:"col-lg-12"},o.a.createElement("div",{className:"shortcuts"},"Hop to: ",t,o.a.createElement("div",{className:"integration-status"},"Integrations:",n,r,i))))}var h=n(1),y=n.n(h);function g(e){return(g="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function v(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function b(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function w(e,t){return(w=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function k(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=x(e);if(t){var o=x(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return S(this,n)}}function S(e,t){return!t||"object"!==g(t)&&"function"!=typeof t?E(e):t}function E(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function x(e){return(x=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function T(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}var _=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&w(e,t)}(a,e);var t,n,r,i=k(a);function a(){var e;v(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return T(E(e=i.call.apply(i,[this].concat(n))),"searchFilter",o.a.createRef()),T(E(e),"updateFilter",(function(t){e.props.updateFulltextFilter(t.target.value)})),e}return t=a,(n=[{key:"componentDidMount",value:function(){this.focus()}},{key:"render",value:function(){return o.a.createElement("div",{className:"filters"},o.a.createElement("h4",null,"Filter by:"),o.a.createElement("div",null,o.a.createElement("label",null,o.a.createElement("input",{type:"search",ref:this.searchFilter,placeholder:"Search...",onChange:this.updateFilter}),"Tag or puzzle name")),o.a.createElement("div",null,o.a.createElement("label",null,o.a.createElement("input",{type:"checkbox",onChange:this.props.updateAnswerFilter}),"Unsolved")),o.a.createElement("div",null,o.a.createElement("label",null,o.a.createElement("input",{type:"checkbox",checked:this.props.uiSettings.app_links,onChange:this.props.toggleLinkType}),"Use app links")))}},{key:"focus",value:function(){this.searchFilter.current.focus()}}])&&b(t.prototype,n),r&&b(t,r),a}(o.a.Component);_.propTypes={updateFulltextFilter:y.a.func.isRequired,updateAnswerFilter:y.a.func.isRequired,toggleLinkType:y.a.func.isRequired,uiSettings:y.a.object.isRequired};var C=n(15),P=12e4;function O(e){var t=e.className,n=e.activity,r=n.channelCount,i=n.channelActive,a=n.activityHisto,l=n.lastActive,u=new Date,c=function(e,t,n){var r=Math.floor(n/P)-Math.floor(t/P);if(r>=60)return;for(var o=[],i=r,a=i+6,l=60+r;i<l;i=a,a+=6){var u=parseInt(e.substring(i>>2,-(-a>>2)),16);a<60&&(u>>=3&a),u&=63,o.push(N(u))}return o}(a,l,u),s=0===i.length?"invisible":"",f=i.join(", ");return o.a.createElement("div",{className:t},o.a.createElement("span",{className:"allMembers"},j(r),o.a.createElement("span",{className:"glyphicon glyphicon-user","aria-hidden":"true"}))," ",o.a.createElement("span",{className:"activeMembers ".concat(s),title:f},j(i.length),o.a.createElement("span",{className:"glyphicon glyphicon-user","aria-hidden":"true"}))," ",c&&o.a.createElement(R,{data:c,max:6,width:30,height:13})," ",l<=0?"never":function(e){if(e<6e4){var t=Math.floor(e/1e3);return"".concat(t,"s ago")}if(e<36e5){var n=Math.floor(e/6e4);return"".concat(n,"m ago")}if(e<864e5){var r=Math.floor(e/36e5),o=Math.floor(e%36e5/6e4);return"".concat(r,"h").concat(o>0?" ".concat(o,"m"):""," ago")}var i=Math.floor(e/864e5),a=Math.floor(e%864e5/36e5);return"".concat(i,"d").concat(a>0?" ".concat(a,"h"):""," ago")}(u-l))}function N(e){var t;for(t=0;e;t++)e&=e-1;return t}function j(e){return e<10?" "+e:e}function R(e){var t=e.data,n=e.max,r=e.width,i=e.height,a=r/t.length,l=(i-1)/n;return o.a.createElement("svg",{width:r,height:i},o.a.createElement("g",{fill:"currentColor"},o.a.createElement("rect",{x:0,y:i-1,width:r,height:1}),t.map((function(e,t){return o.a.createElement("rect",{key:t,x:t*a,y:i-e*l,width:a,height:e*l})}))))}function z(e){return(z="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function D(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function M(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function F(e,t){return(F=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function A(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=U(e);if(t){var o=U(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return I(this,n)}}function I(e,t){return!t||"object"!==z(t)&&"function"!=typeof t?L(e):t}function L(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function U(e){return(U=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function V(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}var W=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&F(e,t)}(a,e);var t,n,r,i=A(a);function a(){var e;D(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return V(L(e=i.call.apply(i,[this].concat(n))),"modalBox",o.a.createRef()),V(L(e),"handleWrapperClick",(function(t){var n=e.modalBox.current;n&&!n.contains(t.target)&&e.props.closeCallback()})),e}return t=a,(n=[{key:"render",value:function(){return o.a.createElement("div",{className:"modal",onClick:this.handleWrapperClick},o.a.createElement("div",{ref:this.modalBox},o.a.createElement("button",{className:"close-button",onClick:this.props.closeCallback},"x"),this.props.children))}}])&&M(t.prototype,n),r&&M(t,r),a}(o.a.Component);W.propTypes={closeCallback:y.a.func.isRequired};var q,B=y.a.shape({id:y.a.number.isRequired,number:y.a.number,answer:y.a.string.isRequired,is_meta:y.a.bool.isRequired,tags:y.a.string.isRequired,name:y.a.string.isRequired,note:y.a.string.isRequired}),H=y.a.shape({id:y.a.number.isRequired,number:y.a.number,name:y.a.string.isRequired,puzzle_set:y.a.arrayOf(B).isRequired});function Q(e){return(Q="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function $(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function K(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function X(e,t){return(X=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function Y(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=Z(e);if(t){var o=Z(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return J(this,n)}}function J(e,t){return!t||"object"!==Q(t)&&"function"!=typeof t?G(e):t}function G(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function Z(e){return(Z=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function ee(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}var te=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&X(e,t)}(a,e);var t,n,r,i=Y(a);function a(){var e;$(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return ee(G(e=i.call.apply(i,[this].concat(n))),"handleClose",(function(){q&&q.close(),e.props.closeCallback()})),e}return t=a,(n=[{key:"componentDidMount",value:function(){var e=this;"granted"===Notification.permission&&((q=new Notification("We solved puzzle "+this.props.puzzle.name+"!",{body:"In round "+this.props.roundNumber+": "+this.props.roundName+". Answer: "+this.props.puzzle.answer.toUpperCase(),tag:this.props.puzzle.name})).onclick=function(){window.focus(),e.props.closeCallback(),q.close()})}},{key:"render",value:function(){return o.a.createElement(W,{closeCallback:this.handleClose},o.a.createElement("div",{className:"celebration"},o.a.createElement("audio",{src:"/static/YannickLemieux-applause.mp3",autoPlay:!0}),o.a.createElement("h1",null,this.props.puzzle.name," SOLVED!!!"),o.a.createElement("p",null,"in round ",this.props.roundNumber,": ",this.props.roundName),o.a.createElement("h2",null,"Answer: ",o.a.createElement("span",{className:"answer"},this.props.puzzle.answer))))}}])&&K(t.prototype,n),r&&K(t,r),a}(o.a.Component);function ne(e){return(ne="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function re(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function oe(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function ie(e,t){return(ie=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function ae(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=ce(e);if(t){var o=ce(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return le(this,n)}}function le(e,t){return!t||"object"!==ne(t)&&"function"!=typeof t?ue(e):t}function ue(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function ce(e){return(ce=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function se(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}te.propTypes={puzzle:B.isRequired,roundName:y.a.string,roundNumber:y.a.number,closeCallback:y.a.func.isRequired};var fe=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&ie(e,t)}(a,e);var t,n,r,i=ae(a);function a(){var e;re(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return se(ue(e=i.call.apply(i,[this].concat(n))),"state",{newVal:void 0,editable:!1}),se(ue(e),"editableComponent",o.a.createRef()),se(ue(e),"editInput",o.a.createRef()),se(ue(e),"handleDocumentClick",(function(t){var n=e.editableComponent.current,r=t.target;!e.state.editable||n&&n.contains(r)||e.setState({editable:!1})})),se(ue(e),"editElement",(function(){e.setState({editable:!0},e.focus)})),se(ue(e),"onSubmit",(function(t){t.preventDefault();e.editInput.current.value!==e.props.val&&e.props.onSubmit(e.editInput.current.value),e.setState({editable:!1})})),se(ue(e),"focus",(function(){e.editInput.current.focus()})),e}return t=a,(n=[{key:"componentDidMount",value:function(){document.addEventListener("click",this.handleDocumentClick)}},{key:"componentWillUnmount",value:function(){document.removeEventListener("click",this.handleDocumentClick)}},{key:"render",value:function(){var e;return e=this.state.editable?o.a.createElement("form",{onSubmit:this.onSubmit},o.a.createElement("input",{ref:this.editInput,type:"text",defaultValue:this.props.val})):o.a.createElement("span",{title:this.props.val},this.props.val," "),o.a.createElement("div",{ref:this.editableComponent,className:this.props.className,onClick:this.editElement},e)}}])&&oe(t.prototype,n),r&&oe(t,r),a}(o.a.Component);function pe(e){return(pe="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function de(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function me(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function he(e,t){return(he=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function ye(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=be(e);if(t){var o=be(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return ge(this,n)}}function ge(e,t){return!t||"object"!==pe(t)&&"function"!=typeof t?ve(e):t}function ve(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function be(e){return(be=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function we(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}fe.propTypes={className:y.a.string,val:y.a.string,onSubmit:y.a.func.isRequired};var ke=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&he(e,t)}(a,e);var t,n,r,i=ye(a);function a(){var e;de(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return we(ve(e=i.call.apply(i,[this].concat(n))),"state",{newUrl:e.props.puzzle.url}),we(ve(e),"handleChange",(function(t){e.setState({newUrl:t.target.value})})),we(ve(e),"handleSubmit",(function(t){t.preventDefault(),e.state.newUrl&&e.props.actionCallback(e.state.newUrl),e.props.closeCallback()})),e}return t=a,(n=[{key:"render",value:function(){return o.a.createElement(W,{closeCallback:this.props.closeCallback},o.a.createElement("div",{className:"url-editor"},o.a.createElement("h3",null,"URL where puzzle ",this.props.puzzle.name," is being worked on:"),o.a.createElement("form",{onSubmit:this.handleSubmit},o.a.createElement("input",{type:"url",name:"newUrl",value:this.state.newUrl,onChange:this.handleChange}),o.a.createElement("input",{type:"submit"}))))}}])&&me(t.prototype,n),r&&me(t,r),a}(o.a.Component);function Se(e){return(Se="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function Ee(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function xe(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function Te(e,t){return(Te=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function _e(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=Oe(e);if(t){var o=Oe(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return Ce(this,n)}}function Ce(e,t){return!t||"object"!==Se(t)&&"function"!=typeof t?Pe(e):t}function Pe(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function Oe(e){return(Oe=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function Ne(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}ke.propTypes={puzzle:B.isRequired,actionCallback:y.a.func.isRequired,closeCallback:y.a.func.isRequired};var je=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&Te(e,t)}(a,e);var t,n,r,i=_e(a);function a(){var e;Ee(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return Ne(Pe(e=i.call.apply(i,[this].concat(n))),"state",{celebrating:!1,changingUrl:!1}),Ne(Pe(e),"updateUrl",(function(t){e.updateData("url",t)})),Ne(Pe(e),"updateAnswer",(function(t){e.updateData("answer",t)})),Ne(Pe(e),"updateNote",(function(t){e.updateData("note",t)})),Ne(Pe(e),"updateTags",(function(t){e.updateData("tags",t)})),Ne(Pe(e),"stopCelebrating",(function(){e.state.celebrating&&e.setState({celebrating:!1})})),Ne(Pe(e),"closeUrlModal",(function(){e.setState({changingUrl:!1})})),e}return t=a,(n=[{key:"componentDidUpdate",value:function(e){this.props.puzzle.answer&&this.props.puzzle.answer!==e.puzzle.answer?this.state.celebrating||this.setState({celebrating:!0}):""===this.props.puzzle.answer&&this.stopCelebrating()}},{key:"render",value:function(){var e,t,n,r,i,a,l,u=this.props.puzzle,c=d()({"col-lg-12":!0,puzzle:!0,meta:u.is_meta,solved:u.answer});return this.state.celebrating&&(e=o.a.createElement(te,{puzzle:u,roundNumber:this.props.parent.number,roundName:this.props.parent.name,closeCallback:this.stopCelebrating})),this.state.changingUrl&&(t=o.a.createElement(ke,{puzzle:u,actionCallback:this.updateUrl,closeCallback:this.closeUrlModal})),n=u.hunt_url?o.a.createElement("a",{className:"button",title:"View puzzle on hunt website",href:u.hunt_url,target:"_blank",rel:"noopener"},o.a.createElement("span",{className:"glyphicon glyphicon-share-alt"})):o.a.createElement("span",{className:"missing-button"}),this.props.settings.slack&&(i=this.props.uiSettings.app_links?u.slack_channel_id?"slack://channel?team=T0ESH0TS5&id=".concat(u.slack_channel_id):"https://ireproof.slack.com/app_redirect?channel=".concat(u.slug):"https://ireproof.slack.com/messages/".concat(u.slug),r=o.a.createElement("a",{title:"#".concat(u.slug),href:i,target:"_blank",rel:"noopener"},o.a.createElement("img",{className:"messaging-logo",src:"/static/Slack_Mark_Web.png",alt:"Slack"}))),this.props.settings.discord&&(a=this.props.settings.profile.discord_identifier?o.a.createElement("a",{title:"#".concat(u.slug),href:"/disc/".concat(u.id,"/").concat(Number(this.props.uiSettings.app_links)),target:"_blank",rel:"noopener"},o.a.createElement("img",{className:"messaging-logo",src:"/static/Discord-Logo-Color.png",alt:"Discord"})):o.a.createElement(C.CopyToClipboard,{text:"hb!join ".concat(u.slug)},o.a.createElement("img",{className:"messaging-logo",src:"/static/Discord-Logo-Color.png",alt:"Discord",title:"Click to copy!"}))),this.props.settings.gapps&&(l=o.a.createElement("a",{title:"#".concat(u.slug),href:"/s/".concat(u.id),target:"_blank",rel:"noopener"},o.a.createElement("img",{className:"messaging-logo",src:"/static/sheets_64dp.png",alt:"Google Sheets"}))),o.a.createElement("div",{key:u.id,className:"row"},o.a.createElement("div",{className:"col-lg-12"},e,t,o.a.createElement("div",{className:c},o.a.createElement("div",{className:"row"},o.a.createElement("div",{className:"col-xs-6 col-sm-6 col-md-4 col-lg-3 name"},n,r,a,l,o.a.createElement("span",{className:"name-text"},u.name)),o.a.createElement(fe,{className:"col-xs-6 col-sm-3 col-md-3 col-lg-2 answer editable",val:u.answer,onSubmit:this.updateAnswer}),o.a.createElement(fe,{className:"visible-md visible-lg col-md-3 col-lg-3 note editable",val:u.note,onSubmit:this.updateNote}),o.a.createElement(fe,{className:"hidden-xs col-sm-3 col-md-2 col-lg-2 tags editable",val:u.tags,onSubmit:this.updateTags}),o.a.createElement(O,{className:"visible-lg-block col-lg-2 activity",activity:{channelCount:u.channel_count,channelActive:u.channel_active,activityHisto:u.activity_histo,lastActive:new Date(u.last_active)}})))))}},{key:"showPuzzleUrlModal",value:function(){this.setState({changingUrl:!0})}},{key:"updateData",value:function(e,t){var n={};n[e]=t,u()("POST","/puzzles/"+this.props.puzzle.id.toString()+"/",{body:JSON.stringify(n),headers:{"X-CSRFToken":csrfToken}}).done(function(e){this.props.changeMade&&this.props.changeMade()}.bind(this))}}])&&xe(t.prototype,n),r&&xe(t,r),a}(o.a.Component);function Re(e){return(Re="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function ze(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function De(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function Me(e,t){return(Me=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function Fe(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=Le(e);if(t){var o=Le(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return Ae(this,n)}}function Ae(e,t){return!t||"object"!==Re(t)&&"function"!=typeof t?Ie(e):t}function Ie(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function Le(e){return(Le=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function Ue(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}je.propTypes={puzzle:y.a.object.isRequired,parent:y.a.object,changeMade:y.a.func,settings:y.a.object,uiSettings:y.a.object};var Ve=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&Me(e,t)}(a,e);var t,n,r,i=Fe(a);function a(){var e;ze(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return Ue(Ie(e=i.call.apply(i,[this].concat(n))),"state",{show:!0}),Ue(Ie(e),"changeMade",(function(){e.props.changeMade&&e.props.changeMade()})),Ue(Ie(e),"onCaretClick",(function(t){t.preventDefault(),e.setState({show:!e.state.show||!1})})),e}return t=a,(n=[{key:"componentDidMount",value:function(){this.allSolved()&&this.setState({show:!1})}},{key:"componentDidUpdate",value:function(e){!this.allSolved(e.round.puzzle_set)&&this.allSolved()&&this.setState({show:!1})}},{key:"render",value:function(){var e=this,t=this.props.round,n=f(t),r=this.getFilteredPuzzles();if(r.length<=0)return o.a.createElement("div",{key:t.id,className:"row"});var i=r.map((function(n){return o.a.createElement(je,{key:n.id,puzzle:n,parent:t,changeMade:e.changeMade,settings:e.props.settings,uiSettings:e.props.uiSettings})})),a=o.a.createElement("button",{onClick:this.onCaretClick},this.state.show?"v":"^"),l=o.a.createElement("h2",{id:n},"R",t.number," ",t.name," ",a);t.hunt_url&&(l=o.a.createElement("h2",{id:n},o.a.createElement("a",{href:t.hunt_url},"R",t.number," ",t.name)," ",a));var u={};this.state.show||(u.display="none");var c,s,p,d=o.a.createElement("span",{className:"missing-button"});return this.props.settings.slack&&(c=o.a.createElement("span",{className:"messaging-spacer"})),this.props.settings.discord&&(s=o.a.createElement("span",{className:"messaging-spacer"})),this.props.settings.gapps&&(p=o.a.createElement("span",{className:"messaging-spacer"})),o.a.createElement("div",{key:t.id,className:"row"},o.a.createElement("div",{className:"col-lg-12 round"},l,o.a.createElement("div",{className:"col-lg-12",style:u},o.a.createElement("div",{className:"row legend"},o.a.createElement("div",{className:"col-xs-6 col-sm-6 col-md-4 col-lg-3"},d,c,s,p,o.a.createElement("span",{className:"name-legend"},"Name")),o.a.createElement("div",{className:"col-xs-6 col-sm-3 col-md-3 col-lg-2"},"Answer"),o.a.createElement("div",{className:"visible-md visible-lg col-md-3 col-lg-3"},"Notes"),o.a.createElement("div",{className:"hidden-xs col-sm-3 col-md-2 col-lg-2"},"Tags"),o.a.createElement("div",{className:"visible-lg-block col-lg-2"},"Activity"))),o.a.createElement("div",{style:u},i)))}},{key:"allSolved",value:function(e){return(e=e||this.props.round.puzzle_set).every((function(e){return e.answer}))}},{key:"getFilteredPuzzles",value:function(){var e=this;return this.props.round.puzzle_set.filter((function(t){if(e.props.showAnswered&&!e.props.filter)return!0;var n=t.tags.toLowerCase()+" "+t.name.toLowerCase();return(e.props.showAnswered||!t.answer)&&n.indexOf(e.props.filter.toLowerCase())>=0}))}}])&&De(t.prototype,n),r&&De(t,r),a}(o.a.Component);function We(e){return(We="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function qe(){return(qe=Object.assign||function(e){for(var t=1;t<arguments.length;t++){var n=arguments[t];for(var r in n)Object.prototype.hasOwnProperty.call(n,r)&&(e[r]=n[r])}return e}).apply(this,arguments)}function Be(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function He(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function Qe(e,t){return(Qe=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function $e(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=Ye(e);if(t){var o=Ye(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return Ke(this,n)}}function Ke(e,t){return!t||"object"!==We(t)&&"function"!=typeof t?Xe(e):t}function Xe(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function Ye(e){return(Ye=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function Je(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}Ve.propTypes={round:H.isRequired,changeMade:y.a.func,filter:y.a.string.isRequired,showAnswered:y.a.bool.isRequired,settings:y.a.object,uiSettings:y.a.object};var Ge=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&Qe(e,t)}(a,e);var t,n,r,i=$e(a);function a(){var e;Be(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return Je(Xe(e=i.call.apply(i,[this].concat(n))),"state",{filter:"",showAnswered:!0}),Je(Xe(e),"changeMade",(function(){e.props.changeMade&&e.props.changeMade()})),Je(Xe(e),"changeFilter",(function(t){e.setState({filter:t})})),Je(Xe(e),"toggleAnswerStatus",(function(){e.setState({showAnswered:!e.state.showAnswered})})),e}return t=a,(n=[{key:"render",value:function(){var e=this,t=this.props.rounds.map((function(t){return o.a.createElement(Ve,qe({key:t.id,round:t,changeMade:e.changeMade,settings:e.props.settings,uiSettings:e.props.uiSettings},e.state))}));return o.a.createElement("div",null,o.a.createElement("div",{className:"row"},o.a.createElement("div",{className:"col-xs-12"},o.a.createElement(_,{uiSettings:this.props.uiSettings,updateFulltextFilter:this.changeFilter,updateAnswerFilter:this.toggleAnswerStatus,toggleLinkType:this.props.toggleLinkType}))),t.length>0?t:o.a.createElement("p",null,"No puzzles are available"))}}])&&He(t.prototype,n),r&&He(t,r),a}(o.a.Component);function Ze(e){return(Ze="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function et(e,t){var n=Object.keys(e);if(Object.getOwnPropertySymbols){var r=Object.getOwnPropertySymbols(e);t&&(r=r.filter((function(t){return Object.getOwnPropertyDescriptor(e,t).enumerable}))),n.push.apply(n,r)}return n}function tt(e){for(var t=1;t<arguments.length;t++){var n=null!=arguments[t]?arguments[t]:{};t%2?et(Object(n),!0).forEach((function(t){ct(e,t,n[t])})):Object.getOwnPropertyDescriptors?Object.defineProperties(e,Object.getOwnPropertyDescriptors(n)):et(Object(n)).forEach((function(t){Object.defineProperty(e,t,Object.getOwnPropertyDescriptor(n,t))}))}return e}function nt(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function rt(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function ot(e,t){return(ot=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function it(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=ut(e);if(t){var o=ut(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return at(this,n)}}function at(e,t){return!t||"object"!==Ze(t)&&"function"!=typeof t?lt(e):t}function lt(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function ut(e){return(ut=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function ct(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}Ge.propTypes={rounds:y.a.arrayOf(H.isRequired).isRequired,changeMade:y.a.func,settings:y.a.object,uiSettings:y.a.object,toggleLinkType:y.a.func.isRequired};var st=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&ot(e,t)}(a,e);var t,n,r,i=it(a);function a(){var e;nt(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return ct(lt(e=i.call.apply(i,[this].concat(n))),"state",{uiSettings:{app_links:!1}}),ct(lt(e),"loadDataFromServer",(function(){u()("GET","/puzzles/").done((function(t){return e.setState(JSON.parse(t.getBody()))}))})),ct(lt(e),"toggleLinkType",(function(){e.setState((function(e){return{uiSettings:tt(tt({},e.uiSettings),{},{app_links:!e.uiSettings.app_links})}}))})),e}return t=a,(n=[{key:"componentDidMount",value:function(){this.setState({uiSettings:s.a.get("uiSettings",{app_links:!1})}),this.loadDataFromServer(),setInterval(this.loadDataFromServer,this.props.pollInterval),document.addEventListener("click",(function e(){Notification.requestPermission((function(t){document.removeEventListener("click",e),"granted"===t&&console.log("Browser notifications are active.")}))}))}},{key:"componentDidUpdate",value:function(){s.a.set("uiSettings",this.state.uiSettings)}},{key:"render",value:function(){return this.state.rounds?o.a.createElement("div",null,o.a.createElement(m,{rounds:this.state.rounds,settings:this.state.settings}),o.a.createElement(Ge,{rounds:this.state.rounds,changeMade:this.loadDataFromServer,settings:this.state.settings,uiSettings:this.state.uiSettings,toggleLinkType:this.toggleLinkType})):null}}])&&rt(t.prototype,n),r&&rt(t,r),a}(o.a.Component),ft=o.a.createElement(st,{pollInterval:1e4});a.a.render(ft,document.getElementById("react-root"))}]);
\ No newline at end of file
+ */function r(e){return(r="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}var o,i,a,l,u;if("undefined"==typeof window||"function"!=typeof MessageChannel){var c=null,s=null,f=function e(){if(null!==c)try{var n=t.unstable_now();c(!0,n),c=null}catch(t){throw setTimeout(e,0),t}},p=Date.now();t.unstable_now=function(){return Date.now()-p},o=function(e){null!==c?setTimeout(o,0,e):(c=e,setTimeout(f,0))},i=function(e,t){s=setTimeout(e,t)},a=function(){clearTimeout(s)},l=function(){return!1},u=t.unstable_forceFrameRate=function(){}}else{var d=window.performance,m=window.Date,h=window.setTimeout,y=window.clearTimeout;if("undefined"!=typeof console){var g=window.cancelAnimationFrame;"function"!=typeof window.requestAnimationFrame&&console.error("This browser doesn't support requestAnimationFrame. Make sure that you load a polyfill in older browsers. https://fb.me/react-polyfills"),"function"!=typeof g&&console.error("This browser doesn't support cancelAnimationFrame. Make sure that you load a polyfill in older browsers. https://fb.me/react-polyfills")}if("object"===r(d)&&"function"==typeof d.now)t.unstable_now=function(){return d.now()};else{var v=m.now();t.unstable_now=function(){return m.now()-v}}var b=!1,w=null,k=-1,S=5,E=0;l=function(){return t.unstable_now()>=E},u=function(){},t.unstable_forceFrameRate=function(e){0>e||125<e?console.error("forceFrameRate takes a positive int between 0 and 125, forcing framerates higher than 125 fps is not unsupported"):S=0<e?Math.floor(1e3/e):5};var x=new MessageChannel,T=x.port2;x.port1.onmessage=function(){if(null!==w){var e=t.unstable_now();E=e+S;try{w(!0,e)?T.postMessage(null):(b=!1,w=null)}catch(e){throw T.postMessage(null),e}}else b=!1},o=function(e){w=e,b||(b=!0,T.postMessage(null))},i=function(e,n){k=h((function(){e(t.unstable_now())}),n)},a=function(){y(k),k=-1}}function _(e,t){var n=e.length;e.push(t);e:for(;;){var r=n-1>>>1,o=e[r];if(!(void 0!==o&&0<O(o,t)))break e;e[r]=t,e[n]=o,n=r}}function C(e){return void 0===(e=e[0])?null:e}function P(e){var t=e[0];if(void 0!==t){var n=e.pop();if(n!==t){e[0]=n;e:for(var r=0,o=e.length;r<o;){var i=2*(r+1)-1,a=e[i],l=i+1,u=e[l];if(void 0!==a&&0>O(a,n))void 0!==u&&0>O(u,a)?(e[r]=u,e[l]=n,r=l):(e[r]=a,e[i]=n,r=i);else{if(!(void 0!==u&&0>O(u,n)))break e;e[r]=u,e[l]=n,r=l}}}return t}return null}function O(e,t){var n=e.sortIndex-t.sortIndex;return 0!==n?n:e.id-t.id}var N=[],j=[],R=1,z=null,D=3,M=!1,F=!1,A=!1;function I(e){for(var t=C(j);null!==t;){if(null===t.callback)P(j);else{if(!(t.startTime<=e))break;P(j),t.sortIndex=t.expirationTime,_(N,t)}t=C(j)}}function L(e){if(A=!1,I(e),!F)if(null!==C(N))F=!0,o(U);else{var t=C(j);null!==t&&i(L,t.startTime-e)}}function U(e,n){F=!1,A&&(A=!1,a()),M=!0;var r=D;try{for(I(n),z=C(N);null!==z&&(!(z.expirationTime>n)||e&&!l());){var o=z.callback;if(null!==o){z.callback=null,D=z.priorityLevel;var u=o(z.expirationTime<=n);n=t.unstable_now(),"function"==typeof u?z.callback=u:z===C(N)&&P(N),I(n)}else P(N);z=C(N)}if(null!==z)var c=!0;else{var s=C(j);null!==s&&i(L,s.startTime-n),c=!1}return c}finally{z=null,D=r,M=!1}}function V(e){switch(e){case 1:return-1;case 2:return 250;case 5:return 1073741823;case 4:return 1e4;default:return 5e3}}var W=u;t.unstable_IdlePriority=5,t.unstable_ImmediatePriority=1,t.unstable_LowPriority=4,t.unstable_NormalPriority=3,t.unstable_Profiling=null,t.unstable_UserBlockingPriority=2,t.unstable_cancelCallback=function(e){e.callback=null},t.unstable_continueExecution=function(){F||M||(F=!0,o(U))},t.unstable_getCurrentPriorityLevel=function(){return D},t.unstable_getFirstCallbackNode=function(){return C(N)},t.unstable_next=function(e){switch(D){case 1:case 2:case 3:var t=3;break;default:t=D}var n=D;D=t;try{return e()}finally{D=n}},t.unstable_pauseExecution=function(){},t.unstable_requestPaint=W,t.unstable_runWithPriority=function(e,t){switch(e){case 1:case 2:case 3:case 4:case 5:break;default:e=3}var n=D;D=e;try{return t()}finally{D=n}},t.unstable_scheduleCallback=function(e,n,l){var u=t.unstable_now();if("object"===r(l)&&null!==l){var c=l.delay;c="number"==typeof c&&0<c?u+c:u,l="number"==typeof l.timeout?l.timeout:V(e)}else l=V(e),c=u;return e={id:R++,callback:n,priorityLevel:e,startTime:c,expirationTime:l=c+l,sortIndex:-1},c>u?(e.sortIndex=c,_(j,e),null===C(N)&&e===C(j)&&(A?a():A=!0,i(L,c-u))):(e.sortIndex=l,_(N,e),F||M||(F=!0,o(U))),e},t.unstable_shouldYield=function(){var e=t.unstable_now();I(e);var n=C(N);return n!==z&&null!==z&&null!==n&&null!==n.callback&&n.startTime<=e&&n.expirationTime<z.expirationTime||l()},t.unstable_wrapCallback=function(e){var t=D;return function(){var n=D;D=t;try{return e.apply(this,arguments)}finally{D=n}}}},function(e,t,n){"use strict";function r(e){return(r="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}var o=function(){function e(e,t,n,o){if("number"!=typeof e)throw new TypeError("statusCode must be a number but was "+r(e));if(null===t)throw new TypeError("headers cannot be null");if("object"!==r(t))throw new TypeError("headers must be an object but was "+r(t));this.statusCode=e;var i={};for(var a in t)i[a.toLowerCase()]=t[a];this.headers=i,this.body=n,this.url=o}return e.prototype.isError=function(){return 0===this.statusCode||this.statusCode>=400},e.prototype.getBody=function(e){var t;if(0===this.statusCode)throw(t=new Error("This request to "+this.url+" resulted in a status code of 0. This usually indicates some kind of network error in a browser (e.g. CORS not being set up or the DNS failing to resolve):\n"+this.body.toString())).statusCode=this.statusCode,t.headers=this.headers,t.body=this.body,t.url=this.url,t;if(this.statusCode>=300)throw(t=new Error("Server responded to "+this.url+" with status code "+this.statusCode+":\n"+this.body.toString())).statusCode=this.statusCode,t.headers=this.headers,t.body=this.body,t.url=this.url,t;return e&&"string"!=typeof this.body?this.body.toString(e):this.body},e}();e.exports=o},function(e,t,n){"use strict";e.exports=n(2),n(22),n(23),n(24),n(25),n(27)},function(e,t,n){"use strict";var r=n(2);e.exports=r,r.prototype.done=function(e,t){var n=arguments.length?this.then.apply(this,arguments):this;n.then(null,(function(e){setTimeout((function(){throw e}),0)}))}},function(e,t,n){"use strict";var r=n(2);e.exports=r,r.prototype.finally=function(e){return this.then((function(t){return r.resolve(e()).then((function(){return t}))}),(function(t){return r.resolve(e()).then((function(){throw t}))}))}},function(e,t,n){"use strict";function r(e){return(r="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}var o=n(2);e.exports=o;var i=f(!0),a=f(!1),l=f(null),u=f(void 0),c=f(0),s=f("");function f(e){var t=new o(o._0);return t._V=1,t._W=e,t}o.resolve=function(e){if(e instanceof o)return e;if(null===e)return l;if(void 0===e)return u;if(!0===e)return i;if(!1===e)return a;if(0===e)return c;if(""===e)return s;if("object"===r(e)||"function"==typeof e)try{var t=e.then;if("function"==typeof t)return new o(t.bind(e))}catch(e){return new o((function(t,n){n(e)}))}return f(e)};var p=function(e){return"function"==typeof Array.from?(p=Array.from,Array.from(e)):(p=function(e){return Array.prototype.slice.call(e)},Array.prototype.slice.call(e))};o.all=function(e){var t=p(e);return new o((function(e,n){if(0===t.length)return e([]);var i=t.length;function a(l,u){if(u&&("object"===r(u)||"function"==typeof u)){if(u instanceof o&&u.then===o.prototype.then){for(;3===u._V;)u=u._W;return 1===u._V?a(l,u._W):(2===u._V&&n(u._W),void u.then((function(e){a(l,e)}),n))}var c=u.then;if("function"==typeof c)return void new o(c.bind(u)).then((function(e){a(l,e)}),n)}t[l]=u,0==--i&&e(t)}for(var l=0;l<t.length;l++)a(l,t[l])}))},o.reject=function(e){return new o((function(t,n){n(e)}))},o.race=function(e){return new o((function(t,n){p(e).forEach((function(e){o.resolve(e).then(t,n)}))}))},o.prototype.catch=function(e){return this.then(null,e)}},function(e,t,n){"use strict";var r=n(2),o=n(26);e.exports=r,r.denodeify=function(e,t){return"number"==typeof t&&t!==1/0?function(e,t){for(var n=[],o=0;o<t;o++)n.push("a"+o);var a=["return function ("+n.join(",")+") {","var self = this;","return new Promise(function (rs, rj) {","var res = fn.call(",["self"].concat(n).concat([i]).join(","),");","if (res &&",'(typeof res === "object" || typeof res === "function") &&','typeof res.then === "function"',") {rs(res);}","});","};"].join("");return Function(["Promise","fn"],a)(r,e)}(e,t):function(e){for(var t=Math.max(e.length-1,3),n=[],o=0;o<t;o++)n.push("a"+o);var a=["return function ("+n.join(",")+") {","var self = this;","var args;","var argLength = arguments.length;","if (arguments.length > "+t+") {","args = new Array(arguments.length + 1);","for (var i = 0; i < arguments.length; i++) {","args[i] = arguments[i];","}","}","return new Promise(function (rs, rj) {","var cb = "+i+";","var res;","switch (argLength) {",n.concat(["extra"]).map((function(e,t){return"case "+t+":res = fn.call("+["self"].concat(n.slice(0,t)).concat("cb").join(",")+");break;"})).join(""),"default:","args[argLength] = cb;","res = fn.apply(self, args);","}","if (res &&",'(typeof res === "object" || typeof res === "function") &&','typeof res.then === "function"',") {rs(res);}","});","};"].join("");return Function(["Promise","fn"],a)(r,e)}(e)};var i="function (err, res) {if (err) { rj(err); } else { rs(res); }}";r.nodeify=function(e){return function(){var t=Array.prototype.slice.call(arguments),n="function"==typeof t[t.length-1]?t.pop():null,i=this;try{return e.apply(this,arguments).nodeify(n,i)}catch(e){if(null==n)return new r((function(t,n){n(e)}));o((function(){n.call(i,e)}))}}},r.prototype.nodeify=function(e,t){if("function"!=typeof e)return this;this.then((function(n){o((function(){e.call(t,null,n)}))}),(function(n){o((function(){e.call(t,n)}))}))}},function(e,t,n){"use strict";var r=n(10),o=[],i=[],a=r.makeRequestCallFromTimer((function(){if(i.length)throw i.shift()}));function l(e){var t;(t=o.length?o.pop():new u).task=e,r(t)}function u(){this.task=null}e.exports=l,u.prototype.call=function(){try{this.task.call()}catch(e){l.onerror?l.onerror(e):(i.push(e),a())}finally{this.task=null,o[o.length]=this}}},function(e,t,n){"use strict";var r=n(2);e.exports=r,r.enableSynchronous=function(){r.prototype.isPending=function(){return 0==this.getState()},r.prototype.isFulfilled=function(){return 1==this.getState()},r.prototype.isRejected=function(){return 2==this.getState()},r.prototype.getValue=function(){if(3===this._V)return this._W.getValue();if(!this.isFulfilled())throw new Error("Cannot get a value of an unfulfilled promise.");return this._W},r.prototype.getReason=function(){if(3===this._V)return this._W.getReason();if(!this.isRejected())throw new Error("Cannot get a rejection reason of a non-rejected promise.");return this._W},r.prototype.getState=function(){return 3===this._V?this._W.getState():-1===this._V||-2===this._V?0:this._V}},r.disableSynchronous=function(){r.prototype.isPending=void 0,r.prototype.isFulfilled=void 0,r.prototype.isRejected=void 0,r.prototype.getValue=void 0,r.prototype.getReason=void 0,r.prototype.getState=void 0}},function(e,t,n){"use strict";t.__esModule=!0;n(9);function r(e){return e?"utf8"===e?this.then(i):this.then(function(e){return function(t){return t.getBody(e)}}(e)):this.then(o)}function o(e){return e.getBody()}function i(e){return e.getBody("utf8")}t.default=function(e){return e.getBody=r,e},t.ResponsePromise=void 0},function(e,t,n){"use strict";t.__esModule=!0;var r=n(30);t.default=function(e,t){var n=e.split("?"),o=n[0],i=n[1],a=(i||"").split("#")[0],l=i&&i.split("#").length>1?"#"+i.split("#")[1]:"",u=r.parse(a);for(var c in t)u[c]=t[c];return""!==(a=r.stringify(u))&&(a="?"+a),o+a+l}},function(e,t,n){"use strict";var r=n(31),o=n(32),i=n(12);e.exports={formats:i,parse:o,stringify:r}},function(e,t,n){"use strict";function r(e){return(r="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}var o=n(6),i=n(12),a=Object.prototype.hasOwnProperty,l={brackets:function(e){return e+"[]"},comma:"comma",indices:function(e,t){return e+"["+t+"]"},repeat:function(e){return e}},u=Array.isArray,c=Array.prototype.push,s=function(e,t){c.apply(e,u(t)?t:[t])},f=Date.prototype.toISOString,p=i.default,d={addQueryPrefix:!1,allowDots:!1,charset:"utf-8",charsetSentinel:!1,delimiter:"&",encode:!0,encoder:o.encode,encodeValuesOnly:!1,format:p,formatter:i.formatters[p],indices:!1,serializeDate:function(e){return f.call(e)},skipNulls:!1,strictNullHandling:!1},m=function e(t,n,i,a,l,c,f,p,m,h,y,g,v){var b,w=t;if("function"==typeof f?w=f(n,w):w instanceof Date?w=h(w):"comma"===i&&u(w)&&(w=o.maybeMap(w,(function(e){return e instanceof Date?h(e):e})).join(",")),null===w){if(a)return c&&!g?c(n,d.encoder,v,"key"):n;w=""}if("string"==typeof(b=w)||"number"==typeof b||"boolean"==typeof b||"symbol"===r(b)||"bigint"==typeof b||o.isBuffer(w))return c?[y(g?n:c(n,d.encoder,v,"key"))+"="+y(c(w,d.encoder,v,"value"))]:[y(n)+"="+y(String(w))];var k,S=[];if(void 0===w)return S;if(u(f))k=f;else{var E=Object.keys(w);k=p?E.sort(p):E}for(var x=0;x<k.length;++x){var T=k[x],_=w[T];if(!l||null!==_){var C=u(w)?"function"==typeof i?i(n,T):n:n+(m?"."+T:"["+T+"]");s(S,e(_,C,i,a,l,c,f,p,m,h,y,g,v))}}return S};e.exports=function(e,t){var n,o=e,c=function(e){if(!e)return d;if(null!==e.encoder&&void 0!==e.encoder&&"function"!=typeof e.encoder)throw new TypeError("Encoder has to be a function.");var t=e.charset||d.charset;if(void 0!==e.charset&&"utf-8"!==e.charset&&"iso-8859-1"!==e.charset)throw new TypeError("The charset option must be either utf-8, iso-8859-1, or undefined");var n=i.default;if(void 0!==e.format){if(!a.call(i.formatters,e.format))throw new TypeError("Unknown format option provided.");n=e.format}var r=i.formatters[n],o=d.filter;return("function"==typeof e.filter||u(e.filter))&&(o=e.filter),{addQueryPrefix:"boolean"==typeof e.addQueryPrefix?e.addQueryPrefix:d.addQueryPrefix,allowDots:void 0===e.allowDots?d.allowDots:!!e.allowDots,charset:t,charsetSentinel:"boolean"==typeof e.charsetSentinel?e.charsetSentinel:d.charsetSentinel,delimiter:void 0===e.delimiter?d.delimiter:e.delimiter,encode:"boolean"==typeof e.encode?e.encode:d.encode,encoder:"function"==typeof e.encoder?e.encoder:d.encoder,encodeValuesOnly:"boolean"==typeof e.encodeValuesOnly?e.encodeValuesOnly:d.encodeValuesOnly,filter:o,formatter:r,serializeDate:"function"==typeof e.serializeDate?e.serializeDate:d.serializeDate,skipNulls:"boolean"==typeof e.skipNulls?e.skipNulls:d.skipNulls,sort:"function"==typeof e.sort?e.sort:null,strictNullHandling:"boolean"==typeof e.strictNullHandling?e.strictNullHandling:d.strictNullHandling}}(t);"function"==typeof c.filter?o=(0,c.filter)("",o):u(c.filter)&&(n=c.filter);var f,p=[];if("object"!==r(o)||null===o)return"";f=t&&t.arrayFormat in l?t.arrayFormat:t&&"indices"in t?t.indices?"indices":"repeat":"indices";var h=l[f];n||(n=Object.keys(o)),c.sort&&n.sort(c.sort);for(var y=0;y<n.length;++y){var g=n[y];c.skipNulls&&null===o[g]||s(p,m(o[g],g,h,c.strictNullHandling,c.skipNulls,c.encode?c.encoder:null,c.filter,c.sort,c.allowDots,c.serializeDate,c.formatter,c.encodeValuesOnly,c.charset))}var v=p.join(c.delimiter),b=!0===c.addQueryPrefix?"?":"";return c.charsetSentinel&&("iso-8859-1"===c.charset?b+="utf8=%26%2310003%3B&":b+="utf8=%E2%9C%93&"),v.length>0?b+v:""}},function(e,t,n){"use strict";var r=n(6),o=Object.prototype.hasOwnProperty,i=Array.isArray,a={allowDots:!1,allowPrototypes:!1,arrayLimit:20,charset:"utf-8",charsetSentinel:!1,comma:!1,decoder:r.decode,delimiter:"&",depth:5,ignoreQueryPrefix:!1,interpretNumericEntities:!1,parameterLimit:1e3,parseArrays:!0,plainObjects:!1,strictNullHandling:!1},l=function(e){return e.replace(/&#(\d+);/g,(function(e,t){return String.fromCharCode(parseInt(t,10))}))},u=function(e,t){return e&&"string"==typeof e&&t.comma&&e.indexOf(",")>-1?e.split(","):e},c=function(e,t,n,r){if(e){var i=n.allowDots?e.replace(/\.([^.[]+)/g,"[$1]"):e,a=/(\[[^[\]]*])/g,l=n.depth>0&&/(\[[^[\]]*])/.exec(i),c=l?i.slice(0,l.index):i,s=[];if(c){if(!n.plainObjects&&o.call(Object.prototype,c)&&!n.allowPrototypes)return;s.push(c)}for(var f=0;n.depth>0&&null!==(l=a.exec(i))&&f<n.depth;){if(f+=1,!n.plainObjects&&o.call(Object.prototype,l[1].slice(1,-1))&&!n.allowPrototypes)return;s.push(l[1])}return l&&s.push("["+i.slice(l.index)+"]"),function(e,t,n,r){for(var o=r?t:u(t,n),i=e.length-1;i>=0;--i){var a,l=e[i];if("[]"===l&&n.parseArrays)a=[].concat(o);else{a=n.plainObjects?Object.create(null):{};var c="["===l.charAt(0)&&"]"===l.charAt(l.length-1)?l.slice(1,-1):l,s=parseInt(c,10);n.parseArrays||""!==c?!isNaN(s)&&l!==c&&String(s)===c&&s>=0&&n.parseArrays&&s<=n.arrayLimit?(a=[])[s]=o:a[c]=o:a={0:o}}o=a}return o}(s,t,n,r)}};e.exports=function(e,t){var n=function(e){if(!e)return a;if(null!==e.decoder&&void 0!==e.decoder&&"function"!=typeof e.decoder)throw new TypeError("Decoder has to be a function.");if(void 0!==e.charset&&"utf-8"!==e.charset&&"iso-8859-1"!==e.charset)throw new TypeError("The charset option must be either utf-8, iso-8859-1, or undefined");var t=void 0===e.charset?a.charset:e.charset;return{allowDots:void 0===e.allowDots?a.allowDots:!!e.allowDots,allowPrototypes:"boolean"==typeof e.allowPrototypes?e.allowPrototypes:a.allowPrototypes,arrayLimit:"number"==typeof e.arrayLimit?e.arrayLimit:a.arrayLimit,charset:t,charsetSentinel:"boolean"==typeof e.charsetSentinel?e.charsetSentinel:a.charsetSentinel,comma:"boolean"==typeof e.comma?e.comma:a.comma,decoder:"function"==typeof e.decoder?e.decoder:a.decoder,delimiter:"string"==typeof e.delimiter||r.isRegExp(e.delimiter)?e.delimiter:a.delimiter,depth:"number"==typeof e.depth||!1===e.depth?+e.depth:a.depth,ignoreQueryPrefix:!0===e.ignoreQueryPrefix,interpretNumericEntities:"boolean"==typeof e.interpretNumericEntities?e.interpretNumericEntities:a.interpretNumericEntities,parameterLimit:"number"==typeof e.parameterLimit?e.parameterLimit:a.parameterLimit,parseArrays:!1!==e.parseArrays,plainObjects:"boolean"==typeof e.plainObjects?e.plainObjects:a.plainObjects,strictNullHandling:"boolean"==typeof e.strictNullHandling?e.strictNullHandling:a.strictNullHandling}}(t);if(""===e||null==e)return n.plainObjects?Object.create(null):{};for(var s="string"==typeof e?function(e,t){var n,c={},s=t.ignoreQueryPrefix?e.replace(/^\?/,""):e,f=t.parameterLimit===1/0?void 0:t.parameterLimit,p=s.split(t.delimiter,f),d=-1,m=t.charset;if(t.charsetSentinel)for(n=0;n<p.length;++n)0===p[n].indexOf("utf8=")&&("utf8=%E2%9C%93"===p[n]?m="utf-8":"utf8=%26%2310003%3B"===p[n]&&(m="iso-8859-1"),d=n,n=p.length);for(n=0;n<p.length;++n)if(n!==d){var h,y,g=p[n],v=g.indexOf("]="),b=-1===v?g.indexOf("="):v+1;-1===b?(h=t.decoder(g,a.decoder,m,"key"),y=t.strictNullHandling?null:""):(h=t.decoder(g.slice(0,b),a.decoder,m,"key"),y=r.maybeMap(u(g.slice(b+1),t),(function(e){return t.decoder(e,a.decoder,m,"value")}))),y&&t.interpretNumericEntities&&"iso-8859-1"===m&&(y=l(y)),g.indexOf("[]=")>-1&&(y=i(y)?[y]:y),o.call(c,h)?c[h]=r.combine(c[h],y):c[h]=y}return c}(e,n):e,f=n.plainObjects?Object.create(null):{},p=Object.keys(s),d=0;d<p.length;++d){var m=p[d],h=c(m,s[m],n,"string"==typeof e);f=r.merge(f,h,n)}return r.compact(f)}},function(e,t,n){var r=n(3),o=r.slice,i=r.pluck,a=r.each,l=r.bind,u=r.create,c=r.isList,s=r.isFunction,f=r.isObject;e.exports={createStore:d};var p={version:"2.0.12",enabled:!1,get:function(e,t){var n=this.storage.read(this._namespacePrefix+e);return this._deserialize(n,t)},set:function(e,t){return void 0===t?this.remove(e):(this.storage.write(this._namespacePrefix+e,this._serialize(t)),t)},remove:function(e){this.storage.remove(this._namespacePrefix+e)},each:function(e){var t=this;this.storage.each((function(n,r){e.call(t,t._deserialize(n),(r||"").replace(t._namespaceRegexp,""))}))},clearAll:function(){this.storage.clearAll()},hasNamespace:function(e){return this._namespacePrefix=="__storejs_"+e+"_"},createStore:function(){return d.apply(this,arguments)},addPlugin:function(e){this._addPlugin(e)},namespace:function(e){return d(this.storage,this.plugins,e)}};function d(e,t,n){n||(n=""),e&&!c(e)&&(e=[e]),t&&!c(t)&&(t=[t]);var r=n?"__storejs_"+n+"_":"",d=n?new RegExp("^"+r):null;if(!/^[a-zA-Z0-9_\-]*$/.test(n))throw new Error("store.js namespaces can only have alphanumerics + underscores and dashes");var m=u({_namespacePrefix:r,_namespaceRegexp:d,_testStorage:function(e){try{var t="__storejs__test__";e.write(t,t);var n=e.read(t)===t;return e.remove(t),n}catch(e){return!1}},_assignPluginFnProp:function(e,t){var n=this[t];this[t]=function(){var t=o(arguments,0),r=this;function i(){if(n)return a(arguments,(function(e,n){t[n]=e})),n.apply(r,t)}var l=[i].concat(t);return e.apply(r,l)}},_serialize:function(e){return JSON.stringify(e)},_deserialize:function(e,t){if(!e)return t;var n="";try{n=JSON.parse(e)}catch(t){n=e}return void 0!==n?n:t},_addStorage:function(e){this.enabled||this._testStorage(e)&&(this.storage=e,this.enabled=!0)},_addPlugin:function(e){var t=this;if(c(e))a(e,(function(e){t._addPlugin(e)}));else if(!i(this.plugins,(function(t){return e===t}))){if(this.plugins.push(e),!s(e))throw new Error("Plugins must be function values that return objects");var n=e.call(this);if(!f(n))throw new Error("Plugins must return an object of function properties");a(n,(function(n,r){if(!s(n))throw new Error("Bad plugin property: "+r+" from plugin "+e.name+". Plugins should only return functions.");t._assignPluginFnProp(n,r)}))}},addStorage:function(e){!function(){var e="undefined"==typeof console?null:console;if(e){var t=e.warn?e.warn:e.log;t.apply(e,arguments)}}("store.addStorage(storage) is deprecated. Use createStore([storages])"),this._addStorage(e)}},p,{plugins:[]});return m.raw={},a(m,(function(e,t){s(e)&&(m.raw[t]=l(m,e))})),a(e,(function(e){m._addStorage(e)})),a(t,(function(e){m._addPlugin(e)})),m}},function(e,t,n){e.exports=[n(35),n(36),n(37),n(38),n(39),n(40)]},function(e,t,n){var r=n(3).Global;function o(){return r.localStorage}function i(e){return o().getItem(e)}e.exports={name:"localStorage",read:i,write:function(e,t){return o().setItem(e,t)},each:function(e){for(var t=o().length-1;t>=0;t--){var n=o().key(t);e(i(n),n)}},remove:function(e){return o().removeItem(e)},clearAll:function(){return o().clear()}}},function(e,t,n){var r=n(3).Global;e.exports={name:"oldFF-globalStorage",read:function(e){return o[e]},write:function(e,t){o[e]=t},each:i,remove:function(e){return o.removeItem(e)},clearAll:function(){i((function(e,t){delete o[e]}))}};var o=r.globalStorage;function i(e){for(var t=o.length-1;t>=0;t--){var n=o.key(t);e(o[n],n)}}},function(e,t,n){var r=n(3).Global;e.exports={name:"oldIE-userDataStorage",write:function(e,t){if(a)return;var n=u(e);i((function(e){e.setAttribute(n,t),e.save("storejs")}))},read:function(e){if(a)return;var t=u(e),n=null;return i((function(e){n=e.getAttribute(t)})),n},each:function(e){i((function(t){for(var n=t.XMLDocument.documentElement.attributes,r=n.length-1;r>=0;r--){var o=n[r];e(t.getAttribute(o.name),o.name)}}))},remove:function(e){var t=u(e);i((function(e){e.removeAttribute(t),e.save("storejs")}))},clearAll:function(){i((function(e){var t=e.XMLDocument.documentElement.attributes;e.load("storejs");for(var n=t.length-1;n>=0;n--)e.removeAttribute(t[n].name);e.save("storejs")}))}};var o=r.document,i=function(){if(!o||!o.documentElement||!o.documentElement.addBehavior)return null;var e,t,n;try{(t=new ActiveXObject("htmlfile")).open(),t.write('<script>document.w=window<\/script><iframe src="/favicon.ico"></iframe>'),t.close(),e=t.w.frames[0].document,n=e.createElement("div")}catch(t){n=o.createElement("div"),e=o.body}return function(t){var r=[].slice.call(arguments,0);r.unshift(n),e.appendChild(n),n.addBehavior("#default#userData"),n.load("storejs"),t.apply(this,r),e.removeChild(n)}}(),a=(r.navigator?r.navigator.userAgent:"").match(/ (MSIE 8|MSIE 9|MSIE 10)\./);var l=new RegExp("[!\"#$%&'()*+,/\\\\:;<=>?@[\\]^`{|}~]","g");function u(e){return e.replace(/^\d/,"___$&").replace(l,"___")}},function(e,t,n){var r=n(3),o=r.Global,i=r.trim;e.exports={name:"cookieStorage",read:function(e){if(!e||!c(e))return null;var t="(?:^|.*;\\s*)"+escape(e).replace(/[\-\.\+\*]/g,"\\$&")+"\\s*\\=\\s*((?:[^;](?!;))*[^;]?).*";return unescape(a.cookie.replace(new RegExp(t),"$1"))},write:function(e,t){if(!e)return;a.cookie=escape(e)+"="+escape(t)+"; expires=Tue, 19 Jan 2038 03:14:07 GMT; path=/"},each:l,remove:u,clearAll:function(){l((function(e,t){u(t)}))}};var a=o.document;function l(e){for(var t=a.cookie.split(/; ?/g),n=t.length-1;n>=0;n--)if(i(t[n])){var r=t[n].split("="),o=unescape(r[0]);e(unescape(r[1]),o)}}function u(e){e&&c(e)&&(a.cookie=escape(e)+"=; expires=Thu, 01 Jan 1970 00:00:00 GMT; path=/")}function c(e){return new RegExp("(?:^|;\\s*)"+escape(e).replace(/[\-\.\+\*]/g,"\\$&")+"\\s*\\=").test(a.cookie)}},function(e,t,n){var r=n(3).Global;function o(){return r.sessionStorage}function i(e){return o().getItem(e)}e.exports={name:"sessionStorage",read:i,write:function(e,t){return o().setItem(e,t)},each:function(e){for(var t=o().length-1;t>=0;t--){var n=o().key(t);e(i(n),n)}},remove:function(e){return o().removeItem(e)},clearAll:function(){return o().clear()}}},function(e,t){e.exports={name:"memoryStorage",read:function(e){return n[e]},write:function(e,t){n[e]=t},each:function(e){for(var t in n)n.hasOwnProperty(t)&&e(n[t],t)},remove:function(e){delete n[e]},clearAll:function(e){n={}}};var n={}},function(e,t,n){e.exports=function(){return n(42),{}}},function(module,exports){function _typeof(e){return(_typeof="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}"object"!==("undefined"==typeof JSON?"undefined":_typeof(JSON))&&(JSON={}),function(){"use strict";var rx_one=/^[\],:{}\s]*$/,rx_two=/\\(?:["\\\/bfnrt]|u[0-9a-fA-F]{4})/g,rx_three=/"[^"\\\n\r]*"|true|false|null|-?\d+(?:\.\d*)?(?:[eE][+\-]?\d+)?/g,rx_four=/(?:^|:|,)(?:\s*\[)+/g,rx_escapable=/[\\"\u0000-\u001f\u007f-\u009f\u00ad\u0600-\u0604\u070f\u17b4\u17b5\u200c-\u200f\u2028-\u202f\u2060-\u206f\ufeff\ufff0-\uffff]/g,rx_dangerous=/[\u0000\u00ad\u0600-\u0604\u070f\u17b4\u17b5\u200c-\u200f\u2028-\u202f\u2060-\u206f\ufeff\ufff0-\uffff]/g,gap,indent,meta,rep;function f(e){return e<10?"0"+e:e}function this_value(){return this.valueOf()}function quote(e){return rx_escapable.lastIndex=0,rx_escapable.test(e)?'"'+e.replace(rx_escapable,(function(e){var t=meta[e];return"string"==typeof t?t:"\\u"+("0000"+e.charCodeAt(0).toString(16)).slice(-4)}))+'"':'"'+e+'"'}function str(e,t){var n,r,o,i,a,l=gap,u=t[e];switch(u&&"object"===_typeof(u)&&"function"==typeof u.toJSON&&(u=u.toJSON(e)),"function"==typeof rep&&(u=rep.call(t,e,u)),_typeof(u)){case"string":return quote(u);case"number":return isFinite(u)?String(u):"null";case"boolean":case"null":return String(u);case"object":if(!u)return"null";if(gap+=indent,a=[],"[object Array]"===Object.prototype.toString.apply(u)){for(i=u.length,n=0;n<i;n+=1)a[n]=str(n,u)||"null";return o=0===a.length?"[]":gap?"[\n"+gap+a.join(",\n"+gap)+"\n"+l+"]":"["+a.join(",")+"]",gap=l,o}if(rep&&"object"===_typeof(rep))for(i=rep.length,n=0;n<i;n+=1)"string"==typeof rep[n]&&(o=str(r=rep[n],u))&&a.push(quote(r)+(gap?": ":":")+o);else for(r in u)Object.prototype.hasOwnProperty.call(u,r)&&(o=str(r,u))&&a.push(quote(r)+(gap?": ":":")+o);return o=0===a.length?"{}":gap?"{\n"+gap+a.join(",\n"+gap)+"\n"+l+"}":"{"+a.join(",")+"}",gap=l,o}}"function"!=typeof Date.prototype.toJSON&&(Date.prototype.toJSON=function(){return isFinite(this.valueOf())?this.getUTCFullYear()+"-"+f(this.getUTCMonth()+1)+"-"+f(this.getUTCDate())+"T"+f(this.getUTCHours())+":"+f(this.getUTCMinutes())+":"+f(this.getUTCSeconds())+"Z":null},Boolean.prototype.toJSON=this_value,Number.prototype.toJSON=this_value,String.prototype.toJSON=this_value),"function"!=typeof JSON.stringify&&(meta={"\b":"\\b","\t":"\\t","\n":"\\n","\f":"\\f","\r":"\\r",'"':'\\"',"\\":"\\\\"},JSON.stringify=function(e,t,n){var r;if(gap="",indent="","number"==typeof n)for(r=0;r<n;r+=1)indent+=" ";else"string"==typeof n&&(indent=n);if(rep=t,t&&"function"!=typeof t&&("object"!==_typeof(t)||"number"!=typeof t.length))throw new Error("JSON.stringify");return str("",{"":e})}),"function"!=typeof JSON.parse&&(JSON.parse=function(text,reviver){var j;function walk(e,t){var n,r,o=e[t];if(o&&"object"===_typeof(o))for(n in o)Object.prototype.hasOwnProperty.call(o,n)&&(void 0!==(r=walk(o,n))?o[n]=r:delete o[n]);return reviver.call(e,t,o)}if(text=String(text),rx_dangerous.lastIndex=0,rx_dangerous.test(text)&&(text=text.replace(rx_dangerous,(function(e){return"\\u"+("0000"+e.charCodeAt(0).toString(16)).slice(-4)}))),rx_one.test(text.replace(rx_two,"@").replace(rx_three,"]").replace(rx_four,"")))return j=eval("("+text+")"),"function"==typeof reviver?walk({"":j},""):j;throw new SyntaxError("JSON.parse")})}()},function(e,t,n){"use strict";var r=n(44);function o(){}function i(){}i.resetWarningCache=o,e.exports=function(){function e(e,t,n,o,i,a){if(a!==r){var l=new Error("Calling PropTypes validators directly is not supported by the `prop-types` package. Use PropTypes.checkPropTypes() to call them. Read more at http://fb.me/use-check-prop-types");throw l.name="Invariant Violation",l}}function t(){return e}e.isRequired=e;var n={array:e,bool:e,func:e,number:e,object:e,string:e,symbol:e,any:e,arrayOf:t,element:e,elementType:e,instanceOf:t,node:e,objectOf:t,oneOf:t,oneOfType:t,shape:t,exact:t,checkPropTypes:i,resetWarningCache:o};return n.PropTypes=n,n}},function(e,t,n){"use strict";e.exports="SECRET_DO_NOT_PASS_THIS_OR_YOU_WILL_BE_FIRED"},function(e,t,n){"use strict";function r(e){return(r="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}Object.defineProperty(t,"__esModule",{value:!0}),t.CopyToClipboard=void 0;var o=a(n(0)),i=a(n(46));function a(e){return e&&e.__esModule?e:{default:e}}function l(e){return(l="function"==typeof Symbol&&"symbol"===r(Symbol.iterator)?function(e){return r(e)}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":r(e)})(e)}function u(e,t){var n=Object.keys(e);if(Object.getOwnPropertySymbols){var r=Object.getOwnPropertySymbols(e);t&&(r=r.filter((function(t){return Object.getOwnPropertyDescriptor(e,t).enumerable}))),n.push.apply(n,r)}return n}function c(e,t){if(null==e)return{};var n,r,o=function(e,t){if(null==e)return{};var n,r,o={},i=Object.keys(e);for(r=0;r<i.length;r++)n=i[r],t.indexOf(n)>=0||(o[n]=e[n]);return o}(e,t);if(Object.getOwnPropertySymbols){var i=Object.getOwnPropertySymbols(e);for(r=0;r<i.length;r++)n=i[r],t.indexOf(n)>=0||Object.prototype.propertyIsEnumerable.call(e,n)&&(o[n]=e[n])}return o}function s(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function f(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function p(e,t){return!t||"object"!==l(t)&&"function"!=typeof t?m(e):t}function d(e){return(d=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function m(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function h(e,t){return(h=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function y(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}var g=function(e){function t(){var e,n;s(this,t);for(var r=arguments.length,a=new Array(r),l=0;l<r;l++)a[l]=arguments[l];return y(m(n=p(this,(e=d(t)).call.apply(e,[this].concat(a)))),"onClick",(function(e){var t=n.props,r=t.text,a=t.onCopy,l=t.children,u=t.options,c=o.default.Children.only(l),s=(0,i.default)(r,u);a&&a(r,s),c&&c.props&&"function"==typeof c.props.onClick&&c.props.onClick(e)})),n}var n,r,a;return function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&h(e,t)}(t,e),n=t,(r=[{key:"render",value:function(){var e=this.props,t=(e.text,e.onCopy,e.options,e.children),n=c(e,["text","onCopy","options","children"]),r=o.default.Children.only(t);return o.default.cloneElement(r,function(e){for(var t=1;t<arguments.length;t++){var n=null!=arguments[t]?arguments[t]:{};t%2?u(n,!0).forEach((function(t){y(e,t,n[t])})):Object.getOwnPropertyDescriptors?Object.defineProperties(e,Object.getOwnPropertyDescriptors(n)):u(n).forEach((function(t){Object.defineProperty(e,t,Object.getOwnPropertyDescriptor(n,t))}))}return e}({},n,{onClick:this.onClick}))}}])&&f(n.prototype,r),a&&f(n,a),t}(o.default.PureComponent);t.CopyToClipboard=g,y(g,"defaultProps",{onCopy:void 0,options:void 0})},function(e,t,n){"use strict";var r=n(47),o={"text/plain":"Text","text/html":"Url",default:"Text"};e.exports=function(e,t){var n,i,a,l,u,c,s=!1;t||(t={}),n=t.debug||!1;try{if(a=r(),l=document.createRange(),u=document.getSelection(),(c=document.createElement("span")).textContent=e,c.style.all="unset",c.style.position="fixed",c.style.top=0,c.style.clip="rect(0, 0, 0, 0)",c.style.whiteSpace="pre",c.style.webkitUserSelect="text",c.style.MozUserSelect="text",c.style.msUserSelect="text",c.style.userSelect="text",c.addEventListener("copy",(function(r){if(r.stopPropagation(),t.format)if(r.preventDefault(),void 0===r.clipboardData){n&&console.warn("unable to use e.clipboardData"),n&&console.warn("trying IE specific stuff"),window.clipboardData.clearData();var i=o[t.format]||o.default;window.clipboardData.setData(i,e)}else r.clipboardData.clearData(),r.clipboardData.setData(t.format,e);t.onCopy&&(r.preventDefault(),t.onCopy(r.clipboardData))})),document.body.appendChild(c),l.selectNodeContents(c),u.addRange(l),!document.execCommand("copy"))throw new Error("copy command was unsuccessful");s=!0}catch(r){n&&console.error("unable to copy using execCommand: ",r),n&&console.warn("trying IE specific stuff");try{window.clipboardData.setData(t.format||"text",e),t.onCopy&&t.onCopy(window.clipboardData),s=!0}catch(r){n&&console.error("unable to copy using clipboardData: ",r),n&&console.error("falling back to prompt"),i=function(e){var t=(/mac os x/i.test(navigator.userAgent)?"⌘":"Ctrl")+"+C";return e.replace(/#{\s*key\s*}/g,t)}("message"in t?t.message:"Copy to clipboard: #{key}, Enter"),window.prompt(i,e)}}finally{u&&("function"==typeof u.removeRange?u.removeRange(l):u.removeAllRanges()),c&&document.body.removeChild(c),a()}return s}},function(e,t){e.exports=function(){var e=document.getSelection();if(!e.rangeCount)return function(){};for(var t=document.activeElement,n=[],r=0;r<e.rangeCount;r++)n.push(e.getRangeAt(r));switch(t.tagName.toUpperCase()){case"INPUT":case"TEXTAREA":t.blur();break;default:t=null}return e.removeAllRanges(),function(){"Caret"===e.type&&e.removeAllRanges(),e.rangeCount||n.forEach((function(t){e.addRange(t)})),t&&t.focus()}}},function(e,t,n){"use strict";n.r(t);var r=n(0),o=n.n(r),i=n(14),a=n.n(i),l=n(5),u=n.n(l),c=n(7),s=n.n(c);function f(e){return"round-"+e.id.toString()}var p=n(4),d=n.n(p);function m(e){var t,n,r,i,a=e.rounds,l=e.settings,u=l.service_status.warm_pool,c=function(e){return u?"".concat(u[e]," spare ").concat(e," ready"):void 0};return t=function(e,t){for(var n=[],r=0;r<t.length;r++)n.push(t[r]),r!==t.length-1&&n.push(e);return n}(" | ",a.map((function(e){var t="#"+f(e),n="shortcut-"+e.id.toString();return o.a.createElement("a",{key:n,href:t},"R",e.number)}))),l.slack&&(n=o.a.createElement("span",{className:d()({"messaging-logo":!0,broken:!l.service_status.slack})},o.a.createElement("img",{className:"messaging-logo",src:"/static/Slack_Mark_Web.png",alt:"Slack"}))),l.discord&&(r=o.a.createElement("span",{className:d()({"messaging-logo":!0,broken:!l.service_status.discord}),title:c("channels")},o.a.createElement("img",{className:"messaging-logo",src:"/static/Discord-Logo-Color.png",alt:"Discord"}))),l.gapps&&(i=o.a.createElement("span",{className:d()({"messaging-logo":!0,broken:!l.service_status.gapps}),title:c("sheets")},o.a.createElement("img",{className:"messaging-logo",src:"/static/sheets_64dp.png",alt:"Google Sheets"}))),o.a.createElement("div",{className:"row"},o.a.createElement("div",{className:"col-lg-12"},o.a.createElement("div",{className:"shortcuts"},"Hop to: ",t,o.a.createElement("div",{className:"integration-status"},"Integrations:",n,r,i))))}var h=n(1),y=n.n(h);function g(e){return(g="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function v(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function b(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function w(e,t){return(w=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function k(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=x(e);if(t){var o=x(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return S(this,n)}}function S(e,t){return!t||"object"!==g(t)&&"function"!=typeof t?E(e):t}function E(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function x(e){return(x=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function T(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}var _=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&w(e,t)}(a,e);var t,n,r,i=k(a);function a(){var e;v(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return T(E(e=i.call.apply(i,[this].concat(n))),"searchFilter",o.a.createRef()),T(E(e),"updateFilter",(function(t){e.props.updateFulltextFilter(t.target.value)})),e}return t=a,(n=[{key:"componentDidMount",value:function(){this.focus()}},{key:"render",value:function(){return o.a.createElement("div",{className:"filters"},o.a.createElement("h4",null,"Filter by:"),o.a.createElement("div",null,o.a.createElement("label",null,o.a.createElement("input",{type:"search",ref:this.searchFilter,placeholder:"Search...",onChange:this.updateFilter}),"Tag or puzzle name")),o.a.createElement("div",null,o.a.createElement("label",null,o.a.createElement("input",{type:"checkbox",onChange:this.props.updateAnswerFilter}),"Unsolved")),o.a.createElement("div",null,o.a.createElement("label",null,o.a.createElement("input",{type:"checkbox",checked:this.props.uiSettings.app_links,onChange:this.props.toggleLinkType}),"Use app links")))}},{key:"focus",value:function(){this.searchFilter.current.focus()}}])&&b(t.prototype,n),r&&b(t,r),a}(o.a.Component);_.propTypes={updateFulltextFilter:y.a.func.isRequired,updateAnswerFilter:y.a.func.isRequired,toggleLinkType:y.a.func.isRequired,uiSettings:y.a.object.isRequired};var C=n(15),P=12e4;function O(e){var t=e.className,n=e.activity,r=n.channelCount,i=n.channelActive,a=n.activityHisto,l=n.lastActive,u=new Date,c=function(e,t,n){var r=Math.floor(n/P)-Math.floor(t/P);if(r>=60)return;for(var o=[],i=r,a=i+6,l=60+r;i<l;i=a,a+=6){var u=parseInt(e.substring(i>>2,-(-a>>2)),16);a<60&&(u>>=3&a),u&=63,o.push(N(u))}return o}(a,l,u),s=0===i.length?"invisible":"",f=i.join(", "),d=n.voiceActive,p=0===d.length?"invisible":"",m=d.join(", "),v=n.activityCounts,b=n.activityUsers,w=n.windowHours,x=ht(v,b,w);return o.a.createElement("div",{className:t},o.a.createElement("span",{className:"allMembers"},j(r),o.a.createElement("span",{className:"glyphicon glyphicon-user","aria-hidden":"true"}))," ",o.a.createElement("span",{className:"activeMembers ".concat(s),title:f},j(i.length),o.a.createElement("span",{className:"glyphicon glyphicon-user","aria-hidden":"true"}))," ",o.a.createElement("span",{className:"voiceMembers ".concat(p),title:m},j(d.length),o.a.createElement("span",{className:"glyphicon glyphicon-headphones","aria-hidden":"true"}))," ",c&&o.a.createElement("span",{title:x},o.a.createElement(R,{data:c,max:6,width:30,height:13}))," ",l<=0?"never":function(e){if(e<6e4){var t=Math.floor(e/1e3);return"".concat(t,"s ago")}if(e<36e5){var n=Math.floor(e/6e4);return"".concat(n,"m ago")}if(e<864e5){var r=Math.floor(e/36e5),o=Math.floor(e%36e5/6e4);return"".concat(r,"h").concat(o>0?" ".concat(o,"m"):""," ago")}var i=Math.floor(e/864e5),a=Math.floor(e%864e5/36e5);return"".concat(i,"d").concat(a>0?" ".concat(a,"h"):""," ago")}(u-l))}function ht(e,t,n){var r=e.reduce((function(e,t){return e+t}),0),o=Object.entries(t).sort((function(e,t){return t[1]-e[1]})).map((function(e){return"".concat(e[0]," ").concat(e[1])}));return"".concat(r," in the last ").concat(n,"h").concat(o.length?": "+o.join(", "):"")}function N(e){var t;for(t=0;e;t++)e&=e-1;return t}function j(e){return e<10?" "+e:e}function R(e){var t=e.data,n=e.max,r=e.width,i=e.height,a=r/t.length,l=(i-1)/n;return o.a.createElement("svg",{width:r,height:i},o.a.createElement("g",{fill:"currentColor"},o.a.createElement("rect",{x:0,y:i-1,width:r,height:1}),t.map((function(e,t){return o.a.createElement("rect",{key:t,x:t*a,y:i-e*l,width:a,height:e*l})}))))}function z(e){return(z="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function D(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function M(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function F(e,t){return(F=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function A(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=U(e);if(t){var o=U(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return I(this,n)}}function I(e,t){return!t||"object"!==z(t)&&"function"!=typeof t?L(e):t}function L(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function U(e){return(U=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function V(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}var W=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&F(e,t)}(a,e);var t,n,r,i=A(a);function a(){var e;D(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return V(L(e=i.call.apply(i,[this].concat(n))),"modalBox",o.a.createRef()),V(L(e),"handleWrapperClick",(function(t){var n=e.modalBox.current;n&&!n.contains(t.target)&&e.props.closeCallback()})),e}return t=a,(n=[{key:"render",value:function(){return o.a.createElement("div",{className:"modal",onClick:this.handleWrapperClick},o.a.createElement("div",{ref:this.modalBox},o.a.createElement("button",{className:"close-button",onClick:this.props.closeCallback},"x"),this.props.children))}}])&&M(t.prototype,n),r&&M(t,r),a}(o.a.Component);W.propTypes={closeCallback:y.a.func.isRequired};var q,B=y.a.shape({id:y.a.number.isRequired,number:y.a.number,answer:y.a.string.isRequired,is_meta:y.a.bool.isRequired,tags:y.a.string.isRequired,name:y.a.string.isRequired,note:y.a.string.isRequired}),H=y.a.shape({id:y.a.number.isRequired,number:y.a.number,name:y.a.string.isRequired,puzzle_set:y.a.arrayOf(B).isRequired});function Q(e){return(Q="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function $(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function K(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function X(e,t){return(X=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function Y(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=Z(e);if(t){var o=Z(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return J(this,n)}}function J(e,t){return!t||"object"!==Q(t)&&"function"!=typeof t?G(e):t}function G(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function Z(e){return(Z=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function ee(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}var te=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&X(e,t)}(a,e);var t,n,r,i=Y(a);function a(){var e;$(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return ee(G(e=i.call.apply(i,[this].concat(n))),"handleClose",(function(){q&&q.close(),e.props.closeCallback()})),e}return t=a,(n=[{key:"componentDidMount",value:function(){var e=this;"granted"===Notification.permission&&((q=new Notification("We solved puzzle "+this.props.puzzle.name+"!",{body:"In round "+this.props.roundNumber+": "+this.props.roundName+". Answer: "+this.props.puzzle.answer.toUpperCase(),tag:this.props.puzzle.name})).onclick=function(){window.focus(),e.props.closeCallback(),q.close()})}},{key:"render",value:function(){return o.a.createElement(W,{closeCallback:this.handleClose},o.a.createElement("div",{className:"celebration"},o.a.createElement("audio",{src:"/static/YannickLemieux-applause.mp3",autoPlay:!0}),o.a.createElement("h1",null,this.props.puzzle.name," SOLVED!!!"),o.a.createElement("p",null,"in round ",this.props.roundNumber,": ",this.props.roundName),o.a.createElement("h2",null,"Answer: ",o.a.createElement("span",{className:"answer"},this.props.puzzle.answer))))}}])&&K(t.prototype,n),r&&K(t,r),a}(o.a.Component);function ne(e){return(ne="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function re(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function oe(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function ie(e,t){return(ie=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function ae(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=ce(e);if(t){var o=ce(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return le(this,n)}}function le(e,t){return!t||"object"!==ne(t)&&"function"!=typeof t?ue(e):t}function ue(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function ce(e){return(ce=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function se(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}te.propTypes={puzzle:B.isRequired,roundName:y.a.string,roundNumber:y.a.number,closeCallback:y.a.func.isRequired};var fe=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&ie(e,t)}(a,e);var t,n,r,i=ae(a);function a(){var e;re(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return se(ue(e=i.call.apply(i,[this].concat(n))),"state",{newVal:void 0,editable:!1}),se(ue(e),"editableComponent",o.a.createRef()),se(ue(e),"editInput",o.a.createRef()),se(ue(e),"handleDocumentClick",(function(t){var n=e.editableComponent.current,r=t.target;!e.state.editable||n&&n.contains(r)||e.setState({editable:!1})})),se(ue(e),"editElement",(function(){e.setState({editable:!0},e.focus)})),se(ue(e),"onSubmit",(function(t){t.preventDefault();e.editInput.current.value!==e.props.val&&e.props.onSubmit(e.editInput.current.value),e.setState({editable:!1})})),se(ue(e),"focus",(function(){e.editInput.current.focus()})),e}return t=a,(n=[{key:"componentDidMount",value:function(){document.addEventListener("click",this.handleDocumentClick)}},{key:"componentWillUnmount",value:function(){document.removeEventListener("click",this.handleDocumentClick)}},{key:"render",value:function(){var e;return e=this.state.editable?o.a.createElement("form",{onSubmit:this.onSubmit},o.a.createElement("input",{ref:this.editInput,type:"text",defaultValue:this.props.val})):o.a.createElement("span",{title:this.props.val},this.props.val," "),o.a.createElement("div",{ref:this.editableComponent,className:this.props.className,onClick:this.editElement},e)}}])&&oe(t.prototype,n),r&&oe(t,r),a}(o.a.Component);function pe(e){return(pe="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function de(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function me(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function he(e,t){return(he=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function ye(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=be(e);if(t){var o=be(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return ge(this,n)}}function ge(e,t){return!t||"object"!==pe(t)&&"function"!=typeof t?ve(e):t}function ve(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function be(e){return(be=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function we(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}fe.propTypes={className:y.a.string,val:y.a.string,onSubmit:y.a.func.isRequired};var ke=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&he(e,t)}(a,e);var t,n,r,i=ye(a);function a(){var e;de(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return we(ve(e=i.call.apply(i,[this].concat(n))),"state",{newUrl:e.props.puzzle.url}),we(ve(e),"handleChange",(function(t){e.setState({newUrl:t.target.value})})),we(ve(e),"handleSubmit",(function(t){t.preventDefault(),e.state.newUrl&&e.props.actionCallback(e.state.newUrl),e.props.closeCallback()})),e}return t=a,(n=[{key:"render",value:function(){return o.a.createElement(W,{closeCallback:this.props.closeCallback},o.a.createElement("div",{className:"url-editor"},o.a.createElement("h3",null,"URL where puzzle ",this.props.puzzle.name," is being worked on:"),o.a.createElement("form",{onSubmit:this.handleSubmit},o.a.createElement("input",{type:"url",name:"newUrl",value:this.state.newUrl,onChange:this.handleChange}),o.a.createElement("input",{type:"submit"}))))}}])&&me(t.prototype,n),r&&me(t,r),a}(o.a.Component);function Se(e){return(Se="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function Ee(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function xe(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function Te(e,t){return(Te=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function _e(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=Oe(e);if(t){var o=Oe(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return Ce(this,n)}}function Ce(e,t){return!t||"object"!==Se(t)&&"function"!=typeof t?Pe(e):t}function Pe(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function Oe(e){return(Oe=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function Ne(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}ke.propTypes={puzzle:B.isRequired,actionCallback:y.a.func.isRequired,closeCallback:y.a.func.isRequired};var je=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&Te(e,t)}(a,e);var t,n,r,i=_e(a);function a(){var e;Ee(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return Ne(Pe(e=i.call.apply(i,[this].concat(n))),"state",{celebrating:!1,changingUrl:!1}),Ne(Pe(e),"updateUrl",(function(t){e.updateData("url",t)})),Ne(Pe(e),"updateAnswer",(function(t){e.updateData("answer",t)})),Ne(Pe(e),"updateNote",(function(t){e.updateData("note",t)})),Ne(Pe(e),"updateTags",(function(t){e.updateData("tags",t)})),Ne(Pe(e),"stopCelebrating",(function(){e.state.celebrating&&e.setState({celebrating:!1})})),Ne(Pe(e),"closeUrlModal",(function(){e.setState({changingUrl:!1})})),e}return t=a,(n=[{key:"componentDidUpdate",value:function(e){this.props.puzzle.answer&&this.props.puzzle.answer!==e.puzzle.answer?this.state.celebrating||this.setState({celebrating:!0}):""===this.props.puzzle.answer&&this.stopCelebrating()}},{key:"render",value:function(){var e,t,n,r,i,a,l,u=this.props.puzzle,c=d()({"col-lg-12":!0,puzzle:!0,meta:u.is_meta,solved:u.answer});return this.state.celebrating&&(e=o.a.createElement(te,{puzzle:u,roundNumber:this.props.parent.number,roundName:this.props.parent.name,closeCallback:this.stopCelebrating})),this.state.changingUrl&&(t=o.a.createElement(ke,{puzzle:u,actionCallback:this.updateUrl,closeCallback:this.closeUrlModal})),n=u.hunt_url?o.a.createElement("a",{className:"button",title:"View puzzle on hunt website",href:u.hunt_url,target:"_blank",rel:"noopener"},o.a.createElement("span",{className:"glyphicon glyphicon-share-alt"})):o.a.createElement("span",{className:"missing-button"}),this.props.settings.slack&&(i=this.props.uiSettings.app_links?u.slack_channel_id?"slack://channel?team=T0ESH0TS5&id=".concat(u.slack_channel_id):"https://ireproof.slack.com/app_redirect?channel=".concat(u.slug):"https://ireproof.slack.com/messages/".concat(u.slug),r=o.a.createElement("a",{title:"#".concat(u.slug),href:i,target:"_blank",rel:"noopener"},o.a.createElement("img",{className:"messaging-logo",src:"/static/Slack_Mark_Web.png",alt:"Slack"}))),this.props.settings.discord&&(a=this.props.settings.profile.discord_identifier?o.a.createElement("a",{title:"#".concat(u.slug),href:"/disc/".concat(u.id,"/").concat(Number(this.props.uiSettings.app_links)),target:"_blank",rel:"noopener"},o.a.createElement("img",{className:"messaging-logo",src:"/static/Discord-Logo-Color.png",alt:"Discord"})):o.a.createElement(C.CopyToClipboard,{text:"hb!join ".concat(u.slug)},o.a.createElement("img",{className:"messaging-logo",src:"/static/Discord-Logo-Color.png",alt:"Discord",title:"Click to copy!"}))),this.props.settings.gapps&&(l=o.a.createElement("a",{title:"#".concat(u.slug),href:"/s/".concat(u.id),target:"_blank",rel:"noopener"},o.a.createElement("img",{className:"messaging-logo",src:"/static/sheets_64dp.png",alt:"Google Sheets"}))),o.a.createElement("div",{key:u.id,className:"row"},o.a.createElement("div",{className:"col-lg-12"},e,t,o.a.createElement("div",{className:c},o.a.createElement("div",{className:"row"},o.a.createElement("div",{className:"col-xs-6 col-sm-6 col-md-4 col-lg-3 name"},n,r,a,l,o.a.createElement("span",{className:"name-text"},u.name)),o.a.createElement(fe,{className:"col-xs-6 col-sm-3 col-md-3 col-lg-2 answer editable",val:u.answer,onSubmit:this.updateAnswer}),o.a.createElement(fe,{className:"visible-md visible-lg col-md-3 col-lg-3 note editable",val:u.note,onSubmit:this.updateNote}),o.a.createElement(fe,{className:"hidden-xs col-sm-3 col-md-2 col-lg-2 tags editable",val:u.tags,onSubmit:this.updateTags}),o.a.createElement(O,{className:"visible-lg-block col-lg-2 activity",activity:{channelCount:u.channel_count,channelActive:u.channel_active,voiceActive:u.voice_active||[],activityHisto:u.activity_histo,activityCounts:u.activity_counts||[],activityUsers:u.activity_users||{},windowHours:this.props.settings.activity_window_hours,lastActive:new Date(u.last_active)}})))))}},{key:"showPuzzleUrlModal",value:function(){this.setState({changingUrl:!0})}},{key:"updateData",value:function(e,t){var n={};n[e]=t,u()("POST","/puzzles/"+this.props.puzzle.id.toString()+"/",{body:JSON.stringify(n),headers:{"X-CSRFToken":csrfToken}}).done(function(e){this.props.changeMade&&this.props.changeMade()}.bind(this))}}])&&xe(t.prototype,n),r&&xe(t,r),a}(o.a.Component);function Re(e){return(Re="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function ze(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function De(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function Me(e,t){return(Me=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function Fe(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=Le(e);if(t){var o=Le(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return Ae(this,n)}}function Ae(e,t){return!t||"object"!==Re(t)&&"function"!=typeof t?Ie(e):t}function Ie(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function Le(e){return(Le=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function Ue(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}je.propTypes={puzzle:y.a.object.isRequired,parent:y.a.object,changeMade:y.a.func,settings:y.a.object,uiSettings:y.a.object};var Ve=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&Me(e,t)}(a,e);var t,n,r,i=Fe(a);function a(){var e;ze(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return Ue(Ie(e=i.call.apply(i,[this].concat(n))),"state",{show:!0}),Ue(Ie(e),"changeMade",(function(){e.props.changeMade&&e.props.changeMade()})),Ue(Ie(e),"onCaretClick",(function(t){t.preventDefault(),e.setState({show:!e.state.show||!1})})),e}return t=a,(n=[{key:"componentDidMount",value:function(){this.allSolved()&&this.setState({show:!1})}},{key:"componentDidUpdate",value:function(e){!this.allSolved(e.round.puzzle_set)&&this.allSolved()&&this.setState({show:!1})}},{key:"render",value:function(){var e=this,t=this.props.round,n=f(t),r=this.getFilteredPuzzles();if(r.length<=0)return o.a.createElement("div",{key:t.id,className:"row"});var i=r.map((function(n){return o.a.createElement(je,{key:n.id,puzzle:n,parent:t,changeMade:e.changeMade,settings:e.props.settings,uiSettings:e.props.uiSettings})})),a=o.a.createElement("button",{onClick:this.onCaretClick},this.state.show?"v":"^"),l=o.a.createElement("h2",{id:n},"R",t.number," ",t.name," ",a);t.hunt_url&&(l=o.a.createElement("h2",{id:n},o.a.createElement("a",{href:t.hunt_url},"R",t.number," ",t.name)," ",a));var u={};this.state.show||(u.display="none");var c,s,p,d=o.a.createElement("span",{className:"missing-button"});return this.props.settings.slack&&(c=o.a.createElement("span",{className:"messaging-spacer"})),this.props.settings.discord&&(s=o.a.createElement("span",{className:"messaging-spacer"})),this.props.settings.gapps&&(p=o.a.createElement("span",{className:"messaging-spacer"})),o.a.createElement("div",{key:t.id,className:"row"},o.a.createElement("div",{className:"col-lg-12 round"},l,o.a.createElement("div",{className:"col-lg-12",style:u},o.a.createElement("div",{className:"row legend"},o.a.createElement("div",{className:"col-xs-6 col-sm-6 col-md-4 col-lg-3"},d,c,s,p,o.a.createElement("span",{className:"name-legend"},"Name")),o.a.createElement("div",{className:"col-xs-6 col-sm-3 col-md-3 col-lg-2"},"Answer"),o.a.createElement("div",{className:"visible-md visible-lg col-md-3 col-lg-3"},"Notes"),o.a.createElement("div",{className:"hidden-xs col-sm-3 col-md-2 col-lg-2"},"Tags"),o.a.createElement("div",{className:"visible-lg-block col-lg-2"},"Activity"))),o.a.createElement("div",{style:u},i)))}},{key:"allSolved",value:function(e){return(e=e||this.props.round.puzzle_set).every((function(e){return e.answer}))}},{key:"getFilteredPuzzles",value:function(){var e=this;return this.props.round.puzzle_set.filter((function(t){if(e.props.showAnswered&&!e.props.filter)return!0;var n=t.tags.toLowerCase()+" "+t.name.toLowerCase();return(e.props.showAnswered||!t.answer)&&n.indexOf(e.props.filter.toLowerCase())>=0}))}}])&&De(t.prototype,n),r&&De(t,r),a}(o.a.Component);function We(e){return(We="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function qe(){return(qe=Object.assign||function(e){for(var t=1;t<arguments.length;t++){var n=arguments[t];for(var r in n)Object.prototype.hasOwnProperty.call(n,r)&&(e[r]=n[r])}return e}).apply(this,arguments)}function Be(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function He(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function Qe(e,t){return(Qe=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function $e(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=Ye(e);if(t){var o=Ye(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return Ke(this,n)}}function Ke(e,t){return!t||"object"!==We(t)&&"function"!=typeof t?Xe(e):t}function Xe(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function Ye(e){return(Ye=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function Je(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}Ve.propTypes={round:H.isRequired,changeMade:y.a.func,filter:y.a.string.isRequired,showAnswered:y.a.bool.isRequired,settings:y.a.object,uiSettings:y.a.object};var Ge=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&Qe(e,t)}(a,e);var t,n,r,i=$e(a);function a(){var e;Be(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return Je(Xe(e=i.call.apply(i,[this].concat(n))),"state",{filter:"",showAnswered:!0}),Je(Xe(e),"changeMade",(function(){e.props.changeMade&&e.props.changeMade()})),Je(Xe(e),"changeFilter",(function(t){e.setState({filter:t})})),Je(Xe(e),"toggleAnswerStatus",(function(){e.setState({showAnswered:!e.state.showAnswered})})),e}return t=a,(n=[{key:"render",value:function(){var e=this,t=this.props.rounds.map((function(t){return o.a.createElement(Ve,qe({key:t.id,round:t,changeMade:e.changeMade,settings:e.props.settings,uiSettings:e.props.uiSettings},e.state))}));return o.a.createElement("div",null,o.a.createElement("div",{className:"row"},o.a.createElement("div",{className:"col-xs-12"},o.a.createElement(_,{uiSettings:this.props.uiSettings,updateFulltextFilter:this.changeFilter,updateAnswerFilter:this.toggleAnswerStatus,toggleLinkType:this.props.toggleLinkType}))),t.length>0?t:o.a.createElement("p",null,"No puzzles are available"))}}])&&He(t.prototype,n),r&&He(t,r),a}(o.a.Component);function dt(e,t){return e.is_meta!==t.is_meta?e.is_meta?-1:1:e.number!==t.number?null===e.number?1:null===t.number?-1:e.number-t.number:e.id-t.id}function mt(e,t){return e.number-t.number||e.id-t.id}function pt(e,t){var n=new Set(t.deleted.rounds),r=new Set(t.deleted.puzzles),o=new Map(t.puzzles.map((function(e){return[e.id,e]}))),i=new Map;e.forEach((function(e){n.has(e.id)||i.set(e.id,e)})),t.rounds.forEach((function(e){var t=i.get(e.id);i.set(e.id,tt(tt({},e),{},{puzzle_set:t?t.puzzle_set:[]}))}));var a=new Map;return i.forEach((function(e,t){a.set(t,e.puzzle_set.filter((function(e){return!r.has(e.id)&&!o.has(e.id)})))})),o.forEach((function(e){var t=a.get(e.round);t&&t.push(e)})),Array.from(i.values()).map((function(e){return tt(tt({},e),{},{puzzle_set:a.get(e.id).sort(dt)})})).sort(mt)}function yt(e,t){return t?e.map((function(e){return tt(tt({},e),{},{puzzle_set:e.puzzle_set.map((function(e){var n=t.users[e.id]||{},r={};return Object.keys(n).forEach((function(e){r[e]=n[e].reduce((function(e,t){return e+t}),0)})),tt(tt({},e),{},{activity_counts:t.puzzles[e.id]||[],activity_users:r})}))})})):e}function Ze(e){return(Ze="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function et(e,t){var n=Object.keys(e);if(Object.getOwnPropertySymbols){var r=Object.getOwnPropertySymbols(e);t&&(r=r.filter((function(t){return Object.getOwnPropertyDescriptor(e,t).enumerable}))),n.push.apply(n,r)}return n}function tt(e){for(var t=1;t<arguments.length;t++){var n=null!=arguments[t]?arguments[t]:{};t%2?et(Object(n),!0).forEach((function(t){ct(e,t,n[t])})):Object.getOwnPropertyDescriptors?Object.defineProperties(e,Object.getOwnPropertyDescriptors(n)):et(Object(n)).forEach((function(t){Object.defineProperty(e,t,Object.getOwnPropertyDescriptor(n,t))}))}return e}function nt(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function rt(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}function ot(e,t){return(ot=Object.setPrototypeOf||function(e,t){return e.__proto__=t,e})(e,t)}function it(e){var t=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Date.prototype.toString.call(Reflect.construct(Date,[],(function(){}))),!0}catch(e){return!1}}();return function(){var n,r=ut(e);if(t){var o=ut(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return at(this,n)}}function at(e,t){return!t||"object"!==Ze(t)&&"function"!=typeof t?lt(e):t}function lt(e){if(void 0===e)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function ut(e){return(ut=Object.setPrototypeOf?Object.getPrototypeOf:function(e){return e.__proto__||Object.getPrototypeOf(e)})(e)}function ct(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}Ge.propTypes={rounds:y.a.arrayOf(H.isRequired).isRequired,changeMade:y.a.func,settings:y.a.object,uiSettings:y.a.object,toggleLinkType:y.a.func.isRequired};var st=function(e){!function(e,t){if("function"!=typeof t&&null!==t)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),t&&ot(e,t)}(a,e);var t,n,r,i=it(a);function a(){var e;nt(this,a);for(var t=arguments.length,n=new Array(t),r=0;r<t;r++)n[r]=arguments[r];return ct(lt(e=i.call.apply(i,[this].concat(n))),"state",{uiSettings:{app_links:!1}}),ct(lt(e),"pollServer",(function(){e.socket&&e.socket.readyState===WebSocket.OPEN&&!(Date.now()-e.lastFullLoad>3e5)||e.loadDataFromServer()})),ct(lt(e),"connectToPushServer",(function(t){e.socket||(e.socket=new WebSocket(t),e.socket.onmessage=function(t){return e.onPushEvent(JSON.parse(t.data))},e.socket.onopen=function(){return e.loadDataFromServer()},e.socket.onclose=function(){e.socket=null,setTimeout((function(){return e.connectToPushServer(t)}),5e3)})})),ct(lt(e),"onPushEvent",(function(t){var n=t.version;t.state_version!==e.state.state_version?e.reloadState():n!==e.state.version&&e.loadDataFromServer()})),ct(lt(e),"reloadState",(function(){if(!e.stateReload){var t=Math.max(0,e.lastFullLoad+15e3-Date.now());e.stateReload=setTimeout((function(){e.stateReload=null,e.loadDataFromServer(!0)}),t)}})),ct(lt(e),"loadDataFromServer",(function(n){var t=e.state.version;!0!==n&&null!=t&&!(Date.now()-e.lastFullLoad>3e5)?u()("GET","/puzzles/changes/",{qs:{since:t}}).done((function(n){var r=JSON.parse(n.getBody());e.setState((function(e){return e.version!==t?null:r.full?{rounds:r.rounds,settings:r.settings,version:r.version,state_version:r.state_version}:{rounds:pt(e.rounds,r),settings:r.settings,version:r.version}}))})):u()("GET","/puzzles/").done((function(t){var n=JSON.parse(t.getBody());e.lastFullLoad=Date.now(),e.setState(n),n.settings.push_url&&e.connectToPushServer(n.settings.push_url)}))})),ct(lt(e),"loadActivityFromServer",(function(){u()("GET","/puzzles/activity/").done((function(t){e.setState({activity:JSON.parse(t.getBody())})}))})),ct(lt(e),"toggleLinkType",(function(){e.setState((function(e){return{uiSettings:tt(tt({},e.uiSettings),{},{app_links:!e.uiSettings.app_links})}}))})),e}return t=a,(n=[{key:"componentDidMount",value:function(){this.setState({uiSettings:s.a.get("uiSettings",{app_links:!1})}),this.loadDataFromServer(),setInterval(this.pollServer,this.props.pollInterval),this.loadActivityFromServer(),setInterval(this.loadActivityFromServer,6e4),document.addEventListener("click",(function e(){Notification.requestPermission((function(t){document.removeEventListener("click",e),"granted"===t&&console.log("Browser notifications are active.")}))}))}},{key:"componentDidUpdate",value:function(){s.a.set("uiSettings",this.state.uiSettings)}},{key:"render",value:function(){return this.state.rounds?o.a.createElement("div",null,o.a.createElement(m,{rounds:this.state.rounds,settings:this.state.settings}),o.a.createElement(Ge,{rounds:yt(this.state.rounds,this.state.activity),changeMade:this.loadDataFromServer,settings:this.state.settings,uiSettings:this.state.uiSettings,toggleLinkType:this.toggleLinkType})):null}}])&&rt(t.prototype,n),r&&rt(t,r),a}(o.a.Component),ft=o.a.createElement(st,{pollInterval:1e4});a.a.render(ft,document.getElementById("react-root"))}]);
\ No newline at end of file
@@ -3,40 +3,31 @@ from typing import Optional
 from asgiref.sync import sync_to_async
 import asyncio
 from asyncio import run, sleep, wait, get_event_loop
-from cachetools.func import ttl_cache
 from celery import shared_task
 from datetime import datetime, timezone
 from django.conf import settings
 from django.db import transaction
 import json
 import kombu.exceptions
-from lazy_object_proxy import Proxy as lazy_object
-from puzzles.discordbot import run_listener_bot, DISCORD_ANNOUNCER, do_in_discord, LEAVE_EMOJI, TRIUMPH_EMOJI
+from redis.exceptions import RedisError
+from puzzles.cache import REDIS, connect
+from puzzles.encoding import dumps, loads
+from puzzles.feed import record_changes
+from puzzles.announcer import ANNOUNCER, AnnouncerError
+from puzzles.discordbot import run_announcer_service, run_listener_bot, LEAVE_EMOJI, TRIUMPH_EMOJI
 from puzzles.models import Puzzle, Round, UserProfile
-from puzzles.spreadsheets import check_spreadsheet_service, iterate_changes, make_sheet
-from redis import Redis
+from puzzles import histogram, presence, warmpool
+from puzzles.spreadsheets import check_spreadsheet_service, claim_sheet, claim_sheets, iterate_changes, make_sheets
 import websockets
 import requests
 from bs4 import BeautifulSoup
 import logging
-from urllib.parse import urlparse
+import time
 
 BULLSHIT_CHANNEL="_herring_experimental"
 # XXX specific to the 2020 hunt
 HUNT_URL_PREFIX="https://pennypark.fun"
 
-@lazy_object
-def REDIS():
-    # Every instance of the Redis object creates its own connection pool,
-    # and Redis connections on Heroku are limited! So sharing this Redis
-    # instance is possibly important. TBH, I have no idea why we run out of
-    # Redis connections so quickly; it's possible this doesn't help at all.
-    ssl_kwargs = {}
-    url = urlparse(settings.REDIS_URL)
-    if url.scheme == "rediss":
-        ssl_kwargs["ssl_cert_reqs"] = None  # allow self-signed certificates
-    return Redis.from_url(settings.REDIS_URL, max_connections=1, **ssl_kwargs)
-
 _optional_tasks_enabled = None
 
 def optional_task(t):
@@ -75,7 +66,7 @@ def optional_task(t):
 def post_local_and_global(local_channel, local_message, global_message, local_reaction=None, global_reaction=None):
     logging.warning("tasks: post_local_and_global(%s, %s, %s, %s, %s)", local_channel, local_message, global_message, local_reaction, global_reaction)
     if settings.HERRING_ACTIVATE_DISCORD:
-        do_in_discord(DISCORD_ANNOUNCER.post_local_and_global(local_channel, local_message, global_message, local_reaction, global_reaction))
+        ANNOUNCER.call('post_local_and_global', local_channel, local_message, global_message, local_reaction, global_reaction)
 
 @optional_task
 @shared_task(rate_limit=0.5)
@@ -117,7 +108,7 @@ def create_puzzle_sheet_and_channel(self, slug):
     if settings.HERRING_ACTIVATE_GAPPS:
         if not puzzle.sheet_id:
             sheet_title = '{} - {}'.format(puzzle.round_prefix(), puzzle.name)
-            sheet_id = make_sheet(sheet_title)
+            sheet_id = claim_sheet(sheet_title)
 
             puzzle.sheet_id = sheet_id
 
@@ -125,12 +116,65 @@ def create_puzzle_sheet_and_channel(self, slug):
 
     if settings.HERRING_ACTIVATE_DISCORD:
         try:
-            do_in_discord(DISCORD_ANNOUNCER.make_puzzle_channels(puzzle))
+            ANNOUNCER.call('make_puzzle_channels', puzzle.id)
         except Exception:
             raise self.retry()
 
 
 
+@optional_task
+@shared_task(bind=True, max_retries=10, default_retry_delay=5)
+def open_round(self, round_id, slugs):
+    """
+    Does what create_puzzle_sheet_and_channel does, but for a batch of new
+    puzzles in the same round (see signals.opening_round): their sheets come
+    from the warm pool as far as it goes, and are copied in one Drive batch
+    request after that, their channels are made several at a time, and
+    they're announced together. Returns how long each stage took.
+    """
+    logging.warning("tasks: open_round(%d, %s)", round_id, slugs)
+    timings = {}
+
+    start = time.perf_counter()
+    puzzles = list(Puzzle.objects.filter(parent_id=round_id, slug__in=slugs).select_related('parent'))
+    if settings.HERRING_ACTIVATE_GAPPS:
+        titles = {
+            puzzle.slug: '{} - {}'.format(puzzle.round_prefix(), puzzle.name)
+            for puzzle in puzzles if not puzzle.sheet_id
+        }
+        sheet_ids = claim_sheets(titles)
+        updated = [puzzle for puzzle in puzzles if puzzle.slug in sheet_ids]
+        for puzzle in updated:
+            puzzle.sheet_id = sheet_ids[puzzle.slug]
+        # bulk_update doesn't send post_save, so tell the feed ourselves
+        Puzzle.objects.bulk_update(updated, ['sheet_id'])
+        record_changes(updated)
+        # Don't hold up the rest of the round for the sheets that didn't work:
+        # those puzzles go back to being set up one at a time, with their own
+        # retries.
+        missing = [puzzle for puzzle in puzzles if puzzle.slug in titles and puzzle.slug not in sheet_ids]
+        for puzzle in missing:
+            create_puzzle_sheet_and_channel.delay(puzzle.slug)
+        puzzles = [puzzle for puzzle in puzzles if puzzle not in missing]
+    timings['sheets'] = time.perf_counter() - start
+
+    if settings.HERRING_ACTIVATE_DISCORD:
+        try:
+            timings.update(ANNOUNCER.call('open_round', round_id, [puzzle.id for puzzle in puzzles], timeout=300))
+        except AnnouncerError as e:
+            # Leaving out the puzzles that are now being set up on their own.
+            # If this timed out, the announcer may have gotten some or all of
+            # the way through anyway; it skips puzzles that already have
+            # channels, so the retry won't announce those twice.
+            raise self.retry(exc=e, args=(round_id, [puzzle.slug for puzzle in puzzles]))
+
+    report = ", ".join(f"{stage} {seconds:.1f}s" for stage, seconds in timings.items())
+    logging.info(f"tasks: opened {len(puzzles)} puzzles in round {round_id}: {report}")
+    if settings.HERRING_ACTIVATE_DISCORD:
+        ANNOUNCER.send('post_message', settings.HERRING_DISCORD_DEBUG_CHANNEL, f"Opened {len(puzzles)} puzzles in round {round_id}: {report}")
+    return timings
+
+
 @optional_task
 @shared_task(bind=True, max_retries=10, default_retry_delay=5, rate_limit=0.25)
 def create_round_category(self, round_id):
@@ -144,9 +188,9 @@ def create_round_category(self, round_id):
                 logging.error("tasks: Couldn't retrieve round %d to create a Discord category", round_id, exc_info=True)
                 raise self.retry(exc=e)
             try:
-                category = do_in_discord(DISCORD_ANNOUNCER.make_category(round.name))
-                if category:
-                    round.discord_categories = str(category.id)
+                category_id = ANNOUNCER.call('make_category', round.name)
+                if category_id:
+                    round.discord_categories = str(category_id)
                     round.save()
             except Exception:
                 raise self.retry()
@@ -201,9 +245,12 @@ def check_connection_to_messaging():
     # This task is intended to run *indefinitely*. The scheduler will attempt
     # to kick it off regularly, but we only want one running at any given time;
     # more would certainly be a waste of compute and will definitely make the Discord integration work
-    # unreliably. To achieve this, we'll use Redis as a mutex.
+    # unreliably. To achieve this, we'll use Redis as a mutex. (This is also where the announcer service runs,
+    # which every other process relies on to talk to Discord.)
 
-    mutex = REDIS.lock('puzzles.tasks.check_connection_to_messaging:mutex', timeout=10)
+    # The mutex is kept on the event loop's thread, so give it its own
+    # connection rather than wait on the one sync_to_async's thread is using.
+    mutex = connect().lock('puzzles.tasks.check_connection_to_messaging:mutex', timeout=10)
 
     if not mutex.acquire(blocking=False):
         logging.info("check_connection_to_messaging: Didn't get mutex, messaging already active")
@@ -219,6 +266,7 @@ def check_connection_to_messaging():
     async def _check_connection_to_messaging():
         awaitables = [
             asyncio.create_task(run_discord_listener_bot(), name="run_discord_listener_bot"),
+            asyncio.create_task(run_discord_announcer_service(), name="run_discord_announcer_service"),
             asyncio.create_task(keep_mutex(), name="keep_mutex")
         ]
         return await asyncio.gather(*awaitables)
@@ -233,25 +281,30 @@ async def run_discord_listener_bot():
     if settings.HERRING_ACTIVATE_DISCORD and not settings.HERRING_ENABLE_STANDALONE_DISCORD:
         await run_listener_bot()
 
+async def run_discord_announcer_service():
+    if settings.HERRING_ACTIVATE_DISCORD and not settings.HERRING_ENABLE_STANDALONE_DISCORD:
+        await run_announcer_service()
+
 @shared_task(bind=True, rate_limit=0.5)
-@transaction.atomic
 def process_google_sheets_changes(self):
     logging.info("process_google_sheets_changes: Starting")
 
     if settings.HERRING_ACTIVATE_GAPPS:
+        changes = list(fetch_latest_sheet_changes())
+        puzzle_ids = dict(Puzzle.objects.filter(sheet_id__in={change.sheet_id for change in changes}).values_list('sheet_id', 'id'))
+        # Each update is atomic on its own, so there's no need to lock the
+        # puzzles (and hold up the Discord bot and web edits) while we work.
         puzzles_to_update = set()
-        for change in fetch_latest_sheet_changes():
-            try:
-                puzzle = Puzzle.objects \
-                    .select_for_update() \
-                    .get(sheet_id=change.sheet_id)
-            except Puzzle.DoesNotExist:
+        for change in changes:
+            puzzle_id = puzzle_ids.get(change.sheet_id)
+            if puzzle_id is None:
                 continue
+            if Puzzle.update_activity(puzzle_id, change.datetime):
+                puzzles_to_update.add(puzzle_id)
+            histogram.record(puzzle_id, {change.datetime.timestamp(): 1})
 
-            if puzzle.record_activity(change.datetime):
-                puzzles_to_update.add(puzzle)
-
-        Puzzle.batch_save_activity(puzzles_to_update)
+        # update() doesn't send post_save, so let the feed know ourselves.
+        record_changes([Puzzle(id=puzzle_id) for puzzle_id in puzzles_to_update])
         logging.info("process_google_sheets_changes: Finished (%d updated)", len(puzzles_to_update))
 
 
@@ -282,23 +335,102 @@ def add_user_to_puzzle(user_id, puzzle_name):
     except UserProfile.DoesNotExist:
         # oh well, we tried
         return
-    channel = do_in_discord(DISCORD_ANNOUNCER.add_user_to_puzzle(user, puzzle_name))
-    if channel is None:
-        # not sure what happened here
-        return
-    return channel.id
+    return ANNOUNCER.call('add_user_to_puzzle', user.user_id, puzzle_name)
 
 
-@ttl_cache(ttl=10)
-def get_service_status():
+# The heartbeat below runs every 30 seconds; if we haven't heard from it in
+# this long, we assume the worker running it (and so the bots) is down.
+SERVICE_STATUS_MAX_AGE = 120
+
+
+def _service_status_key():
+    return f'puzzles.tasks.service_status.{settings.HERRING_HUNT_ID}'
+
+
+@shared_task(ignore_result=True)
+def publish_service_status():
+    """
+    Checks whether Discord and Google Drive are working, and records the
+    answer in Redis for get_service_status. This is a beat task so that web
+    requests never have to wait for Discord (or start a gateway connection
+    to it just to find out).
+    """
     discord = None
     gapps = None
     if settings.HERRING_ACTIVATE_DISCORD:
-        # this has the side effect of reifying DISCORD_ANNOUNCER
-        discord = do_in_discord(DISCORD_ANNOUNCER.wait_until_really_ready(5))
+        try:
+            discord = ANNOUNCER.call('is_ready', 5, timeout=10)
+        except AnnouncerError:
+            discord = False
     if settings.HERRING_ACTIVATE_GAPPS:
         gapps = check_spreadsheet_service()
-    return {
+    status = {
         'discord': discord,
         'gapps': gapps,
+        'warm_pool': warmpool.sizes() if settings.HERRING_WARM_POOL_SIZE else None,
+        'checked_at': time.time(),
     }
+    REDIS.set(_service_status_key(), dumps(status), ex=SERVICE_STATUS_MAX_AGE)
+
+
+def get_service_status():
+    """
+    Returns the last status recorded by publish_service_status. Each service
+    is None if it isn't enabled, and otherwise whether it's working; if the
+    heartbeat has gone quiet, every enabled service counts as broken.
+    If there's a warm pool, 'warm_pool' says how many spare sheets and
+    channels are ready.
+    """
+    try:
+        cached = REDIS.get(_service_status_key())
+    except RedisError:
+        logging.warning("couldn't read the service status from Redis", exc_info=True)
+        cached = None
+    status = loads(cached) if cached is not None else {}
+    return {
+        'discord': status.get('discord', False) if settings.HERRING_ACTIVATE_DISCORD else None,
+        'gapps': status.get('gapps', False) if settings.HERRING_ACTIVATE_GAPPS else None,
+        'warm_pool': status.get('warm_pool'),
+    }
+
+
+# Only one replenish_warm_pool should be filling the pool at a time, or
+# they'd both make up the same shortfall.
+WARM_POOL_LOCK_SECONDS = 300
+
+
+@shared_task(ignore_result=True)
+def replenish_warm_pool():
+    """
+    Tops up the pool of spare sheets and channels (see puzzles/warmpool.py).
+    """
+    lock_key = f'puzzles.tasks.replenish_warm_pool.{settings.HERRING_HUNT_ID}.lock'
+    if not REDIS.set(lock_key, 1, nx=True, ex=WARM_POOL_LOCK_SECONDS):
+        return
+    try:
+        if settings.HERRING_ACTIVATE_GAPPS:
+            wanted = warmpool.shortfall('sheets')
+            if wanted:
+                sheet_ids = make_sheets({f'spare-{i}': 'Spare sheet' for i in range(wanted)})
+                warmpool.add('sheets', list(sheet_ids.values()))
+                logging.info(f"tasks: made {len(sheet_ids)} spare sheets")
+        if settings.HERRING_ACTIVATE_DISCORD:
+            wanted = warmpool.shortfall('channels')
+            if wanted:
+                channel_ids = ANNOUNCER.call('park_channels', wanted, timeout=120)
+                warmpool.add('channels', channel_ids)
+                logging.info(f"tasks: parked {len(channel_ids)} spare channels")
+    finally:
+        REDIS.delete(lock_key)
+
+
+@shared_task(ignore_result=True)
+def prune_presence():
+    """
+    Forgets who was active in each puzzle longer ago than the feed shows
+    (see puzzles.presence.prune).
+    """
+    try:
+        presence.prune()
+    except RedisError:
+        logging.warning("tasks: couldn't prune the presence index", exc_info=True)
@@ -1,11 +1,10 @@
-import json
-
 from django import template
 
+from puzzles.encoding import dumps
 from puzzles.models import to_json_value
 
 register = template.Library()
 
 @register.filter(name='to_json')
 def to_json(data):
-    return json.dumps(to_json_value(data))
+    return dumps(to_json_value(data)).decode('utf-8')
@@ -1,3 +1,933 @@
-from django.test import TestCase
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import discord
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from googleapiclient.errors import HttpError
+from redis.exceptions import RedisError
+
+from puzzles import announcer, discordbot, encoding, feed, presence, ranking, reactions, spreadsheets, warmpool
+from puzzles.management.commands.benchmark import BENCHMARKS
+from puzzles.management.commands.pushserver import is_allowed_origin
+from puzzles.discordbot import ChannelSnapshot, GuildSnapshot, _build_topic, _position_updates, layout_round, plan_cleanup
+from puzzles.cache import REDIS
+from puzzles.models import ChannelParticipation, Puzzle, Round, serialize_rounds, to_json_value
+
+
+# The hunt that tests which use Redis run as, so that they only ever see (and
+# clean up) their own keys in the Redis at REDIS_URL, never the real hunt's.
+# (The benchmark command uses -1.)
+TEST_HUNT_ID = -2
+
+
+def make_round(number, num_puzzles):
+    # Puzzles made in tests never see their transaction commit, so this
+    # doesn't set off the tasks that make sheets and channels for them.
+    # (The models' hunt_id defaults are fixed at import, before any
+    # override_settings, so this passes it explicitly.)
+    hunt_id = settings.HERRING_HUNT_ID
+    round = Round.objects.create(name=f'Round {number}', number=number, hunt_url=f'https://hunt.example/round{number}',
+                                 hunt_id=hunt_id)
+    # a meta numbered after the rest, which should still come first, and a puzzle with no number
+    numbers = [99, None] + list(range(2, num_puzzles))
+    for i in range(num_puzzles):
+        Puzzle.objects.create(parent=round, name=f'Puzzle {number}.{i}', number=numbers[i], is_meta=(i == 0),
+                              hunt_id=hunt_id)
+    return round
+
+
+def clear_test_redis():
+    # every module's keys look like puzzles.<module>.<hunt id>[.<name>]
+    for pattern in [f'puzzles.*.{TEST_HUNT_ID}', f'puzzles.*.{TEST_HUNT_ID}.*']:
+        keys = list(REDIS.scan_iter(match=pattern))
+        if keys:
+            REDIS.delete(*keys)
+
+
+@override_settings(HERRING_HUNT_ID=TEST_HUNT_ID)
+class RedisTestCase(TestCase):
+    """
+    For tests of anything kept in Redis. Each test starts with none of the
+    test hunt's keys, and removes any it leaves behind.
+    """
+    def setUp(self):
+        clear_test_redis()
+        self.addCleanup(clear_test_redis)
+
+
+class FeedTestCase(RedisTestCase):
+    """
+    For tests of the hunt feed. Each test starts from an empty feed, and runs
+    the on_commit callbacks that update it whenever it asks to.
+    """
+    def commit(self):
+        # Django runs each test in a transaction that never commits, so this
+        # stands in for the commit, for the writes made inside it.
+        return self.captureOnCommitCallbacks(execute=True)
+
+
+class SerializeRoundsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        make_round(2, 4)
+        make_round(1, 3)
+        make_round(3, 0)
+        # updated in bulk, since answers saved one at a time get announced
+        Puzzle.objects.filter(number=2).update(answer='ANSWER', tags='tag', note='a note', activity_tracker=0x123456789abc)
+
+    def rounds(self):
+        return Round.objects.filter(hunt_id=settings.HERRING_HUNT_ID)
+
+    def test_matches_serializing_one_by_one(self):
+        self.assertEqual(serialize_rounds(self.rounds()), [round.to_json() for round in self.rounds()])
+
+    def test_two_queries(self):
+        with self.assertNumQueries(2):
+            serialize_rounds(self.rounds())
+
+
+@skipUnless(encoding.orjson, "orjson isn't installed")
+class EncodingTests(TestCase):
+    """
+    The json module fallback should encode everything we send exactly as
+    orjson does.
+    """
+    def check(self, data):
+        encoded = encoding.orjson.dumps(data)
+        self.assertEqual(encoding._stdlib_dumps(data), encoded)
+        self.assertEqual(encoding._stdlib_loads(encoded), encoding.orjson.loads(encoded))
+
+    def test_values(self):
+        self.check({
+            'str': 'caf\u00e9 \u2603 "quoted" \\ \n',
+            'int': -12345678901234,
+            'float': 0.1,
+            'bools': [True, False, None],
+            'nested': {'list': [1, [2, {}], []]},
+            'datetime': datetime(2023, 1, 13, 12, 0, 30, 250000, tzinfo=timezone.utc),
+            'whole_second': datetime(2023, 1, 13, 12, 0, 30, tzinfo=timezone(timedelta(hours=-5))),
+        })
+
+    def test_feed(self):
+        round = make_round(1, 3)
+        Puzzle.objects.filter(parent=round).update(last_active=datetime(2023, 1, 13, 12, 0, 30, 250000, tzinfo=timezone.utc),
+                                                   answer='ANSWER', note='n\u00f6te')
+        self.check(to_json_value(Round.objects.all()))
+
+
+class UpdateActivityTests(TestCase):
+    """
+    Puzzle.update_activity should leave the database just as record_activity
+    would leave the model.
+    """
+    START = datetime(2023, 1, 13, 12, 0, 30, 250000, tzinfo=timezone.utc)
+    PERIOD = timedelta(seconds=Puzzle.ACTIVITY_PERIOD_SECONDS)
+
+    def setUp(self):
+        self.puzzle = make_round(1, 1).puzzle_set.get()
+        Puzzle.objects.filter(id=self.puzzle.id).update(last_active=self.START, activity_tracker=0)
+        self.puzzle.refresh_from_db()
+
+    def check(self, offsets):
+        expected = Puzzle.objects.get(id=self.puzzle.id)
+        for offset in offsets:
+            dt = self.START + offset
+            with self.subTest(dt=dt):
+                changed = expected.record_activity(dt)
+                self.assertEqual(Puzzle.update_activity(self.puzzle.id, dt), changed)
+                self.puzzle.refresh_from_db()
+                self.assertEqual((self.puzzle.last_active, self.puzzle.activity_tracker),
+                                 (expected.last_active, expected.activity_tracker))
+
+    def test_moving_forward(self):
+        self.check([
+            timedelta(0),
+            timedelta(seconds=10),
+            self.PERIOD,
+            self.PERIOD * 3 + timedelta(seconds=1),
+            self.PERIOD * 40,
+            # shifts the oldest bits off the end of the window
+            self.PERIOD * 61,
+            # far enough that every bit is shifted out
+            self.PERIOD * (61 + Puzzle.ACTIVITY_PERIODS),
+            self.PERIOD * (62 + Puzzle.ACTIVITY_PERIODS * 2),
+        ])
+
+    def test_earlier_activity(self):
+        self.check([
+            self.PERIOD * Puzzle.ACTIVITY_PERIODS,
+            self.PERIOD * 50,
+            # bits above 31, to make sure the database doesn't shift in 32 bits
+            self.PERIOD * 2,
+            timedelta(0),
+            # out of the window, so it changes nothing
+            -self.PERIOD,
+            # already set
+            self.PERIOD * 50,
+            self.PERIOD * Puzzle.ACTIVITY_PERIODS - timedelta(seconds=1),
+        ])
+
+
+class GetSnapshotTests(FeedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.round = make_round(1, 2)
+
+    def get_snapshot(self):
+        with mock.patch.object(feed, 'build_snapshot', wraps=feed.build_snapshot) as build:
+            version, rounds = feed.get_snapshot()
+        return version, [puzzle['name'] for puzzle in rounds[0]['puzzle_set']], build.called
+
+    def rename_first(self, name):
+        puzzle = self.round.puzzle_set.first()
+        puzzle.name = name
+        puzzle.save()
+
+    def test_cached(self):
+        self.assertEqual(self.get_snapshot(), (0, ['Puzzle 1.0', 'Puzzle 1.1'], True))
+        self.assertEqual(self.get_snapshot(), (0, ['Puzzle 1.0', 'Puzzle 1.1'], False))
+
+    def test_rebuilt_after_change(self):
+        self.get_snapshot()
+        with self.commit():
+            self.rename_first('Renamed')
+        self.assertEqual(self.get_snapshot(), (1, ['Renamed', 'Puzzle 1.1'], True))
+        self.assertEqual(self.get_snapshot(), (1, ['Renamed', 'Puzzle 1.1'], False))
+
+    def test_not_bumped_before_commit(self):
+        self.get_snapshot()
+        self.rename_first('Renamed')
+        self.assertEqual(self.get_snapshot(), (0, ['Puzzle 1.0', 'Puzzle 1.1'], False))
+
+    def test_stale_snapshot(self):
+        # tagged with an older version, as if something changed while it was being built
+        self.get_snapshot()
+        Round.objects.filter(id=self.round.id).update(name='Renamed')
+        REDIS.incr(feed._key('version'))
+        version, rounds = feed.get_snapshot()
+        self.assertEqual((version, rounds[0]['name']), (1, 'Renamed'))
+
+    def test_without_redis(self):
+        with mock.patch.object(REDIS, 'mget', side_effect=RedisError), self.assertLogs(level='WARNING'):
+            self.assertEqual(self.get_snapshot(), (None, ['Puzzle 1.0', 'Puzzle 1.1'], True))
+
+
+class PuzzlesETagTests(FeedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.round = make_round(1, 3)
+        cls.user = User.objects.create_user('solver', password='password')
+        cls.other_user = User.objects.create_user('other', password='password')
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def get(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get('/puzzles/', **headers)
+
+    def test_not_modified(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header('ETag'))
+        with mock.patch('puzzles.views.get_snapshot') as get_snapshot:
+            response = self.get(response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        get_snapshot.assert_not_called()
+
+    def test_puzzle_change(self):
+        etag = self.get()['ETag']
+        with self.commit():
+            puzzle = self.round.puzzle_set.first()
+            puzzle.name = 'Renamed'
+            puzzle.save()
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_state_change(self):
+        etag = self.get()['ETag']
+        with self.commit():
+            ChannelParticipation.objects.create(channel_puzzle=self.round.puzzle_set.first(), user_id='1', is_member=True)
+        self.assertEqual(self.get(etag).status_code, 200)
+
+    def test_per_user(self):
+        etag = self.get()['ETag']
+        self.client.force_login(self.other_user)
+        self.assertEqual(self.get(etag).status_code, 200)
+
+
+class GetChangesTests(FeedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.round = make_round(1, 3)
+        cls.puzzles = list(cls.round.puzzle_set.all())
+
+    def rename(self, instance, name):
+        with self.commit():
+            instance.name = name
+            instance.save()
+
+    def test_changed_puzzle(self):
+        self.rename(self.puzzles[1], 'Renamed')
+        changes = feed.get_changes(0)
+        self.assertEqual(changes['version'], 1)
+        self.assertEqual(changes['rounds'], [])
+        self.assertEqual([(puzzle['id'], puzzle['name'], puzzle['round']) for puzzle in changes['puzzles']],
+                         [(self.puzzles[1].id, 'Renamed', self.round.id)])
+        self.assertEqual(changes['deleted'], {'rounds': [], 'puzzles': []})
+
+    def test_changed_round(self):
+        self.rename(self.round, 'Renamed')
+        changes = feed.get_changes(0)
+        self.assertEqual(changes['rounds'], [{'id': self.round.id, 'name': 'Renamed', 'number': 1, 'hunt_url': self.round.hunt_url}])
+        self.assertEqual(changes['puzzles'], [])
+
+    def test_deleted_puzzle(self):
+        puzzle_id = self.puzzles[2].id
+        with self.commit():
+            self.puzzles[2].delete()
+        self.assertEqual(feed.get_changes(0)['deleted'], {'rounds': [], 'puzzles': [puzzle_id]})
+
+    def test_only_since(self):
+        self.rename(self.puzzles[0], 'First')
+        self.rename(self.puzzles[1], 'Second')
+        self.assertEqual([puzzle['id'] for puzzle in feed.get_changes(1)['puzzles']], [self.puzzles[1].id])
+        self.assertEqual(feed.get_changes(2)['puzzles'], [])
+
+    def test_too_old(self):
+        with mock.patch.object(feed, 'CHANGE_LOG_LENGTH', 2):
+            for i, puzzle in enumerate(self.puzzles):
+                self.rename(puzzle, f'Renamed {i}')
+        self.assertIsNone(feed.get_changes(0))
+        self.assertEqual(len(feed.get_changes(1)['puzzles']), 2)
+
+    def test_from_the_future(self):
+        # e.g. because Redis was flushed
+        self.assertIsNone(feed.get_changes(1))
+
+    def test_view_falls_back_to_snapshot(self):
+        self.client.force_login(User.objects.create_user('solver'))
+        self.rename(self.puzzles[0], 'Renamed')
+        data = self.client.get('/puzzles/changes/', {'since': 5}).json()
+        self.assertTrue(data['full'])
+        self.assertEqual(data['version'], 1)
+        self.assertEqual(data['rounds'][0]['puzzle_set'][0]['name'], 'Renamed')
+
+        data = self.client.get('/puzzles/changes/', {'since': 0}).json()
+        self.assertFalse(data['full'])
+        self.assertEqual([puzzle['name'] for puzzle in data['puzzles']], ['Renamed'])
+
+
+def text_channel(id, name, category_id, position, topic=None, last_message_id=None):
+    return ChannelSnapshot(id, name, discord.ChannelType.text, category_id, position, topic, last_message_id)
+
+
+def voice_channel(id, name, category_id, position):
+    return ChannelSnapshot(id, name, discord.ChannelType.voice, category_id, position, None, None)
+
+
+class PresenceTests(RedisTestCase):
+    def setUp(self):
+        super().setUp()
+        REDIS.set(presence._key('ready'), 1)
+        now = datetime.now(timezone.utc)
+        with self.captureOnCommitCallbacks(execute=True):
+            presence.record_activity('p1', 'alice#1', 'Alice', now - timedelta(minutes=5))
+            presence.record_activity('p1', 'bob#2', 'Bob', now - presence.ACTIVE_WINDOW - timedelta(minutes=1))
+            presence.record_activity('p1', 'carol#3', None, now)
+            presence.record_activity('p2', 'bob#2', 'Bob', now - presence.ACTIVE_WINDOW - timedelta(minutes=5))
+
+    def test_get_active_users(self):
+        self.assertEqual(presence.get_active_users(), {'p1': ['carol', 'Alice']})
+        # reading leaves the stale entries for prune
+        self.assertEqual(REDIS.zcard(presence._key('active')), 4)
+
+    def test_prune(self):
+        presence.prune()
+        self.assertEqual(REDIS.zcard(presence._key('active')), 2)
+        self.assertEqual(set(REDIS.hkeys(presence._key('names'))), {b'alice#1', b'carol#3'})
+        self.assertEqual(presence.get_active_users(), {'p1': ['carol', 'Alice']})
+
+
+class ActivityBufferTests(SimpleTestCase):
+    START = datetime(2023, 1, 13, 12, 0, 30, tzinfo=timezone.utc)
+
+    def setUp(self):
+        self.buffer = discordbot.ActivityBuffer()
+        self.alice = SimpleNamespace(id=1, display_name='Alice')
+        self.bob = SimpleNamespace(id=2, display_name='Bob')
+
+    def test_merge(self):
+        self.buffer.add('p1', self.alice, self.START + timedelta(seconds=20))
+        self.buffer.add('p1', self.alice, self.START + timedelta(seconds=10))
+        # seen late, after a rename
+        self.buffer.add('p1', SimpleNamespace(id=1, display_name='Renamed'), self.START)
+        self.buffer.add('p1', self.alice, self.START + timedelta(minutes=1))
+        self.buffer.add('p1', self.bob, self.START)
+        self.buffer.add('p2', self.alice, self.START)
+        entries, _ = self.buffer.take()
+        self.assertEqual(set(entries), {('p1', '1'), ('p1', '2'), ('p2', '1')})
+        entry = entries[('p1', '1')]
+        self.assertEqual(entry['count'], 4)
+        self.assertEqual((entry['last_active'], entry['display_name']), (self.START + timedelta(minutes=1), 'Alice'))
+        minute = int(self.START.timestamp()) // 60
+        self.assertEqual(dict(entry['minute_counts']), {minute: 3, minute + 1: 1})
+        self.assertEqual(set(entry['dts']), {minute, minute + 1})
+        self.assertEqual(self.buffer.take(), ({}, 0.0))
+
+    def test_put_back(self):
+        self.buffer.add('p1', self.alice, self.START)
+        self.buffer.add('p2', self.bob, self.START)
+        entries, _ = self.buffer.take()
+        self.buffer.add('p1', SimpleNamespace(id=1, display_name='Renamed'), self.START + timedelta(minutes=1))
+        self.buffer.put_back(entries)
+        entries, _ = self.buffer.take()
+        self.assertEqual(set(entries), {('p1', '1'), ('p2', '2')})
+        entry = entries[('p1', '1')]
+        self.assertEqual(entry['count'], 2)
+        self.assertEqual(sum(entry['minute_counts'].values()), 2)
+        # what came in since the failed flush wins
+        self.assertEqual((entry['last_active'], entry['display_name']), (self.START + timedelta(minutes=1), 'Renamed'))
+
+    def test_failed_flush(self):
+        cog = SimpleNamespace(activity=self.buffer)
+        flush = async_to_sync(discordbot.HerringCog.flush_activity_now)
+        self.buffer.add('p1', self.alice, self.START)
+        with mock.patch.object(discordbot, '_save_activity_batch', mock.AsyncMock(side_effect=RuntimeError)), \
+                self.assertLogs(level='ERROR'):
+            flush(cog)
+        self.assertEqual(set(self.buffer.entries), {('p1', '1')})
+        self.assertEqual(self.buffer.stats['flushes'], 0)
+
+        with mock.patch.object(discordbot, '_save_activity_batch', mock.AsyncMock()) as save:
+            flush(cog)
+        self.assertEqual(set(save.await_args.args[0]), {('p1', '1')})
+        self.assertEqual(self.buffer.entries, {})
+        self.assertEqual((self.buffer.stats['flushes'], self.buffer.stats['messages']), (1, 1))
+
+
+def discord_channel(cls, channel_id, name):
+    channel = mock.Mock(spec=cls, id=channel_id)
+    channel.name = name
+    return channel
+
+
+class PuzzleChannelMapTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recorded, cls.unrecorded = make_round(1, 2).puzzle_set.all()
+        Puzzle.objects.filter(id=cls.recorded.id).update(discord_text_channel_id=10, discord_voice_channel_id=11)
+
+    def setUp(self):
+        self.map = discordbot.PuzzleChannelMap()
+        self.channels = {
+            'recorded': discord_channel(discord.TextChannel, 10, 'renamed'),
+            'recorded_voice': discord_channel(discord.VoiceChannel, 11, self.recorded.slug),
+            # the recorded puzzle's name, but not its channel
+            'impostor': discord_channel(discord.TextChannel, 12, self.recorded.slug),
+            'unrecorded': discord_channel(discord.TextChannel, 20, self.unrecorded.slug),
+            'other': discord_channel(discord.TextChannel, 30, 'general'),
+        }
+        self.category = discord_channel(discord.CategoryChannel, 40, self.unrecorded.slug)
+
+    def lookup(self, channel):
+        return async_to_sync(self.map.lookup)(channel)
+
+    def test_warm(self):
+        guild = SimpleNamespace(channels=list(self.channels.values()) + [self.category])
+        async_to_sync(self.map.warm)(guild)
+        self.assertEqual(self.map.slugs, {10: self.recorded.slug, 11: self.recorded.slug, 20: self.unrecorded.slug})
+        self.assertEqual(set(self.map.not_puzzles), {12, 30})
+        with mock.patch.object(discordbot, '_find_puzzle_slug_for_channel') as find:
+            for name, channel in self.channels.items():
+                with self.subTest(channel=name):
+                    self.assertEqual(self.lookup(channel), self.map.slugs.get(channel.id))
+        find.assert_not_called()
+
+    def test_lookup(self):
+        find = mock.AsyncMock(wraps=discordbot._find_puzzle_slug_for_channel)
+        with mock.patch.object(discordbot, '_find_puzzle_slug_for_channel', find):
+            self.assertEqual(self.lookup(self.channels['recorded']), self.recorded.slug)
+            self.assertEqual(self.lookup(self.channels['recorded']), self.recorded.slug)
+            self.assertEqual(find.await_count, 1)
+
+            # not a puzzle channel, and remembered as such
+            self.assertIsNone(self.lookup(self.channels['impostor']))
+            self.assertIsNone(self.lookup(self.channels['impostor']))
+            self.assertEqual(find.await_count, 2)
+
+    def test_forget_slug(self):
+        # a message in a puzzle's channel before the puzzle itself is saved
+        Puzzle.objects.filter(id=self.unrecorded.id).delete()
+        self.assertIsNone(self.lookup(self.channels['unrecorded']))
+        make_round(2, 0)
+        Puzzle.objects.create(parent=Round.objects.get(number=2), name=self.unrecorded.name,
+                              slug=self.unrecorded.slug, hunt_id=settings.HERRING_HUNT_ID)
+        self.assertIsNone(self.lookup(self.channels['unrecorded']))
+        self.map.forget_slug(self.unrecorded.slug)
+        self.assertEqual(self.lookup(self.channels['unrecorded']), self.unrecorded.slug)
+
+
+class ComputeRankingTests(SimpleTestCase):
+    P = Puzzle.ACTIVITY_PERIOD_SECONDS
+    # at the start of a period, so last_active=NOW means 0 periods ago
+    NOW = 1673611200 // P * P
+
+    def puzzle(self, id, tracker, idle_seconds, answer=''):
+        return {'id': id, 'slug': f'p{id}', 'name': f'Puzzle {id}', 'round': 'Round 1', 'answer': answer,
+                'activity_tracker': tracker,
+                'last_active': datetime.fromtimestamp(self.NOW - idle_seconds, timezone.utc)}
+
+    def rank(self, puzzles, active_users=None):
+        ranked = ranking.compute_ranking(puzzles, active_users or {}, self.NOW)
+        return [entry['id'] for entry in ranked['hottest']], [entry['id'] for entry in ranked['needs_attention']], ranked
+
+    def test_order(self):
+        puzzles = [
+            # activity an hour ago
+            self.puzzle(1, 0b111, 3600),
+            # nothing in the last two hours
+            self.puzzle(2, 0, 3 * 3600),
+            # busy right now
+            self.puzzle(3, 0b111, 0),
+            # one message right now
+            self.puzzle(4, 0b1, 0),
+            # solved, so not ranked at all
+            self.puzzle(5, 0b111, 0, answer='DONE'),
+            self.puzzle(6, 0, 2 * 3600),
+        ]
+        hottest, needs_attention, _ = self.rank(puzzles, {'p1': ['Alice'], 'p3': ['Bob']})
+        self.assertEqual(hottest, [3, 4, 1])
+        # nobody in them first, then whatever's been idle longest
+        self.assertEqual(needs_attention, [2, 6, 4, 1, 3])
+
+    def test_scores(self):
+        # each bit counts half as much for every HALF_LIFE_SECONDS before now
+        trackers = [0b1, 0b10, 1 << (Puzzle.ACTIVITY_PERIODS - 1), 0b1011, (1 << Puzzle.ACTIVITY_PERIODS) - 1]
+        for idle in [0, self.P, 1000]:
+            puzzles = [self.puzzle(i, tracker, idle) for i, tracker in enumerate(trackers)]
+            _, _, ranked = self.rank(puzzles)
+            scores = {entry['id']: entry['score'] for entry in ranked['hottest']}
+            for i, tracker in enumerate(trackers):
+                with self.subTest(tracker=bin(tracker), idle=idle):
+                    # counted in whole periods, by when they start
+                    periods_ago = self.NOW // self.P - (self.NOW - idle) // self.P
+                    expected = sum(0.5 ** ((periods_ago + k) * self.P / ranking.HALF_LIFE_SECONDS)
+                                   for k in range(Puzzle.ACTIVITY_PERIODS) if tracker >> k & 1)
+                    self.assertAlmostEqual(scores[i], expected, places=3)
+
+    def test_nothing_unsolved(self):
+        self.assertEqual(self.rank([self.puzzle(1, 0b1, 0, answer='DONE')])[:2], ([], []))
+
+
+class GetRankingTests(FeedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.round = make_round(1, 2)
+
+    def test_cached(self):
+        with mock.patch.object(ranking, '_build_ranking', wraps=ranking._build_ranking) as build:
+            first = ranking.get_ranking()
+            self.assertEqual(ranking.get_ranking(), first)
+            self.assertEqual(build.call_count, 1)
+            with self.commit():
+                Puzzle.objects.filter(parent=self.round).first().save()
+            ranking.get_ranking()
+            self.assertEqual(build.call_count, 2)
+
+
+class PlanCleanupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.round = make_round(1, 3)
+        cls.empty_round = make_round(2, 0)
+        Round.objects.filter(id=cls.round.id).update(discord_categories='100')
+        cls.round.refresh_from_db()
+
+    def puzzles(self):
+        return list(self.round.puzzle_set.all())
+
+    def channels_in_place(self, puzzles):
+        """
+        Returns snapshots of text and voice channels for the given puzzles, all where they belong, with the right
+        topics.
+        """
+        layout = layout_round(self.puzzles(), 1)
+        channels = {}
+        for puzzle in puzzles:
+            _, position = layout[puzzle.id]
+            channels[puzzle.id] = (text_channel(puzzle.id * 10, puzzle.slug, 100, position, topic=_build_topic(puzzle)),
+                                   voice_channel(puzzle.id * 10 + 1, puzzle.slug, 100, position))
+        return channels
+
+    def plan(self, categories, puzzle_channels, rounds=None):
+        snapshot = GuildSnapshot(categories, puzzle_channels)
+        rounds = rounds if rounds is not None else [self.round]
+        puzzles = [puzzle for round in rounds for puzzle in round.puzzle_set.all()]
+        return plan_cleanup(snapshot, rounds, puzzles, protected_categories={200})
+
+    def kinds(self, plan):
+        return [(action.kind, action.target) for action in plan.actions]
+
+    def test_nothing_to_do(self):
+        puzzle_channels = self.channels_in_place(self.puzzles())
+        categories = {100: ('Round 1', [channel for pair in puzzle_channels.values() for channel in pair])}
+        plan = self.plan(categories, puzzle_channels)
+        self.assertEqual(self.kinds(plan), [('record_channels', puzzle) for puzzle in self.puzzles()])
+        self.assertEqual(plan.skipped, [])
+        self.assertEqual(plan.layouts, {self.round.id: [100]})
+
+    def test_stray_channels(self):
+        puzzle_channels = self.channels_in_place(self.puzzles())
+        categories = {
+            100: ('Round 1', [
+                text_channel(1, 'r1-gone', 100, 50),
+                text_channel(2, 'r1-chatty', 100, 51, last_message_id=1234),
+                text_channel(3, 'not-a-puzzle', 100, 52),
+            ]),
+            # left alone, however puzzle-like
+            200: ('Protected', [text_channel(4, 'r1-protected', 200, 1)]),
+        }
+        plan = self.plan(categories, puzzle_channels)
+        self.assertEqual([(action.kind, action.target) for action in plan.actions if action.stage == 'delete'], [('delete_channel', 1)])
+        # reported, but not deleted
+        self.assertEqual(len(plan.skipped), 2)
+        self.assertIn('r1-chatty', plan.skipped[0])
+        self.assertIn('not-a-puzzle', plan.skipped[1])
+
+    def test_missing_and_misplaced_channels(self):
+        meta, first, second = self.puzzles()
+        puzzle_channels = self.channels_in_place([meta, first])
+        text, voice = puzzle_channels[first.id]
+        puzzle_channels[first.id] = (text._replace(topic='old topic'), voice)
+        plan = self.plan({100: ('Round 1', [])}, puzzle_channels)
+        self.assertEqual(self.kinds(plan), [
+            ('record_channels', meta),
+            ('edit_channel', (text.id, {'topic': _build_topic(first)})),
+            ('record_channels', first),
+            ('create_channels', (second, self.round.id, 0)),
+            ('record_channels', second),
+            ('arrange_round', (self.round.id, [meta, first, second])),
+        ])
+
+    def test_moved_channel_is_arranged(self):
+        puzzle_channels = self.channels_in_place(self.puzzles())
+        meta = self.puzzles()[0]
+        text, voice = puzzle_channels[meta.id]
+        puzzle_channels[meta.id] = (text._replace(position=7), voice)
+        plan = self.plan({100: ('Round 1', [])}, puzzle_channels)
+        self.assertEqual(self.kinds(plan)[-1], ('arrange_round', (self.round.id, self.puzzles())))
+
+    def test_missing_categories(self):
+        plan = self.plan({}, {}, rounds=[self.empty_round])
+        self.assertEqual(self.kinds(plan), [
+            ('create_category', (self.empty_round.id, 0, self.empty_round.name)),
+            ('save_categories', self.empty_round),
+        ])
+        self.assertEqual(plan.layouts, {self.empty_round.id: [None]})
+
+
+class LayoutRoundTests(SimpleTestCase):
+    def puzzle(self, id, number=None, is_meta=False):
+        return SimpleNamespace(id=id, number=number, is_meta=is_meta)
+
+    def test_order(self):
+        puzzles = [self.puzzle(1, 3), self.puzzle(2, 1), self.puzzle(3, 9, is_meta=True), self.puzzle(4)]
+        # metas first, then by number, or by id where there's no number
+        self.assertEqual(layout_round(puzzles, 1), {3: (0, 1), 2: (0, 2), 1: (0, 3), 4: (0, 4)})
+
+    def test_categories(self):
+        puzzles = [self.puzzle(id, id) for id in range(1, 6)]
+        with mock.patch.object(discordbot, 'PUZZLES_PER_CATEGORY', 2):
+            self.assertEqual([category for category, _ in layout_round(puzzles, 3).values()], [0, 0, 1, 1, 2])
+            # the last category takes whatever doesn't fit
+            self.assertEqual([category for category, _ in layout_round(puzzles, 2).values()], [0, 0, 1, 1, 1])
+
+    def test_position_updates(self):
+        layout = {1: (0, 1), 2: (0, 2), 3: (1, 3)}
+        channel_pairs = {
+            # already in place
+            1: (text_channel(10, 'r1-one', 100, 1), voice_channel(11, 'r1-one', 100, 1)),
+            # in the right category, but out of order, and with no voice channel
+            2: (text_channel(20, 'r1-two', 100, 5), None),
+            # in the wrong category
+            3: (text_channel(30, 'r1-three', 100, 3), voice_channel(31, 'r1-three', 200, 3)),
+        }
+        self.assertEqual(_position_updates(layout, [100, 200], channel_pairs), [
+            {'id': 20, 'parent_id': 100, 'position': 2},
+            {'id': 30, 'parent_id': 200, 'position': 3},
+        ])
+
+
+@override_settings(ALLOWED_HOSTS=['*'], HERRING_PUSH_ALLOWED_ORIGINS=['https://herring.example'])
+class PushOriginTests(SimpleTestCase):
+    def test_is_allowed_origin(self):
+        self.assertTrue(is_allowed_origin({'Origin': 'https://herring.example'}))
+        self.assertTrue(is_allowed_origin({'Origin': 'HTTPS://Herring.Example/'}))
+        self.assertFalse(is_allowed_origin({'Origin': 'http://herring.example'}))
+        self.assertFalse(is_allowed_origin({'Origin': 'https://herring.example:8443'}))
+        self.assertFalse(is_allowed_origin({'Origin': 'https://evil.example'}))
+        self.assertFalse(is_allowed_origin({}))
+
+
+class ResolveMemberTests(TestCase):
+    """
+    In REST-only mode, channel overwrites name everyone by ID alone, and the
+    announcer has to look them up itself.
+    """
+    def setUp(self):
+        self.known = SimpleNamespace(id=1, display_name='Known')
+        self.fetched = SimpleNamespace(id=2, display_name='Fetched')
+
+        async def fetch_member(member_id):
+            if member_id == self.fetched.id:
+                return self.fetched
+            raise discord.NotFound(SimpleNamespace(status=404, reason='Not Found'), 'Unknown Member')
+
+        self.bot = SimpleNamespace(rest_only=True, members={self.known.id: self.known},
+                                   guild=SimpleNamespace(fetch_member=fetch_member))
+
+    def resolve(self, member_id):
+        target = discord.Object(id=member_id, type=discord.User)
+        return asyncio.run(discordbot.HerringAnnouncerBot.resolve_member(self.bot, target))
+
+    def test_resolve_member(self):
+        self.assertIs(self.resolve(1), self.known)
+        self.assertIs(self.resolve(2), self.fetched)
+        self.assertIs(self.bot.members[2], self.fetched)
+        # they left the server
+        self.assertIsNone(self.resolve(3))
+
+    def test_is_role(self):
+        self.assertTrue(discordbot._is_role(discord.Object(id=4, type=discord.Role)))
+        self.assertFalse(discordbot._is_role(discord.Object(id=5, type=discord.User)))
+        self.assertFalse(discordbot._is_role(self.known))
+
+    def test_unresolved_member(self):
+        puzzle = make_round(1, 1).puzzle_set.get()
+        discordbot._update_channel_participation_inner(puzzle, [self.known, discord.Object(id=6, type=discord.User)])
+        self.assertEqual(dict(puzzle.channelparticipation_set.values_list('user_id', 'display_name')),
+                         {'1': 'Known', '6': None})
+        self.assertEqual(puzzle.channel_count, 2)
+
+
+class OpenRoundTests(RedisTestCase):
+    """
+    The announcer's open_round, with Discord faked out.
+    """
+    def setUp(self):
+        super().setUp()
+        self.round = make_round(1, 3)
+        self.puzzles = list(self.round.puzzle_set.all())
+        category = SimpleNamespace(id=100)
+        ready = asyncio.Event()
+        ready.set()
+        self.bot = SimpleNamespace(
+            _really_ready=ready, channels=None, channel_creation_locks={}, http=None,
+            ensure_category_ready=mock.AsyncMock(return_value=(self.round, category)),
+            arrange_round=mock.AsyncMock(),
+            announce_channel=SimpleNamespace(send=mock.AsyncMock(return_value=SimpleNamespace(id=1234))),
+        )
+
+    def open_round(self):
+        async def make_channels(category, puzzle, *args):
+            return SimpleNamespace(mention=f'#{puzzle.slug}'), None
+
+        with mock.patch.object(discordbot, '_make_puzzle_channels_inner', side_effect=make_channels) as make:
+            async_to_sync(discordbot.HerringAnnouncerBot.open_round)(
+                self.bot, self.round.id, [puzzle.id for puzzle in self.puzzles])
+        return [puzzle.slug for _, puzzle, *_ in (call.args for call in make.call_args_list)]
+
+    def test_open_round(self):
+        self.assertEqual(self.open_round(), [puzzle.slug for puzzle in self.puzzles])
+        self.bot.announce_channel.send.assert_awaited_once()
+
+    def test_skips_puzzles_with_channels(self):
+        # as if an earlier try got this far before the task stopped waiting for it
+        Puzzle.objects.filter(id=self.puzzles[0].id).update(discord_text_channel_id=10)
+        self.assertEqual(self.open_round(), [puzzle.slug for puzzle in self.puzzles[1:]])
+        announcement = self.bot.announce_channel.send.await_args.args[0]
+        self.assertNotIn(self.puzzles[0].slug, announcement)
+        # the one that's done counts as coming before the rest
+        self.assertEqual([call.args[1] for call in self.bot.ensure_category_ready.await_args_list], [2, 3])
+
+
+class AnnouncerQueueTests(RedisTestCase):
+    def setUp(self):
+        super().setUp()
+        # REDIS is as good as a connection of its own here, and may be all the test settings have
+        patcher = mock.patch.object(announcer, '_blocking_redis', REDIS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def serve(self, handle):
+        """
+        Answers one command in another thread, as the announcer service would,
+        with handle(command)'s result or exception.
+        """
+        def run():
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                command = announcer.receive(REDIS, 1)
+                if command is not None:
+                    try:
+                        announcer.reply(REDIS, command, handle(command))
+                    except Exception as e:
+                        announcer.reply(REDIS, command, None, repr(e))
+                    return
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        self.addCleanup(thread.join)
+
+    def test_call(self):
+        self.serve(lambda command: [command['method'], *command['args']])
+        self.assertEqual(announcer.ANNOUNCER.call('echo', 1, 'two', timeout=5), ['echo', 1, 'two'])
+
+    def test_error(self):
+        def fail(command):
+            raise ValueError("nope")
+
+        self.serve(fail)
+        with self.assertRaisesRegex(announcer.AnnouncerError, "announcer failed to echo: ValueError"):
+            announcer.ANNOUNCER.call('echo', timeout=5)
+
+    def test_timeout(self):
+        with self.assertRaisesRegex(announcer.AnnouncerError, "timed out"):
+            announcer.ANNOUNCER.call('echo', timeout=1)
+        # the command stays queued, but expires before anyone would wait for the answer
+        with mock.patch.object(time, 'time', return_value=time.time() + 2), self.assertLogs(level='WARNING'):
+            self.assertIsNone(announcer.receive(REDIS, 1))
+
+    def test_send(self):
+        announcer.ANNOUNCER.send('post_message', 'channel', 'hello')
+        command = announcer.receive(REDIS, 1)
+        self.assertEqual((command['method'], command['args'], command['reply']), ('post_message', ['channel', 'hello'], None))
+        # nobody to answer
+        announcer.reply(REDIS, command, 'done')
+        self.assertEqual(list(REDIS.scan_iter(match=f'{announcer.queue_key()}*')), [])
+
+
+class WarmPoolTests(RedisTestCase):
+    def setUp(self):
+        super().setUp()
+        # a fake Drive, whose renames of the sheets in self.broken fail
+        self.broken = set()
+        self.renamed = {}
+        self.drive = mock.Mock()
+        self.drive.files.return_value.update.side_effect = self.update
+        self.drive.new_batch_http_request.side_effect = self.new_batch
+        patcher = mock.patch.object(spreadsheets, 'service', self.drive)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def update(self, fileId, body):
+        def execute():
+            if fileId in self.broken:
+                raise HttpError(SimpleNamespace(status=500, reason='Oops'), b'')
+            self.renamed[fileId] = body['name']
+            return {'id': fileId}
+
+        return SimpleNamespace(execute=execute)
+
+    def new_batch(self, callback):
+        requests = []
+
+        def execute():
+            for key, request in requests:
+                try:
+                    response = request.execute()
+                except HttpError as e:
+                    callback(key, None, e)
+                else:
+                    callback(key, response, None)
+
+        return SimpleNamespace(add=lambda request, request_id: requests.append((request_id, request)), execute=execute)
+
+    @override_settings(HERRING_WARM_POOL_SIZE=3)
+    def test_pool(self):
+        self.assertEqual(warmpool.shortfall('sheets'), 3)
+        warmpool.add('sheets', ['s1', 's2'])
+        warmpool.add('channels', ['1'])
+        self.assertEqual(warmpool.sizes(), {'sheets': 2, 'channels': 1})
+        self.assertEqual(warmpool.shortfall('sheets'), 1)
+        self.assertEqual([warmpool.claim('sheets') for _ in range(3)], ['s1', 's2', None])
+        self.assertEqual(warmpool.claim('channels'), '1')
+
+    def test_claim_without_redis(self):
+        with mock.patch.object(REDIS, 'lpop', side_effect=RedisError), self.assertLogs(level='WARNING'):
+            self.assertIsNone(warmpool.claim('sheets'))
+
+    def test_claim_sheet(self):
+        warmpool.add('sheets', ['s1'])
+        with mock.patch.object(spreadsheets, 'make_sheet', return_value='new') as make_sheet:
+            self.assertEqual(spreadsheets.claim_sheet('First'), 's1')
+            self.assertEqual(spreadsheets.claim_sheet('Second'), 'new')
+        self.assertEqual(self.renamed, {'s1': 'First'})
+        make_sheet.assert_called_once_with('Second')
+
+    def test_claim_sheet_rename_fails(self):
+        warmpool.add('sheets', ['s1'])
+        self.broken = {'s1'}
+        with mock.patch.object(spreadsheets, 'make_sheet', return_value='new'), self.assertLogs(level='WARNING'):
+            self.assertEqual(spreadsheets.claim_sheet('First'), 'new')
+
+    def test_claim_sheets(self):
+        warmpool.add('sheets', ['s1', 's2'])
+        self.broken = {'s2'}
+        titles = {'a': 'A', 'b': 'B', 'c': 'C'}
+        make_sheets = mock.Mock(side_effect=lambda titles: {key: f'new-{key}' for key in titles})
+        with mock.patch.object(spreadsheets, 'make_sheets', make_sheets), self.assertLogs(level='WARNING'):
+            self.assertEqual(spreadsheets.claim_sheets(titles), {'a': 's1', 'b': 'new-b', 'c': 'new-c'})
+        self.assertEqual(self.renamed, {'s1': 'A'})
+        # the pool ran out, and the broken spare isn't put back
+        make_sheets.assert_called_once_with({'b': 'B', 'c': 'C'})
+        self.assertEqual(warmpool.sizes()['sheets'], 0)
+
+
+class ReactionsTests(RedisTestCase):
+    def test_lookup(self):
+        reactions.record(1234, [discordbot.SIGNUP_EMOJI, discordbot.LEAVE_EMOJI], 'announced')
+        reactions.record(5678, [discordbot.LEAVE_EMOJI], 'solved')
+        self.assertEqual(reactions.lookup(1234, discordbot.SIGNUP_EMOJI), 'announced')
+        self.assertEqual(reactions.lookup(1234, discordbot.LEAVE_EMOJI), 'announced')
+        self.assertEqual(reactions.lookup(5678, discordbot.LEAVE_EMOJI), 'solved')
+        # not an emoji that means anything on that message
+        self.assertIsNone(reactions.lookup(5678, discordbot.SIGNUP_EMOJI))
+        self.assertIsNone(reactions.lookup(9999, discordbot.LEAVE_EMOJI))
+
+    def test_expiry(self):
+        reactions.record(1234, [discordbot.SIGNUP_EMOJI], 'announced')
+        ttl = REDIS.ttl(reactions._key(1234, discordbot.SIGNUP_EMOJI))
+        self.assertTrue(0 < ttl <= reactions.REACTION_EXPIRY_SECONDS)
+
+    def test_without_redis(self):
+        with mock.patch.object(REDIS, 'get', side_effect=RedisError), self.assertLogs(level='WARNING'):
+            self.assertIsNone(reactions.lookup(1234, discordbot.SIGNUP_EMOJI))
+
+
+class BenchmarkTests(TransactionTestCase):
+    """
+    Runs each benchmark on a tiny hunt, to make sure they still run at all.
+    (The activity benchmark commits its hunt, so this can't be a TestCase.
+    It runs in one thread, since SQLite's in-memory test database won't take
+    writes from several at once.)
+    """
+    def test_benchmarks(self):
+        for benchmark in BENCHMARKS:
+            with self.subTest(benchmark=benchmark):
+                out = StringIO()
+                call_command('benchmark', benchmark, rounds=2, puzzles=3, repeat=1, threads=1, updates=5, stdout=out)
+                self.assertIn(f"{benchmark}: 2 rounds x 3 puzzles", out.getvalue())
+        self.assertFalse(Round.objects.exists())
@@ -8,6 +8,9 @@ urlpatterns = [
     path('edit_profile/', views.edit_profile, name='edit_profile'),
     path('resources/', views.get_resources, name='resources'),
     path('puzzles/', views.get_puzzles, name='get'),
+    path('puzzles/changes/', views.get_puzzle_changes, name='changes'),
+    path('puzzles/activity/', views.get_activity, name='activity'),
+    path('puzzles/hot/', views.get_hot_puzzles, name='hot'),
     #path('run_scraper/', views.run_scraper, name='run_scraper'),
     path('post_discord/', views.post_discord, name='post_discord'),
     path('puzzles/<int:puzzle_id>/', views.one_puzzle, name='one_puzzle'),
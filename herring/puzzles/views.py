@@ -1,25 +1,25 @@
 import json
 import logging
 import re
-from collections import defaultdict
-from datetime import datetime, timedelta, timezone
 
 import django.contrib.auth
-import typing
-from cachetools.func import ttl_cache
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.contrib.auth.models import User
-from django.db.models import Count, F
-from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
+from django.http import HttpResponse, HttpResponseRedirect
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.cache import never_cache
+from django.views.decorators.cache import cache_control, never_cache
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
 
+from puzzles.encoding import FastJsonResponse
+from puzzles.feed import get_changes, get_snapshot, get_state_version, state_etag
+from puzzles.histogram import bucket_seconds, get_histograms
+from puzzles.presence import get_active_users, get_voice_users
+from puzzles.ranking import get_ranking
 from puzzles.tasks import add_user_to_puzzle, get_service_status
 from .forms import UserProfileForm, UserSignupForm, UserEditForm
-from .models import ChannelParticipation, Puzzle, Round, UserProfile, to_json_value
+from .models import Puzzle, Round, UserProfile, to_json_value
 
 @never_cache
 @login_required
@@ -47,7 +47,7 @@ def signup(request):
         user_form = UserSignupForm(request.POST)
         profile_form = UserProfileForm(request.POST)
         if user_form.is_valid() and profile_form.is_valid() and user_form.cleaned_data['magic_secret'] == settings.HERRING_SECRETS['magic-secret']:
-            user:User = user_form.save(commit=False)
+            user:django.contrib.auth.models.User = user_form.save(commit=False)
             user.is_active = True  # this was checking if they had the secret, but just block making the account instead
             user.save()
             user.refresh_from_db()  # load the profile instance created by the signal
@@ -79,23 +79,94 @@ def get_resources(request):
     return render(request, 'puzzles/resources.html', {})
 
 
-@login_required
-def get_puzzles(request):
+def get_puzzles_etag(request):
+    return state_etag(request.user.id, get_service_status())
+
+
+def get_feed_settings(request):
     try:
         profile = UserProfile.objects.get(user_id=request.user.id)
     except UserProfile.DoesNotExist:
         profile = {}
+    return to_json_value({
+        'discord': settings.HERRING_ACTIVATE_DISCORD,
+        'gapps': settings.HERRING_ACTIVATE_GAPPS,
+        'push_url': settings.HERRING_PUSH_URL,
+        'activity_window_hours': settings.HERRING_ACTIVITY_WINDOW_HOURS,
+        'profile': profile,
+        'service_status': get_service_status(),
+    })
+
+
+# The React app polls this constantly, so let browsers revalidate their copy
+# with If-None-Match and answer with a 304 whenever nothing has changed.
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=get_puzzles_etag)
+def get_puzzles(request):
+    version, rounds = get_snapshot()
     data = {
-        'rounds': Round.objects.filter(hunt_id=settings.HERRING_HUNT_ID),
-        'settings': {
-            'discord': settings.HERRING_ACTIVATE_DISCORD,
-            'gapps': settings.HERRING_ACTIVATE_GAPPS,
-            'profile': profile,
-            'service_status': get_service_status(),
-        },
+        'version': version,
+        'state_version': get_state_version(),
+        'rounds': rounds,
+        'settings': get_feed_settings(request),
     }
-    logging.debug("Serializing puzzle data.")
-    return JsonResponse(add_metrics(to_json_value(data)))
+    return FastJsonResponse(add_metrics(data))
+
+
+@never_cache
+@login_required
+def get_puzzle_changes(request):
+    """
+    Returns only the rounds and puzzles that changed since the version given
+    in the `since` parameter (see puzzles.feed.get_changes), or the same full
+    snapshot as get_puzzles (with 'full' set) if we can't tell what changed.
+    """
+    try:
+        since = int(request.GET['since'])
+    except (KeyError, ValueError):
+        since = None
+
+    changes = get_changes(since) if since is not None else None
+    if changes is None:
+        version, rounds = get_snapshot()
+        data = add_metrics({'version': version, 'state_version': get_state_version(), 'rounds': rounds})
+        data['full'] = True
+    else:
+        data = changes
+        add_channel_active(data['puzzles'])
+        data['full'] = False
+    data['settings'] = get_feed_settings(request)
+    return FastJsonResponse(data)
+
+
+@never_cache
+@login_required
+def get_activity(request):
+    """
+    Returns every puzzle's activity histogram (see puzzles.histogram): how
+    many messages and edits each saw per bucket_seconds, oldest first, with
+    the last bucket starting at `end`, and the same broken down by who was
+    active there. The React app fetches this every minute or so, apart from
+    the feed, and shows the totals.
+    """
+    histograms, by_user, end = get_histograms()
+    return FastJsonResponse({
+        'bucket_seconds': bucket_seconds(),
+        'end': end,
+        'puzzles': {str(puzzle_id): counts for puzzle_id, counts in histograms.items()},
+        'users': {str(puzzle_id): users for puzzle_id, users in by_user.items()},
+    })
+
+
+@never_cache
+@login_required
+def get_hot_puzzles(request):
+    """
+    Returns the unsolved puzzles, hottest first and most in need of attention
+    first (see puzzles.ranking).
+    """
+    return FastJsonResponse(get_ranking())
 
 
 @login_required
@@ -156,7 +227,7 @@ def run_scraper(request):
     return HttpResponse("ok")
 """
 
-from puzzles.discordbot import DISCORD_ANNOUNCER, do_in_discord_nonblocking
+from puzzles.announcer import ANNOUNCER
 
 @csrf_exempt
 def post_discord(request):
@@ -164,7 +235,7 @@ def post_discord(request):
         #pm = request.POST.get('pm')
         channel = request.POST.get('channel')
         text = request.POST.get('text')
-        do_in_discord_nonblocking(DISCORD_ANNOUNCER.post_message(channel, text))
+        ANNOUNCER.send('post_message', channel, text)
         return HttpResponse("ok")
     else:
         return HttpResponse("please use POST")
@@ -182,29 +253,18 @@ def add_metrics(json):
     or a future someone else is almost certainly more clever, so this may not
     remain in this form for long.
     """
-    active_users_by_slug = compute_active_users()
     for r in json['rounds']:
-        for p in r['puzzle_set']:
-            p['channel_active'] = active_users_by_slug.get(p['slug'], [])
+        add_channel_active(r['puzzle_set'])
     return json
 
 
-@ttl_cache(ttl=5)
-def compute_active_users():
-    now = datetime.utcnow().replace(tzinfo=timezone.utc)
-    results:typing.Sequence[ChannelParticipation] = ChannelParticipation.objects\
-        .filter(is_member=True, last_active__gt=now - timedelta(hours=2))
-
-    # I still don't know a really pythonic way to do this
-    channel_users = defaultdict(list)
-    for result in results:
-        name = result.display_name
-        if not name:
-            hash_pos = result.user_id.rfind('#')
-            if hash_pos >= 0:
-                name = result.user_id[:hash_pos]
-            else:
-                name = result.user_id
-        channel_users[result.channel_puzzle.slug].append(name)
-
-    return channel_users
+def add_channel_active(puzzles):
+    # These are a couple of Redis round trips, and they have to be as fresh as
+    # the state version in the ETag (see feed.state_etag), so they aren't
+    # cached. (The activity histograms are much bigger, and nothing in the
+    # ETag says when they change, so they come from get_activity instead.)
+    active_users_by_slug = get_active_users()
+    voice_users_by_slug = get_voice_users()
+    for p in puzzles:
+        p['channel_active'] = active_users_by_slug.get(p['slug'], [])
+        p['voice_active'] = voice_users_by_slug.get(p['slug'], [])
@@ -0,0 +1,59 @@
+"""
+Spare Google Sheets and Discord channels, made ahead of time so that a new
+puzzle only has to rename one of each instead of waiting for Drive to copy
+the template and Discord to make a channel.
+
+The replenish_warm_pool beat task keeps HERRING_WARM_POOL_SIZE of each in
+Redis lists (sheet IDs and channel IDs respectively); whoever sets up a
+puzzle claims one with claim() and falls back to making a new one if the
+pool is empty. Spare channels are parked, hidden, in their own category (see
+HerringAnnouncerBot.park_channels).
+"""
+import logging
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from puzzles.cache import REDIS
+
+
+KINDS = ('sheets', 'channels')
+
+
+def _key(kind):
+    return f'puzzles.warmpool.{settings.HERRING_HUNT_ID}.{kind}'
+
+
+def claim(kind):
+    """
+    Takes a spare sheet or channel ID out of the pool, returning None if there
+    are none (or Redis is unavailable). The caller owns it from then on.
+    """
+    try:
+        spare = REDIS.lpop(_key(kind))
+    except RedisError:
+        logging.warning(f"warmpool: couldn't claim one of the spare {kind}", exc_info=True)
+        return None
+    return spare.decode('utf-8') if spare is not None else None
+
+
+def add(kind, ids):
+    if ids:
+        REDIS.rpush(_key(kind), *ids)
+
+
+def sizes():
+    """
+    Returns how many spares of each kind are ready, as a dict.
+    """
+    with REDIS.pipeline(transaction=False) as pipe:
+        for kind in KINDS:
+            pipe.llen(_key(kind))
+        return dict(zip(KINDS, pipe.execute()))
+
+
+def shortfall(kind):
+    """
+    Returns how many spares of the given kind we need to make to fill the pool.
+    """
+    return max(0, settings.HERRING_WARM_POOL_SIZE - REDIS.llen(_key(kind)))